@@ -0,0 +1,497 @@
+import yaml
+import os
+import sys
+import re
+import copy
+import string
+import time
+import tempfile
+import multiprocessing
+import numpy as np
+import pandas as pd
+from tensorflow.keras.preprocessing.text import Tokenizer
+from tensorflow.keras.preprocessing.sequence import pad_sequences
+
+# Agregar ruta base para imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from features.vocabulary import VocabEncoder, export_vocabulary
+from features.parallel_text import count_words_parallel, encode_parallel
+from features.build_features import tokenizer_from_counter, read_dataset, raw_data_path
+from features.text_normalizer import clean_text
+from features.serving_params import MAX_LEN as SERVING_MAX_LENGTH
+
+
+def load_corpus(config, n_texts=5000):
+    # Usa el dataset procesado si existe; si no, genera artículos sintéticos (distribución Zipf)
+    path = raw_data_path(config)
+    if os.path.exists(path):
+        df = read_dataset(path, ['combined_text']).head(n_texts).dropna(subset=['combined_text'])
+        return df['combined_text'].astype(str).tolist()
+
+    rng = np.random.default_rng(42)
+    words = np.array([f"word{i}" for i in range(60000)])
+    ranks = np.minimum(rng.zipf(1.2, size=n_texts * 400), len(words)) - 1
+    lengths = rng.integers(50, 800, size=n_texts)
+    texts, pos = [], 0
+    for n in lengths:
+        texts.append(" ".join(words[ranks[pos:pos + n]]))
+        pos += n
+    return texts
+
+
+def check_parity(tokenizer, encoder, texts, maxlen):
+    for padding in ('post', 'pre'):
+        for truncating in ('post', 'pre'):
+            expected = pad_sequences(tokenizer.texts_to_sequences(texts), maxlen=maxlen,
+                                     padding=padding, truncating=truncating)
+            got = encoder.encode_batch(texts, maxlen, padding=padding, truncating=truncating)
+            if not np.array_equal(expected, got):
+                raise AssertionError(f"IDs distintos (padding={padding}, truncating={truncating})")
+    print("-> Paridad con Keras Tokenizer: OK")
+
+
+def benchmark_tokenizer(config, n_repeats=3):
+    params = config['global_params']
+    texts = load_corpus(config)
+
+    tokenizer = Tokenizer(num_words=params['vocab_size'], oov_token=params['oov_tok'])
+    tokenizer.fit_on_texts(texts)
+
+    # Ida y vuelta por el artefacto .npz para validar también la exportación
+    with tempfile.TemporaryDirectory() as tmp:
+        vocab_path = os.path.join(tmp, 'vocab.npz')
+        export_vocabulary(tokenizer, vocab_path)
+        encoder = VocabEncoder.load(vocab_path)
+        artifact_kb = os.path.getsize(vocab_path) / 1024
+
+    check_parity(tokenizer, encoder, texts, SERVING_MAX_LENGTH)
+
+    def keras_encode():
+        seq = tokenizer.texts_to_sequences(texts)
+        return pad_sequences(seq, maxlen=SERVING_MAX_LENGTH, padding='post', truncating='post')
+
+    def vocab_encode():
+        return encoder.encode_batch(texts, SERVING_MAX_LENGTH, padding='post', truncating='post')
+
+    results = []
+    for name, fn in (("Keras Tokenizer", keras_encode), ("VocabEncoder", vocab_encode)):
+        best = min(_timed(fn) for _ in range(n_repeats))
+        results.append({
+            "Codificador": name,
+            "Textos": len(texts),
+            "Tiempo (seg)": round(best, 4),
+            "Textos/seg": round(len(texts) / best, 1),
+        })
+
+    print(f"-> Tamaño vocab.npz: {artifact_kb:.1f} KB ({params['vocab_size']} palabras)")
+    return pd.DataFrame(results)
+
+
+def check_parallel_parity(texts, params, workers):
+    # El camino multiproceso debe dar exactamente el mismo Tokenizer y las mismas matrices
+    tokenizer = Tokenizer(num_words=params['vocab_size'], oov_token=params['oov_tok'])
+    tokenizer.fit_on_texts(texts)
+    counter = count_words_parallel(texts, workers)
+    parallel = tokenizer_from_counter(counter, params['vocab_size'], params['oov_tok'])
+    if list(parallel.word_counts.items()) != list(tokenizer.word_counts.items()):
+        raise AssertionError(f"word_counts distinto con {workers} procesos")
+    if parallel.word_index != tokenizer.word_index or parallel.document_count != tokenizer.document_count:
+        raise AssertionError(f"word_index distinto con {workers} procesos")
+
+    encoder = VocabEncoder.from_tokenizer(parallel)
+    for padding in ('post', 'pre'):
+        for truncating in ('post', 'pre'):
+            expected = pad_sequences(tokenizer.texts_to_sequences(texts), maxlen=params['max_length'],
+                                     padding=padding, truncating=truncating)
+            got = encode_parallel(encoder, texts, params['max_length'], workers,
+                                  padding=padding, truncating=truncating)
+            if not np.array_equal(expected, got):
+                raise AssertionError(f"IDs distintos con {workers} procesos "
+                                     f"(padding={padding}, truncating={truncating})")
+
+
+def benchmark_parallel(config, workers_list=(1, 2, 4), n_repeats=2):
+    params = config['global_params']
+    texts = load_corpus(config, n_texts=20000)
+
+    tokenizer = Tokenizer(num_words=params['vocab_size'], oov_token=params['oov_tok'])
+    start = time.perf_counter()
+    tokenizer.fit_on_texts(texts)
+    seq = tokenizer.texts_to_sequences(texts)
+    pad_sequences(seq, maxlen=params['max_length'], padding='post', truncating='post')
+    keras_time = time.perf_counter() - start
+
+    for workers in workers_list:
+        check_parallel_parity(texts[:2000], params, workers)
+    print(f"-> Paridad fit/encode paralelo con Keras ({', '.join(map(str, workers_list))} procesos): OK")
+
+    def parallel_run(workers):
+        counter = count_words_parallel(texts, workers)
+        tok = tokenizer_from_counter(counter, params['vocab_size'], params['oov_tok'])
+        encode_parallel(VocabEncoder.from_tokenizer(tok), texts, params['max_length'], workers)
+
+    results = [{"Versión": "Keras (fit + texts_to_sequences)", "Procesos": 1,
+                "Tiempo (seg)": round(keras_time, 3), "Speedup": 1.0}]
+    for workers in workers_list:
+        best = min(_timed(lambda: parallel_run(workers)) for _ in range(n_repeats))
+        results.append({"Versión": "WordCounter + VocabEncoder", "Procesos": workers,
+                        "Tiempo (seg)": round(best, 3), "Speedup": round(keras_time / best, 2)})
+    print(f"-> Núcleos disponibles: {os.cpu_count()}")
+    return pd.DataFrame(results)
+
+
+def legacy_clean_text(text):
+    # Versión original de src/web/main.py (referencia para paridad y tiempos)
+    text = str(text).lower()
+    text = re.sub(r'https?://\S+|www\.\S+', '', text)
+    text = re.sub(r'<.*?>', '', text)
+    text = re.sub(f'[{re.escape(string.punctuation)}]', '', text)
+    text = re.sub(r'\n', ' ', text)
+    return text
+
+
+def make_article(rng, n_words):
+    # Artículo scrapeado típico: párrafos, puntuación, algún enlace y restos de HTML
+    vocab = ["The", "president", "said", "on", "Tuesday", "that", "officials", "would",
+             "review", "claims,", "reports", "(Reuters)", "\"fake\"", "news", "U.S.", "it's"]
+    extras = ["https://example.com/story?id=42", "<b>", "</b>", "www.site.org", "—", "2024:"]
+    words = rng.choice(vocab, size=n_words).astype(object)
+    idx = rng.integers(0, n_words, size=max(1, n_words // 40))
+    words[idx] = rng.choice(extras, size=len(idx))
+    paragraphs = [" ".join(words[i:i + 60]) for i in range(0, n_words, 60)]
+    return "\n".join(paragraphs)
+
+
+def benchmark_normalizer(maxlen=SERVING_MAX_LENGTH, n_repeats=20):
+    rng = np.random.default_rng(42)
+    results = []
+    for n_words in (300, 1000, 3000, 10000):
+        article = make_article(rng, n_words)
+
+        full = clean_text(article)
+        if full != legacy_clean_text(article):
+            raise AssertionError(f"clean_text difiere de la versión original ({n_words} palabras)")
+        cut = clean_text(article, max_tokens=maxlen)
+        if cut.split()[:maxlen] != full.split()[:maxlen]:
+            raise AssertionError(f"El corte temprano cambia los primeros {maxlen} tokens")
+
+        timings = {}
+        for name, fn in (("Original", legacy_clean_text),
+                         ("Compilado", clean_text),
+                         (f"Compilado (max_tokens={maxlen})", lambda t: clean_text(t, max_tokens=maxlen))):
+            timings[name] = min(_timed(lambda: fn(article)) for _ in range(n_repeats)) * 1000
+
+        for name, ms in timings.items():
+            results.append({
+                "Palabras": n_words,
+                "Caracteres": len(article),
+                "Versión": name,
+                "Tiempo (ms)": round(ms, 4),
+                "Speedup": round(timings["Original"] / ms, 2),
+            })
+
+    print("-> Paridad con clean_text original: OK")
+    return pd.DataFrame(results)
+
+
+def write_synthetic_csv(path, n_rows=60000, seed=42):
+    # Dataset con el mismo esquema que data_limpio.csv
+    rng = np.random.default_rng(seed)
+    words = np.array([f"word{i}" for i in range(60000)])
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write("combined_text,label\n")
+        for _ in range(n_rows):
+            n = int(rng.integers(50, 900))
+            text = " ".join(words[np.minimum(rng.zipf(1.2, size=n), len(words)) - 1])
+            f.write(f"{text},{int(rng.integers(0, 2))}\n")
+
+
+def _run_loader(mode, config, out):
+    # Proceso nuevo por modo: el pico de memoria no se mezcla entre ambos
+    from features.build_features import load_and_process_data, load_and_process_data_streaming, peak_memory_mb
+    loader = load_and_process_data_streaming if mode == 'streaming' else load_and_process_data
+    base_mb = peak_memory_mb()  # TensorFlow/pandas ya importados
+    start = time.perf_counter()
+    (X_train, _), _, _ = loader(config)
+    out.put((time.perf_counter() - start, base_mb, peak_memory_mb(), X_train.shape))
+
+
+def benchmark_loader(config):
+    ctx = multiprocessing.get_context('spawn')
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        # Los artefactos (tokenizer, memmaps) van a un directorio temporal
+        config = copy.deepcopy(config)
+        config['paths']['raw_data'] = raw_data_path(config)
+        if not os.path.exists(config['paths']['raw_data']):
+            config['paths']['raw_data'] = os.path.join(tmp, 'data.csv')
+            write_synthetic_csv(config['paths']['raw_data'])
+            # Varios chunks aunque el dataset sintético sea chico
+            config['global_params']['chunk_size'] = 5000
+        config['paths'].update(
+            tokenizer=os.path.join(tmp, 'tokenizer.pkl'),
+            vocabulary=os.path.join(tmp, 'vocab.npz'),
+            prepared_data=os.path.join(tmp, 'prepared'),
+        )
+
+        for mode in ('en memoria', 'streaming'):
+            out = ctx.Queue()
+            proc = ctx.Process(target=_run_loader, args=(mode, config, out))
+            proc.start()
+            seconds, base_mb, peak_mb, shape = out.get()
+            proc.join()
+            results.append({
+                "Modo": mode,
+                "Filas train": shape[0],
+                "Tiempo (seg)": round(seconds, 2),
+                "Memoria pico (MB)": round(peak_mb, 1),
+                "Pico sobre imports (MB)": round(peak_mb - base_mb, 1),
+            })
+    return pd.DataFrame(results)
+
+
+# --- INGESTA DE CSV CRUDOS ---
+RAW_SCHEMAS = [
+    # (archivo, columnas extra, columna de etiqueta, valores de etiqueta)
+    ("fake_real_news.csv", ["subject", "date"], "target", (0, 1)),
+    ("fake_or_real_news.csv", [], "label", ("REAL", "FAKE")),
+    ("fake_train.csv", ["author"], "label", (0, 1)),
+]
+
+
+def write_raw_sources(out_dir, n_rows=20000, seed=42):
+    """
+    Tres CSV con los esquemas de data/raw: títulos repetidos entre archivos
+    (a veces con espacios de más), nulos, textos cortos y restos de HTML.
+    """
+    rng = np.random.default_rng(seed)
+    titles = []
+    sources = []
+    for name, extra, label_column, values in RAW_SCHEMAS:
+        rows = []
+        for i in range(n_rows):
+            if titles and rng.random() < 0.15:
+                title = titles[int(rng.integers(0, len(titles)))] + (" " if rng.random() < 0.5 else "")
+            else:
+                title = f"{name[:4]} story {len(titles)}: " + " ".join(rng.choice(["The", "U.S.", "says", "2020", "[VIDEO]", "fake"], 5))
+                titles.append(title)
+            n_words = int(rng.integers(5, 600)) if rng.random() > 0.05 else int(rng.integers(0, 20))
+            text = make_article(rng, max(1, n_words)) + (" [VIDEO] covid19" if rng.random() < 0.1 else "")
+            row = {"title": title if rng.random() > 0.01 else None,
+                   "text": text if rng.random() > 0.01 else None,
+                   label_column: values[int(rng.integers(0, 2))]}
+            row.update({col: "x" for col in extra})
+            rows.append(row)
+        path = os.path.join(out_dir, name)
+        pd.DataFrame(rows).to_csv(path, index=False)
+        label_map = {"FAKE": 1, "REAL": 0} if values[1] == "FAKE" else None
+        sources.append({"path": path, "label_column": label_column, "label_map": label_map})
+    return sources
+
+
+def notebook_ingest(sources, min_words=20, min_final_words=3):
+    # combinacion.ipynb + analisis.ipynb (sin el shuffle), fila por fila con apply
+    from features.ingest import ENGLISH_STOPWORDS
+    frames = []
+    for source in sources:
+        df = pd.read_csv(source['path'])[['title', 'text', source['label_column']]].copy()
+        df = df.rename(columns={source['label_column']: 'label'})
+        if source.get('label_map'):
+            df['label'] = df['label'].map(source['label_map'])
+        frames.append(df)
+    df = pd.concat(frames, ignore_index=True)
+    df['title'] = df['title'].map(str).str.strip()  # Nulos -> "nan", como astype(str) en pandas < 3
+    df = df.drop_duplicates(subset=['title'], keep='first')
+    df = df[df['title'] != 'nan']
+    df = df.dropna(subset=['text'])
+    df['word_count'] = df['text'].apply(lambda x: len(str(x).split()))
+    df = df[df['word_count'] >= min_words].copy()
+
+    def limpiar_texto(text):
+        text = str(text).lower()
+        text = re.sub(r'https?://\S+|www\.\S+', '', text)
+        text = re.sub(r'<.*?>', '', text)
+        text = re.sub(r'\[.*?\]', '', text)
+        text = re.sub(f'[{re.escape(string.punctuation)}]', '', text)
+        text = re.sub(r'\n', ' ', text)
+        text = re.sub(r'\w*\d\w*', '', text)
+        return ' '.join(w for w in text.split() if w not in ENGLISH_STOPWORDS)
+
+    df['text_clean'] = df['text'].apply(limpiar_texto)
+    df = df[df['text_clean'] != ''].copy()
+    df['combined_text'] = df['title'].apply(limpiar_texto) + " " + df['text_clean']
+    df['final_count'] = df['combined_text'].apply(lambda x: len(str(x).split()))
+    return df[df['final_count'] >= min_final_words]
+
+
+def _run_ingestion(mode, sources, output, out):
+    # Proceso nuevo por variante: tiempo y pico de memoria propios
+    from features.ingest import run_ingestion, peak_mb
+    base_mb = peak_mb()  # TensorFlow/pandas ya importados (los workers con fork los heredan)
+    start = time.perf_counter()
+    if mode == 'notebook':
+        df = notebook_ingest(sources)
+        df[['combined_text', 'label']].to_csv(output, index=False)
+    else:
+        config = {'paths': {'raw_data': output},
+                  'ingestion': {'sources': sources, 'chunk_size': 5000, 'workers': mode}}
+        run_ingestion(config)
+    out.put((time.perf_counter() - start, base_mb, peak_mb(), peak_mb('children')))
+
+
+def benchmark_ingestion(n_rows=20000, workers_list=(1, 2, 4)):
+    ctx = multiprocessing.get_context('spawn')
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        sources = write_raw_sources(tmp, n_rows)
+        outputs = {}
+        for mode in ['notebook'] + list(workers_list):
+            ext = 'csv' if mode == 'notebook' or not _has_pyarrow() else 'parquet'
+            outputs[mode] = os.path.join(tmp, f"out_{mode}.{ext}")
+            q = ctx.Queue()
+            proc = ctx.Process(target=_run_ingestion, args=(mode, sources, outputs[mode], q))
+            proc.start()
+            seconds, base_mb, self_mb, children_mb = q.get()
+            proc.join()
+            results.append({
+                "Variante": "Notebook (apply)" if mode == 'notebook' else f"ingest.py ({mode} proc.)",
+                "Tiempo (seg)": round(seconds, 2),
+                "Memoria pico (MB)": round(max(self_mb, children_mb), 1),
+                "Pico sobre imports (MB)": round(max(self_mb, children_mb) - base_mb, 1),
+                "Salida (MB)": round(os.path.getsize(outputs[mode]) / (1024 * 1024), 1),
+            })
+
+        expected = read_dataset(outputs['notebook'])
+        for mode in workers_list:
+            got = read_dataset(outputs[mode], ['combined_text', 'label'])
+            if got['combined_text'].tolist() != expected['combined_text'].tolist() or \
+                    got['label'].tolist() != expected['label'].tolist():
+                raise AssertionError(f"La ingesta con {mode} proceso(s) difiere del notebook")
+        print(f"-> Paridad con el notebook: OK ({len(expected)} filas de {3 * n_rows})")
+
+    df = pd.DataFrame(results)
+    df["Speedup"] = (df["Tiempo (seg)"].iloc[0] / df["Tiempo (seg)"]).round(2)
+    return df
+
+
+# --- CASI-DUPLICADOS (MinHash + LSH) ---
+def near_duplicate_corpus(n_docs, dup_rate=0.1, edit_rate=0.02, seed=42):
+    """
+    Textos limpios sintéticos (Zipf) con copias plantadas de artículos
+    anteriores: algunas palabras cambiadas y a veces sin el encabezado.
+    Devuelve (textos, índice del original o -1).
+    """
+    rng = np.random.default_rng(seed)
+    vocab = np.array([f"w{i}" for i in range(20000)], dtype=object)
+    texts, origin = [], []
+    for i in range(n_docs):
+        if i > 10 and rng.random() < dup_rate:
+            src = int(rng.integers(0, i))
+            words = texts[src].split()
+            idx = rng.choice(len(words), size=max(1, int(len(words) * edit_rate)), replace=False)
+            for k in idx:
+                words[k] = str(vocab[rng.zipf(1.3) % len(vocab)])
+            if rng.random() < 0.3:
+                words = words[int(rng.integers(1, 8)):]
+            texts.append(" ".join(words))
+            origin.append(src if origin[src] < 0 else origin[src])
+        else:
+            texts.append(" ".join(vocab[rng.zipf(1.3, size=int(rng.integers(150, 500))) % len(vocab)]))
+            origin.append(-1)
+    return texts, np.array(origin)
+
+
+def _shingle_sets(texts, k=3):
+    sets = []
+    for text in texts:
+        words = text.split()
+        sets.append({tuple(words[i:i + k]) for i in range(max(1, len(words) - k + 1))})
+    return sets
+
+
+def exact_near_duplicates(texts, threshold=0.8, k=3):
+    # Referencia O(n²): Jaccard exacta contra cada texto conservado anterior
+    kept, keep = [], np.ones(len(texts), dtype=bool)
+    for i, shingles in enumerate(_shingle_sets(texts, k)):
+        if any(len(shingles & other) / len(shingles | other) >= threshold for other in kept):
+            keep[i] = False
+        else:
+            kept.append(shingles)
+    return keep
+
+
+def _lsh_dedupe(texts, settings):
+    from features.near_dedupe import NearDuplicateFilter, minhash_signatures
+    start = time.perf_counter()
+    signatures = minhash_signatures(texts, settings['num_perm'], settings['shingle_size'])
+    sig_seconds = time.perf_counter() - start
+    near_filter = NearDuplicateFilter(settings['num_perm'], settings['bands'], settings['threshold'])
+    keep = near_filter.filter(signatures)
+    return keep, sig_seconds, time.perf_counter() - start - sig_seconds
+
+
+def benchmark_near_dedupe(config, sizes=(1000, 4000, 16000, 64000), exact_max=1000):
+    settings = {'threshold': 0.8, 'num_perm': 64, 'bands': 8, 'shingle_size': 3,
+                **config.get('ingestion', {}).get('near_duplicates', {})}
+    results = []
+    for n_docs in sizes:
+        texts, origin = near_duplicate_corpus(n_docs)
+        keep, sig_seconds, lsh_seconds = _lsh_dedupe(texts, settings)
+        planted = origin >= 0
+        row = {
+            "Textos": n_docs,
+            "Copias plantadas": int(planted.sum()),
+            "Eliminadas": int((~keep).sum()),
+            "Recall copias": round(float((~keep[planted]).mean()), 3),
+            "Falsos positivos": int((~keep[~planted]).sum()),
+            "Firmas (seg)": round(sig_seconds, 2),
+            "LSH (seg)": round(lsh_seconds, 2),
+            "µs/texto": round((sig_seconds + lsh_seconds) / n_docs * 1e6, 1),
+        }
+        if n_docs <= exact_max:
+            start = time.perf_counter()
+            exact_keep = exact_near_duplicates(texts, settings['threshold'], settings['shingle_size'])
+            row["Exacto O(n²) (seg)"] = round(time.perf_counter() - start, 2)
+            # Cuántas de las copias según la Jaccard exacta encontró LSH (y cuántas de más)
+            row["Recall vs exacto"] = round(float((~keep[~exact_keep]).mean()), 3)
+            row["De más vs exacto"] = int((~keep & exact_keep).sum())
+        results.append(row)
+    return pd.DataFrame(results)
+
+
+def _has_pyarrow():
+    try:
+        import pyarrow  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def _timed(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    with open("config/config.yaml", "r") as f:
+        config = yaml.safe_load(f)
+
+    print("--- BENCHMARK: clean_text original vs normalizador compilado ---")
+    print(benchmark_normalizer())
+
+    print("\n--- BENCHMARK: Tokenizer de Keras vs VocabEncoder ---")
+    print(benchmark_tokenizer(config))
+
+    print("\n--- BENCHMARK: tokenización y codificación multiproceso ---")
+    print(benchmark_parallel(config))
+
+    print("\n--- BENCHMARK: carga en memoria vs streaming (memmap) ---")
+    print(benchmark_loader(config))
+
+    print("\n--- BENCHMARK: ingesta del notebook vs src/features/ingest.py ---")
+    print(benchmark_ingestion())
+
+    print("\n--- BENCHMARK: casi-duplicados MinHash + LSH vs Jaccard exacta ---")
+    print(benchmark_near_dedupe(config))
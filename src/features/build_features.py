@@ -2,22 +2,80 @@ import pandas as pd
 import numpy as np
 import pickle
 import os
+import sys
+from collections import OrderedDict
 from sklearn.model_selection import train_test_split
 from tensorflow.keras.preprocessing.text import Tokenizer
 from tensorflow.keras.preprocessing.sequence import pad_sequences
+import tensorflow as tf
+from features.vocabulary import export_vocabulary, WordCounter, VocabEncoder
+from features.text_normalizer import clean_texts
+from features.parallel_text import resolve_workers, count_words_parallel, encode_parallel
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+SPLITS = ('train', 'val', 'test')
+
+def peak_memory_mb():
+    # Pico de memoria residente del proceso (ru_maxrss: KB en Linux, bytes en macOS)
+    if resource is None:
+        return float('nan')
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+def raw_data_path(config, verbose=True):
+    """
+    paths.raw_data; si es un .parquet que todavía no se generó con
+    features/ingest.py y existe el .csv hermano, usa el CSV.
+    """
+    path = config['paths']['raw_data']
+    if not os.path.exists(path) and path.endswith('.parquet'):
+        csv_path = path[:-len('.parquet')] + '.csv'
+        if os.path.exists(csv_path):
+            if verbose:
+                print(f"-> No existe {path}; se usa {csv_path} (python src/features/ingest.py genera el Parquet)")
+            return csv_path
+    return path
+
+
+def missing_data_error(path):
+    return FileNotFoundError(f"No se encuentra el archivo en: {path} "
+                             f"(generarlo con python src/features/ingest.py)")
+
+
+def training_texts(texts, config):
+    """
+    Textos que ve el Tokenizer al entrenar. Con global_params.clean_text pasan por
+    el mismo clean_text que el servidor; con false quedan como en el dataset
+    (comportamiento anterior, para reproducir modelos ya entrenados).
+    """
+    if config['global_params'].get('clean_text', True):
+        return clean_texts(texts)
+    return [str(t) for t in texts]
+
+
+def read_dataset(path, columns=None):
+    # Dataset procesado: Parquet (salida de features/ingest.py) o CSV
+    if path.endswith('.parquet'):
+        return pd.read_parquet(path, columns=columns)
+    return pd.read_csv(path, usecols=columns)
 
 def load_and_process_data(config):
     print("--- PROCESANDO DATOS ---")
     
     # Cargar Dataset
-    path = config['paths']['raw_data']
+    path = raw_data_path(config)
     if not os.path.exists(path):
-        raise FileNotFoundError(f"No se encuentra el archivo en: {path}")
+        raise missing_data_error(path)
         
-    df = pd.read_csv(path)
+    df = read_dataset(path, ['combined_text', 'label'])
     df = df.dropna(subset=['combined_text', 'label'])
     
-    X = df['combined_text'].astype(str).values
+    # Misma normalización que usa el servidor web (global_params.clean_text)
+    X = np.array(training_texts(df['combined_text'].astype(str), config), dtype=object)
     y = df['label'].values
 
     # 1. Separar Test (20%) - "Bajo llave"
@@ -33,17 +91,28 @@ def load_and_process_data(config):
     )
 
     # 3. Tokenización (Solo aprender de Train)
-    tokenizer = Tokenizer(num_words=config['global_params']['vocab_size'], 
-                          oov_token=config['global_params']['oov_tok'])
-    tokenizer.fit_on_texts(X_train)
+    workers = resolve_workers(config['global_params'].get('workers', 1))
+    if workers > 1:
+        # Conteo por shards en paralelo; mismo vocabulario y orden que fit_on_texts
+        print(f"-> Tokenizando con {workers} procesos")
+        counter = count_words_parallel(X_train, workers)
+        tokenizer = tokenizer_from_counter(counter, config['global_params']['vocab_size'],
+                                           config['global_params']['oov_tok'])
+        encoder = VocabEncoder.from_tokenizer(tokenizer)
+    else:
+        tokenizer = Tokenizer(num_words=config['global_params']['vocab_size'], 
+                              oov_token=config['global_params']['oov_tok'])
+        tokenizer.fit_on_texts(X_train)
 
-    # Guardar Tokenizer
-    os.makedirs(os.path.dirname(config['paths']['tokenizer']), exist_ok=True)
-    with open(config['paths']['tokenizer'], 'wb') as handle:
-        pickle.dump(tokenizer, handle, protocol=pickle.HIGHEST_PROTOCOL)
+    # Guardar Tokenizer (+ vocabulario compacto sin pickle para el serving)
+    save_tokenizer(tokenizer, config)
 
     # 4. Convertir a secuencias
     def get_sequences(texts):
+        if workers > 1:
+            return encode_parallel(encoder, texts, config['global_params']['max_length'], workers,
+                                   padding=config['global_params']['padding_type'],
+                                   truncating=config['global_params']['trunc_type'])
         seq = tokenizer.texts_to_sequences(texts)
         pad = pad_sequences(seq, 
                             maxlen=config['global_params']['max_length'], 
@@ -51,6 +120,222 @@ def load_and_process_data(config):
                             truncating=config['global_params']['trunc_type'])
         return np.array(pad)
 
-    return (get_sequences(X_train), y_train), \
-           (get_sequences(X_val), y_val), \
-           (get_sequences(X_test), y_test)
\ No newline at end of file
+    result = (get_sequences(X_train), y_train), \
+             (get_sequences(X_val), y_val), \
+             (get_sequences(X_test), y_test)
+    print(f"-> Memoria pico: {peak_memory_mb():.0f} MB")
+    return result
+
+
+def save_tokenizer(tokenizer, config):
+    os.makedirs(os.path.dirname(config['paths']['tokenizer']), exist_ok=True)
+    with open(config['paths']['tokenizer'], 'wb') as handle:
+        pickle.dump(tokenizer, handle, protocol=pickle.HIGHEST_PROTOCOL)
+    export_vocabulary(tokenizer, config['paths']['vocabulary'])
+
+
+def tokenizer_from_counter(counter, num_words, oov_token):
+    # Tokenizer de Keras equivalente a haber llamado fit_on_texts(X_train)
+    tokenizer = Tokenizer(num_words=num_words, oov_token=oov_token)
+    tokenizer.word_counts = OrderedDict(counter.ordered_counts())
+    tokenizer.document_count = counter.document_count
+    vocab = counter.vocabulary(oov_token)
+    tokenizer.word_index = dict(zip(vocab, range(1, len(vocab) + 1)))
+    tokenizer.index_word = {i: w for w, i in tokenizer.word_index.items()}
+    return tokenizer
+
+
+def iter_chunks(path, chunk_size):
+    # Filas válidas del CSV/Parquet, en orden, con su índice global
+    if path.endswith('.parquet'):
+        import pyarrow.parquet as pq
+        batches = pq.ParquetFile(path).iter_batches(batch_size=chunk_size, columns=['combined_text', 'label'])
+        chunks = (batch.to_pandas() for batch in batches)
+    else:
+        chunks = pd.read_csv(path, usecols=['combined_text', 'label'], chunksize=chunk_size)
+    start = 0
+    for chunk in chunks:
+        chunk = chunk.dropna(subset=['combined_text', 'label'])
+        yield start, chunk
+        start += len(chunk)
+
+
+def split_assignment(n, config):
+    """
+    Reproduce los train_test_split de load_and_process_data sobre los índices:
+    la permutación solo depende de n y random_state, así el split es el mismo.
+    """
+    idx = np.arange(n)
+    idx_temp, idx_test = train_test_split(idx, test_size=config['global_params']['test_size'], random_state=42)
+    val_split = config['global_params']['val_size'] / (1 - config['global_params']['test_size'])
+    idx_train, idx_val = train_test_split(idx_temp, test_size=val_split, random_state=42)
+
+    split_of = np.empty(n, dtype=np.int8)
+    rank_of = np.empty(n, dtype=np.int64)
+    for s, split_idx in enumerate((idx_train, idx_val, idx_test)):
+        split_of[split_idx] = s
+        rank_of[split_idx] = np.arange(len(split_idx))
+    return (idx_train, idx_val, idx_test), split_of, rank_of
+
+
+def load_and_process_data_streaming(config):
+    """
+    Igual que load_and_process_data pero sin cargar el CSV entero:
+    lee por chunks, cuenta palabras de forma incremental y escribe las
+    secuencias con padding en memmaps .npy (paths.prepared_data).
+    Devuelve los mismos splits, como arrays de solo lectura en disco.
+    """
+    print("--- PROCESANDO DATOS (STREAMING) ---")
+    params = config['global_params']
+    path = raw_data_path(config)
+    if not os.path.exists(path):
+        raise missing_data_error(path)
+    chunk_size = params.get('chunk_size', 20000)
+    workers = resolve_workers(params.get('workers', 1))
+    out_dir = config['paths']['prepared_data']
+    os.makedirs(out_dir, exist_ok=True)
+
+    # 1. Primera pasada: solo cantidad de filas y etiquetas
+    labels = []
+    for _, chunk in iter_chunks(path, chunk_size):
+        labels.append(chunk['label'].values)
+    y = np.concatenate(labels)
+    splits, split_of, rank_of = split_assignment(len(y), config)
+
+    # 2. Segunda pasada: vocabulario con los textos de Train (orden idéntico a Keras)
+    counter = WordCounter()
+    for start, chunk in iter_chunks(path, chunk_size):
+        rows = np.arange(start, start + len(chunk))
+        is_train = split_of[rows] == 0
+        texts = training_texts(chunk['combined_text'].astype(str).values[is_train], config)
+        counter.merge(count_words_parallel(texts, workers, ranks=rank_of[rows][is_train]))
+
+    tokenizer = tokenizer_from_counter(counter, params['vocab_size'], params['oov_tok'])
+    save_tokenizer(tokenizer, config)
+    encoder = VocabEncoder.from_tokenizer(tokenizer)
+
+    # 3. Tercera pasada: secuencias con padding directo a disco, en el orden del split
+    arrays = {}
+    for s, name in enumerate(SPLITS):
+        arrays[name] = np.lib.format.open_memmap(
+            os.path.join(out_dir, f"X_{name}.npy"), mode='w+',
+            dtype=np.int32, shape=(len(splits[s]), params['max_length'])
+        )
+        np.save(os.path.join(out_dir, f"y_{name}.npy"), y[splits[s]])
+
+    for start, chunk in iter_chunks(path, chunk_size):
+        rows = np.arange(start, start + len(chunk))
+        padded = encode_parallel(
+            encoder, training_texts(chunk['combined_text'].astype(str).values, config), params['max_length'],
+            workers, padding=params['padding_type'], truncating=params['trunc_type']
+        )
+        for s, name in enumerate(SPLITS):
+            mask = split_of[rows] == s
+            arrays[name][rank_of[rows][mask]] = padded[mask]
+
+    for arr in arrays.values():
+        arr.flush()
+    del arrays
+
+    print(f"-> Memoria pico: {peak_memory_mb():.0f} MB")
+    return load_prepared_data(out_dir)
+
+
+def load_prepared_data(out_dir):
+    return tuple(
+        (np.load(os.path.join(out_dir, f"X_{name}.npy"), mmap_mode='r'),
+         np.load(os.path.join(out_dir, f"y_{name}.npy")))
+        for name in SPLITS
+    )
+
+
+def make_dataset(X, y=None, batch_size=32, shuffle=False, seed=42):
+    """
+    tf.data sobre arrays en disco (memmap): lee un lote por paso, con
+    orden aleatorio distinto en cada época si shuffle=True.
+    """
+    n = len(X)
+    rng = np.random.default_rng(seed)
+
+    def generator():
+        order = rng.permutation(n) if shuffle else np.arange(n)
+        for i in range(0, n, batch_size):
+            idx = np.sort(order[i:i + batch_size])
+            if y is None:
+                yield np.asarray(X[idx])
+            else:
+                yield np.asarray(X[idx]), np.asarray(y[idx])
+
+    x_spec = tf.TensorSpec(shape=(None, X.shape[1]), dtype=tf.int32)
+    if y is None:
+        signature = x_spec
+    else:
+        signature = (x_spec, tf.TensorSpec(shape=(None,), dtype=tf.as_dtype(y.dtype)))
+    dataset = tf.data.Dataset.from_generator(generator, output_signature=signature)
+    return dataset.prefetch(tf.data.AUTOTUNE)
+
+def to_ragged(X, chunk_rows=10000):
+    """
+    Quita el padding: devuelve (valores concatenados, longitud de cada fila).
+    El id 0 solo aparece como relleno, así que basta con descartar los ceros.
+    Recorre X por bloques para no materializar un memmap entero.
+    """
+    values, lengths = [], []
+    for start in range(0, len(X), chunk_rows):
+        block = np.asarray(X[start:start + chunk_rows])
+        nonzero = block != 0
+        values.append(block[nonzero].astype(np.int32, copy=False))
+        lengths.append(nonzero.sum(axis=1))
+    lengths = np.concatenate(lengths) if lengths else np.zeros(0, dtype=np.int64)
+    return np.concatenate(values) if values else np.zeros(0, dtype=np.int32), lengths
+
+
+def make_bucketed_dataset(X, y=None, batch_size=32, boundaries=(64, 128, 256, 384),
+                          shuffle=False, seed=42, bucket=True, min_length=5):
+    """
+    tf.data con secuencias sin padding: agrupa por longitud (bucket=True) y
+    rellena cada lote hasta su fila más larga, redondeado al siguiente borde
+    de bucket para que Keras compile pocas formas distintas. Con bucket=False
+    conserva el orden original (para predict/evaluación).
+    min_length cubre el kernel de la CNN en lotes de textos muy cortos.
+    """
+    values, lengths = to_ragged(X)
+    # Un texto vacío queda como un único <OOV> para que nunca esté todo enmascarado
+    empty = lengths == 0
+    if empty.any():
+        values = np.insert(values, np.cumsum(lengths)[empty], 1)
+        lengths = np.where(empty, 1, lengths)
+
+    # Cada elemento es un corte del vector plano de ids
+    values = tf.constant(values)
+    ends = np.cumsum(lengths)
+    bounds = np.stack([ends - lengths, ends], axis=1)
+
+    def take(span, *rest):
+        x = values[span[0]:span[1]]
+        return (x, *rest) if rest else x
+
+    dataset = tf.data.Dataset.from_tensor_slices(bounds if y is None else (bounds, y))
+    dataset = dataset.map(take, num_parallel_calls=tf.data.AUTOTUNE).cache()
+    if shuffle:
+        dataset = dataset.shuffle(min(len(lengths), 10000), seed=seed, reshuffle_each_iteration=True)
+
+    if bucket:
+        dataset = dataset.bucket_by_sequence_length(
+            element_length_func=lambda x, *_: tf.shape(x)[0],
+            bucket_boundaries=list(boundaries),
+            bucket_batch_sizes=[batch_size] * (len(boundaries) + 1),
+        )
+    else:
+        dataset = dataset.padded_batch(batch_size)
+
+    edges = tf.constant(sorted(set(boundaries) | {X.shape[1]}), dtype=tf.int32)
+
+    def pad_to_edge(x, *rest):
+        length = tf.shape(x)[1]
+        target = tf.maximum(edges[tf.argmax(tf.cast(edges >= length, tf.int32))], min_length)
+        x = tf.pad(x, [[0, 0], [0, target - length]])
+        return (x, *rest) if rest else x
+
+    dataset = dataset.map(pad_to_edge, num_parallel_calls=tf.data.AUTOTUNE)
+    return dataset.prefetch(tf.data.AUTOTUNE)
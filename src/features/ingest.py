@@ -0,0 +1,286 @@
+"""
+Ingesta de los CSV crudos: reemplaza la combinación y limpieza que se hacía
+en notebook/combinacion.ipynb y notebook/analisis.ipynb.
+
+Ejemplo:
+    python src/features/ingest.py
+    python src/features/ingest.py --workers 4 --output data/processed/data_limpio.csv
+"""
+import argparse
+import os
+import re
+import string
+import sys
+import time
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+import yaml
+
+# Agregar ruta base para imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from features.parallel_text import resolve_workers, mp_context
+from features.near_dedupe import NearDuplicateFilter, minhash_signatures
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Lista 'english' de NLTK, incluida para no depender de nltk.download() en producción
+ENGLISH_STOPWORDS = frozenset("""
+i me my myself we our ours ourselves you you're you've you'll you'd your yours yourself
+yourselves he him his himself she she's her hers herself it it's its itself they them their
+theirs themselves what which who whom this that that'll these those am is are was were be
+been being have has had having do does did doing a an the and but if or because as until
+while of at by for with about against between into through during before after above below
+to from up down in out on off over under again further then once here there when where why
+how all any both each few more most other some such no nor not only own same so than too
+very s t can will just don don't should should've now d ll m o re ve y ain aren aren't
+couldn couldn't didn didn't doesn doesn't hadn hadn't hasn hasn't haven haven't isn isn't ma
+mightn mightn't mustn mustn't needn needn't shan shan't shouldn shouldn't wasn wasn't weren
+weren't won won't wouldn wouldn't
+""".split())
+
+# Mismos pasos que limpiar_texto() del notebook, como regex sobre columnas enteras
+CLEANING_STEPS = [
+    r'https?://\S+|www\.\S+',                # URLs
+    r'<.*?>',                                # Etiquetas HTML
+    r'\[.*?\]',                              # Texto entre corchetes, ej: [VIDEO]
+    f'[{re.escape(string.punctuation)}]',    # Puntuación
+]
+DIGIT_WORD_RE = r'\w*\d\w*'
+
+OUTPUT_COLUMNS = ['title', 'combined_text', 'label', 'source', 'word_count', 'final_count']
+
+
+def clean_series(texts):
+    """limpiar_texto() del notebook aplicado a una Serie completa."""
+    texts = texts.astype(str).str.lower()
+    for pattern in CLEANING_STEPS:
+        texts = texts.str.replace(pattern, '', regex=True)
+    texts = texts.str.replace('\n', ' ', regex=False)
+    texts = texts.str.replace(DIGIT_WORD_RE, '', regex=True)
+    # Stopwords por token: un set es ~5x más rápido que una regex con 179 alternativas
+    stopwords = ENGLISH_STOPWORDS
+    return pd.Series([' '.join([w for w in t.split() if w not in stopwords]) for t in texts],
+                     index=texts.index, dtype=object)
+
+
+def word_counts(texts):
+    # len(str(x).split()) del notebook; más rápido que str.count(r'\S+')
+    return pd.Series([len(t.split()) for t in texts.astype(str)], index=texts.index, dtype=np.int32)
+
+
+def read_source(source, chunk_size):
+    """Chunks de un CSV crudo con el esquema común: title, text, label (1 = Fake)."""
+    label_column = source.get('label_column', 'label')
+    label_map = source.get('label_map')
+    name = os.path.basename(source['path'])
+    for chunk in pd.read_csv(source['path'], usecols=['title', 'text', label_column], chunksize=chunk_size):
+        chunk = chunk.rename(columns={label_column: 'label'})
+        if label_map:
+            chunk['label'] = chunk['label'].map(label_map)
+        # Espacios de más al final cambian el título entre datasets
+        chunk['title'] = chunk['title'].astype(str).str.strip()
+        chunk['source'] = name
+        yield chunk
+
+
+def dedupe_chunk(chunk, seen_titles, stats):
+    # Conserva la primera aparición de cada título, también entre chunks y archivos
+    duplicated = chunk['title'].duplicated() | chunk['title'].isin(seen_titles)
+    seen_titles.update(chunk['title'][~duplicated])
+    stats['títulos duplicados'] += int(duplicated.sum())
+    chunk = chunk[~duplicated]
+
+    # Títulos nulos ("nan" con pandas < 3, NaN con pandas 3), textos o etiquetas nulas
+    invalid = chunk['title'].isna() | (chunk['title'] == 'nan') | chunk['text'].isna() | chunk['label'].isna()
+    stats['sin título, texto o etiqueta'] += int(invalid.sum())
+    return chunk[~invalid]
+
+
+def clean_chunk(chunk, min_words=20, min_final_words=3, near_dup=None):
+    """
+    Filtro por largo, limpieza y texto combinado. Corre en los workers.
+    Con near_dup (sección ingestion.near_duplicates) también calcula las
+    firmas MinHash del texto combinado; si no, devuelve None en su lugar.
+    """
+    stats = Counter()
+    word_count = word_counts(chunk['text'])
+    short = word_count < min_words
+    stats[f'menos de {min_words} palabras'] = int(short.sum())
+    chunk, word_count = chunk[~short], word_count[~short]
+
+    text_clean = clean_series(chunk['text'])
+    empty = text_clean == ''
+    stats['vacíos tras limpiar'] = int(empty.sum())
+    chunk, word_count, text_clean = chunk[~empty], word_count[~empty], text_clean[~empty]
+
+    combined = clean_series(chunk['title']) + ' ' + text_clean
+    final_count = word_counts(combined)
+    few = final_count < min_final_words
+    stats[f'menos de {min_final_words} palabras útiles'] = int(few.sum())
+
+    out = pd.DataFrame({
+        'title': chunk['title'],
+        'combined_text': combined,
+        'label': chunk['label'].astype(np.int8),
+        'source': chunk['source'],
+        'word_count': word_count,
+        'final_count': final_count,
+    })[~few].reset_index(drop=True)
+
+    signatures = None
+    if near_dup:
+        signatures = minhash_signatures(out['combined_text'], near_dup.get('num_perm', 64),
+                                        near_dup.get('shingle_size', 3))
+    return out, stats, signatures
+
+
+class DatasetWriter:
+    """Escribe los chunks procesados en Parquet o CSV según la extensión (archivo temporal + rename)."""
+
+    def __init__(self, path):
+        self.path = path
+        self.tmp_path = f"{path}.tmp"
+        self.parquet = path.endswith('.parquet')
+        self.rows = 0
+        self._writer = None
+        if self.parquet:
+            try:
+                import pyarrow  # noqa: F401
+            except ImportError:
+                raise ImportError("Escribir Parquet requiere pyarrow (pip install pyarrow) o usar una salida .csv")
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+    def write(self, df):
+        if df.empty:
+            return
+        if self.parquet:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            table = pa.Table.from_pandas(df[OUTPUT_COLUMNS], preserve_index=False)
+            if self._writer is None:
+                self._writer = pq.ParquetWriter(self.tmp_path, table.schema, compression='zstd')
+            self._writer.write_table(table.cast(self._writer.schema))
+        else:
+            df[OUTPUT_COLUMNS].to_csv(self.tmp_path, mode='a' if self.rows else 'w',
+                                      header=not self.rows, index=False)
+        self.rows += len(df)
+
+    def close(self, commit=True):
+        if self._writer is not None:
+            self._writer.close()
+        if commit and self.rows:
+            os.replace(self.tmp_path, self.path)
+        elif os.path.exists(self.tmp_path):
+            os.remove(self.tmp_path)
+
+
+def peak_mb(who='self'):
+    # Pico de memoria residente de este proceso o del mayor de sus hijos (sin importar TensorFlow)
+    if resource is None:
+        return float('nan')
+    usage = resource.RUSAGE_CHILDREN if who == 'children' else resource.RUSAGE_SELF
+    peak = resource.getrusage(usage).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def run_ingestion(config, output=None, workers=None, chunk_size=None):
+    """
+    Lee las fuentes por chunks, unifica esquemas, deduplica por título,
+    limpia en paralelo, descarta casi-duplicados (MinHash + LSH) y escribe
+    paths.raw_data. Devuelve un dict de stats.
+    """
+    settings = config['ingestion']
+    output = output or config['paths']['raw_data']
+    workers = resolve_workers(workers if workers is not None else settings.get('workers', 0))
+    chunk_size = chunk_size or settings.get('chunk_size', 20000)
+    min_words = settings.get('min_words', 20)
+    min_final_words = settings.get('min_final_words', 3)
+    near_dup = settings.get('near_duplicates', {})
+    near_dup = near_dup if near_dup.get('enabled', False) else None
+
+    print("--- INGESTA DE DATOS CRUDOS ---")
+    print(f"-> {len(settings['sources'])} fuentes, chunks de {chunk_size} filas, {workers} proceso(s)")
+    start = time.perf_counter()
+    stats = Counter()
+    labels = Counter()
+    seen_titles = set()
+    writer = DatasetWriter(output)
+    # Las firmas se calculan en los workers; el índice LSH vive en este proceso
+    near_filter = NearDuplicateFilter(near_dup.get('num_perm', 64), near_dup.get('bands', 8),
+                                      near_dup.get('threshold', 0.8)) if near_dup else None
+    lsh_seconds = 0.0
+
+    def chunks():
+        for source in settings['sources']:
+            if not os.path.exists(source['path']):
+                raise FileNotFoundError(f"No se encuentra el archivo en: {source['path']}")
+            for chunk in read_source(source, chunk_size):
+                stats['filas leídas'] += len(chunk)
+                yield dedupe_chunk(chunk, seen_titles, stats)
+
+    def collect(result):
+        nonlocal lsh_seconds
+        df, chunk_stats, signatures = result
+        stats.update(chunk_stats)
+        if near_filter is not None:
+            t0 = time.perf_counter()
+            keep = near_filter.filter(signatures)
+            lsh_seconds += time.perf_counter() - t0
+            stats['casi duplicados'] += int((~keep).sum())
+            df = df[keep]
+        labels.update(df['label'].tolist())
+        writer.write(df)
+
+    ok = False
+    try:
+        if workers == 1:
+            for chunk in chunks():
+                collect(clean_chunk(chunk, min_words, min_final_words, near_dup))
+        else:
+            # Ventana acotada de chunks en vuelo: la memoria no crece con el dataset
+            with ProcessPoolExecutor(workers, mp_context=mp_context()) as pool:
+                pending = deque()
+                for chunk in chunks():
+                    pending.append(pool.submit(clean_chunk, chunk, min_words, min_final_words, near_dup))
+                    if len(pending) >= 2 * workers:
+                        collect(pending.popleft().result())
+                while pending:
+                    collect(pending.popleft().result())
+        ok = True
+    finally:
+        # Ante un error no se pisa el dataset anterior
+        writer.close(commit=ok)
+
+    elapsed = time.perf_counter() - start
+    rows_read = stats.pop('filas leídas', 0)
+    print(f"-> Filas leídas: {rows_read}")
+    for reason, count in stats.items():
+        print(f"   descartadas ({reason}): {count}")
+    if near_filter is not None:
+        print(f"-> Casi duplicados (Jaccard >= {near_filter.threshold}): {near_filter.removed} eliminados "
+              f"| índice LSH: {lsh_seconds:.1f} s (firmas MinHash en los workers)")
+    print(f"-> Filas finales: {writer.rows} (Fake: {labels.get(1, 0)} | Real: {labels.get(0, 0)})")
+    print(f"-> Guardado en: {output}")
+    print(f"-> Tiempo: {elapsed:.1f} s | Memoria pico: {peak_mb():.0f} MB "
+          f"(workers: {peak_mb('children'):.0f} MB)")
+    return {"read": rows_read, "rows": writer.rows, "seconds": elapsed, "lsh_seconds": lsh_seconds,
+            "peak_mb": peak_mb(), **stats}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Combina y limpia los CSV crudos de data/raw.")
+    parser.add_argument('--output', '-o', help="Destino .parquet o .csv (por defecto paths.raw_data)")
+    parser.add_argument('--workers', type=int, help="Procesos de limpieza (0 = todos los núcleos)")
+    parser.add_argument('--chunk-size', type=int)
+    args = parser.parse_args()
+
+    with open("config/config.yaml", "r") as f:
+        config = yaml.safe_load(f)
+
+    run_ingestion(config, args.output, args.workers, args.chunk_size)
@@ -0,0 +1,90 @@
+import re
+import threading
+from collections import Counter
+
+# Identificación de idioma sin red (inglés vs español) con perfiles de trigramas de caracteres
+# al estilo Cavnar-Trenkle: los trigramas más frecuentes de cada idioma, de más a menos frecuente.
+# '_' marca un borde de palabra.
+PROFILES = {
+    'en': """
+        _th the he_ _an and nd_ ing ng_ _to _of of_ ed_ _in ion tio on_ er_ is_ to_ in_ at_
+        ent re_ _be hat tha _wa _ha ly_ _fo for or_ _it it_ ter ere her his _hi _wi wit ith
+        th_ ati st_ _on all ver _wh _he _ne _st ay_ rs_ ted ers _sa aid sai _ma _we was _pe
+        nt_ _as are _no ons ow_ _wo you ou_ _fr fro rom om_ ill ts_ _by by_ _sh has _ch hey
+        ey_ whi ich ght _ye ear _af _ov ove she ays _pr _co _re _de _se _me _mo _ou out _so
+        ome _ti ime _yo _ab abo ll_ wil oun ny_ ld_ oul uld our ur_ ew_ ake ke_ ies ee_ _fa
+    """,
+    'es': """
+        _de de_ _la la_ os_ _el el_ es_ _en en_ as_ _qu que ue_ _co ent nte _lo los ión ció
+        aci ado _se _pr _po _un _re _pa ara par con on_ ra_ ida da_ _es est _ca _su _al ar_
+        ad_ do_ to_ ta_ _ha res ero _no _di ien _in _si cia nto _me ste _ma nes _mi _tr _añ
+        año ños _pe per _ya _ex _fu _le les _ve _go _mu _má más _ot por _pu ist ela _e_ _y_
+        _a_ _o_ al_ amb ón_ _ll _nu _ci ndo ica ico _tu _as nci _ac eso _ho _us _ge _cu des
+        ier _ba
+    """,
+}
+# Letras que solo aparecen en español entre estos dos idiomas
+HINT_CHARS = {'es': 'ñáéíóú¿¡'}
+MAX_CHARS = 400           # Con el inicio del texto alcanza
+MIN_HITS = 8              # Menos trigramas reconocidos: idioma desconocido
+MIN_SHARE = 0.65          # Proporción mínima del puntaje del ganador
+NON_LETTERS_RE = re.compile(r'[\W\d_]+')
+
+
+def _build(profile):
+    # Peso por rango: de 2.0 (más frecuente) a ~1.0 (último del perfil)
+    ranked = list(dict.fromkeys(profile.split()))
+    n = len(ranked)
+    return {tri.replace('_', ' '): 1.0 + (n - rank) / n for rank, tri in enumerate(ranked)}
+
+
+class LanguageDetector:
+    """
+    Devuelve 'en', 'es' o None (texto corto o ambiguo: se respeta el idioma
+    elegido en la interfaz). Lleva la cuenta por resultado para /metrics.
+    """
+
+    def __init__(self, profiles=PROFILES, max_chars=MAX_CHARS, min_hits=MIN_HITS, min_share=MIN_SHARE):
+        self.languages = list(profiles)
+        # Una sola tabla trigrama -> pesos por idioma: un lookup por trigrama distinto del texto
+        weights = [_build(profiles[lang]) for lang in self.languages]
+        self.table = {tri: tuple(w.get(tri, 0.0) for w in weights) for tri in set().union(*weights)}
+        self.max_chars = max_chars
+        self.min_hits = min_hits
+        self.min_share = min_share
+        self._lock = threading.Lock()
+        self.counts = {lang: 0 for lang in self.languages}
+        self.counts['unknown'] = 0
+
+    def scores(self, text):
+        sample = str(text)[:self.max_chars].lower()
+        padded = f" {NON_LETTERS_RE.sub(' ', sample).strip()} "
+        grams = Counter([padded[i:i + 3] for i in range(len(padded) - 2)])
+        totals = [0.0] * len(self.languages)
+        hits = 0
+        table = self.table
+        for tri, n in grams.items():
+            row = table.get(tri)
+            if row is not None:
+                hits += n
+                for j, w in enumerate(row):
+                    totals[j] += n * w
+        scores = dict(zip(self.languages, totals))
+        for lang, chars in HINT_CHARS.items():
+            if lang in scores:
+                scores[lang] += 2.0 * sum(sample.count(c) for c in chars)
+        return scores, hits
+
+    def detect(self, text):
+        scores, hits = self.scores(text)
+        total = sum(scores.values())
+        lang = max(scores, key=scores.get)
+        if hits < self.min_hits or not total or scores[lang] / total < self.min_share:
+            lang = None
+        with self._lock:
+            self.counts[lang or 'unknown'] += 1
+        return lang
+
+    def stats(self):
+        with self._lock:
+            return {f"detected_{lang}": n for lang, n in self.counts.items()}
@@ -0,0 +1,123 @@
+import numpy as np
+import pandas as pd
+
+# Detección de casi-duplicados (copias sindicadas o levemente editadas) con MinHash + LSH.
+# Firmas vectorizadas con NumPy por chunk; el índice LSH compara solo candidatos (sub-cuadrático).
+MAX_TOKENS = 2000      # Tokens por texto que entran en las firmas
+MAX_HASH = np.uint64(0xFFFFFFFF)
+
+
+def _hash_params(num_perm, shingle_size, seed):
+    # Constantes impares de 64 bits: mezcla de shingles y hashing multiply-shift por permutación
+    rng = np.random.default_rng(seed)
+    shingle_mult = rng.integers(1, 2 ** 63, size=shingle_size, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+    a = rng.integers(1, 2 ** 63, size=num_perm, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+    b = rng.integers(0, 2 ** 63, size=num_perm, dtype=np.uint64)
+    return shingle_mult, a, b
+
+
+def shingle_hashes(texts, shingle_size=3):
+    """
+    Hash de 32 bits de cada shingle (n palabras seguidas) de cada texto.
+    Devuelve (hashes, inicio de cada texto, shingles por texto). Los textos
+    más cortos que un shingle cuentan como un único shingle.
+    """
+    tokens, lengths = [], []
+    for text in texts:
+        words = text.split()[:MAX_TOKENS]
+        tokens.extend(words)
+        lengths.append(len(words))
+    lengths = np.array(lengths, dtype=np.int64)
+    # pandas.util.hash_array: determinista entre procesos (hash() de Python no lo es)
+    token_hashes = pd.util.hash_array(np.array(tokens, dtype=object)) if tokens else np.zeros(0, np.uint64)
+
+    # Cada texto seguido de shingle_size - 1 ceros: ningún shingle cruza al texto siguiente
+    k = shingle_size
+    padded = lengths + k - 1
+    padded_starts = np.concatenate([[0], np.cumsum(padded)[:-1]])
+    offsets = np.arange(len(token_hashes)) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    T = np.zeros(int(padded.sum()), dtype=np.uint64)
+    T[np.repeat(padded_starts, lengths) + offsets] = token_hashes
+
+    shingle_mult, _, _ = _hash_params(1, k, seed=0)
+    H = np.zeros(len(T) - k + 1 if len(T) >= k else 0, dtype=np.uint64)
+    for j in range(k):
+        H += T[j:j + len(H)] * shingle_mult[j]
+
+    counts = np.where(lengths > 0, np.maximum(lengths - k + 1, 1), 0)
+    positions = np.repeat(padded_starts, counts) + (np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts))
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    return H[positions] >> np.uint64(32), starts, counts
+
+
+def minhash_signatures(texts, num_perm=64, shingle_size=3, seed=42):
+    """Firmas MinHash (n_textos × num_perm, uint32) de los shingles de palabras."""
+    hashes, starts, counts = shingle_hashes(texts, shingle_size)
+    _, a, b = _hash_params(num_perm, shingle_size, seed)
+    signatures = np.full((len(counts), num_perm), MAX_HASH, dtype=np.uint64)
+    has_shingles = counts > 0
+    if len(hashes):
+        for j in range(num_perm):
+            permuted = (hashes * a[j] + b[j]) >> np.uint64(32)
+            signatures[has_shingles, j] = np.minimum.reduceat(permuted, starts[has_shingles])
+    return signatures.astype(np.uint32)
+
+
+class NearDuplicateFilter:
+    """
+    Índice LSH incremental: la firma se corta en `bands` bandas y dos textos
+    son candidatos si coinciden en alguna. Un candidato es copia si la
+    Jaccard estimada (fracción de mínimos iguales) llega a `threshold`.
+    Se conserva la primera aparición, igual que la deduplicación por título.
+    """
+
+    def __init__(self, num_perm=64, bands=8, threshold=0.8, seed=42):
+        if num_perm % bands:
+            raise ValueError(f"num_perm ({num_perm}) debe ser múltiplo de bands ({bands})")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+        self.buckets = [{} for _ in range(bands)]
+        self._band_mult = np.random.default_rng(seed).integers(1, 2 ** 63, size=self.rows, dtype=np.uint64)
+        self._signatures = np.zeros((1024, num_perm), dtype=np.uint32)
+        self.kept = 0
+        self.removed = 0
+
+    def _band_keys(self, signatures):
+        # Una clave de 64 bits por banda (la verificación con la firma descarta colisiones)
+        sig = signatures.astype(np.uint64).reshape(len(signatures), self.bands, self.rows)
+        return (sig * self._band_mult).sum(axis=2).tolist()
+
+    def _store(self, signature):
+        if self.kept == len(self._signatures):
+            self._signatures = np.concatenate([self._signatures, np.zeros_like(self._signatures)])
+        self._signatures[self.kept] = signature
+        self.kept += 1
+        return self.kept - 1
+
+    def filter(self, signatures):
+        """Máscara de filas a conservar; las conservadas pasan a formar parte del índice."""
+        keep = np.ones(len(signatures), dtype=bool)
+        min_equal = int(np.ceil(self.threshold * self.num_perm))
+        for i, keys in enumerate(self._band_keys(signatures)):
+            seen = set()
+            duplicate = False
+            for band, key in enumerate(keys):
+                for candidate in self.buckets[band].get(key, ()):
+                    if candidate in seen:
+                        continue
+                    seen.add(candidate)
+                    if np.count_nonzero(self._signatures[candidate] == signatures[i]) >= min_equal:
+                        duplicate = True
+                        break
+                if duplicate:
+                    break
+            if duplicate:
+                keep[i] = False
+                self.removed += 1
+                continue
+            doc_id = self._store(signatures[i])
+            for band, key in enumerate(keys):
+                self.buckets[band].setdefault(key, []).append(doc_id)
+        return keep
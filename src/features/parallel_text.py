@@ -0,0 +1,99 @@
+import os
+import multiprocessing
+import numpy as np
+
+from features.vocabulary import DEFAULT_FILTERS, WordCounter
+
+# Estado de cada worker (se hereda con fork, o se copia una vez con spawn)
+_TEXTS = None
+_RANKS = None
+_ENCODER = None
+_OUT = None
+
+
+def resolve_workers(workers):
+    # 0 o None: todos los núcleos disponibles
+    if not workers:
+        return os.cpu_count() or 1
+    return max(1, int(workers))
+
+
+def shard_bounds(n, shards):
+    # Rangos [inicio, fin) contiguos y de tamaño parecido
+    step = max(1, -(-n // max(1, shards)))
+    return [(start, min(start + step, n)) for start in range(0, n, step)]
+
+
+def mp_context():
+    # fork evita copiar los textos a cada worker; spawn donde no existe (Windows)
+    method = 'fork' if 'fork' in multiprocessing.get_all_start_methods() else 'spawn'
+    return multiprocessing.get_context(method)
+
+
+def _init_count(texts, ranks):
+    global _TEXTS, _RANKS
+    _TEXTS, _RANKS = texts, ranks
+
+
+def _count_shard(args):
+    start, end, filters, lower, split = args
+    counter = WordCounter(filters, lower, split)
+    counter.update(_TEXTS[start:end], _RANKS[start:end])
+    return counter
+
+
+def count_words_parallel(texts, workers, ranks=None, filters=DEFAULT_FILTERS, lower=True, split=" "):
+    """
+    Cuenta palabras repartiendo los textos en shards, uno por worker.
+    Cada shard conserva el rank global de sus textos, así el merge da el
+    mismo orden de vocabulario que Tokenizer.fit_on_texts sobre todo el corpus.
+    """
+    if ranks is None:
+        ranks = np.arange(len(texts))
+    workers = min(resolve_workers(workers), max(1, len(texts)))
+    if workers == 1:
+        counter = WordCounter(filters, lower, split)
+        counter.update(texts, ranks)
+        return counter
+
+    tasks = [(a, b, filters, lower, split) for a, b in shard_bounds(len(texts), workers)]
+    with mp_context().Pool(workers, initializer=_init_count, initargs=(texts, ranks)) as pool:
+        parts = pool.map(_count_shard, tasks)
+
+    counter = parts[0]
+    for part in parts[1:]:
+        counter.merge(part)
+    return counter
+
+
+def _init_encode(texts, encoder, out, shape):
+    global _TEXTS, _ENCODER, _OUT
+    _TEXTS, _ENCODER = texts, encoder
+    _OUT = np.frombuffer(out, dtype=np.int32).reshape(shape)
+
+
+def _encode_shard(args):
+    start, end, padding, truncating = args
+    # Cada worker escribe solo sus filas de la matriz compartida
+    _OUT[start:end] = _ENCODER.encode_batch(_TEXTS[start:end], _OUT.shape[1], padding, truncating)
+    return end - start
+
+
+def encode_parallel(encoder, texts, maxlen, workers, padding='post', truncating='post'):
+    """
+    VocabEncoder.encode_batch en paralelo: los workers rellenan una matriz
+    int32 en memoria compartida, sin devolver las filas por pickle.
+    """
+    workers = min(resolve_workers(workers), max(1, len(texts)))
+    if workers == 1:
+        return encoder.encode_batch(texts, maxlen, padding=padding, truncating=truncating)
+
+    shape = (len(texts), maxlen)
+    ctx = mp_context()
+    out = ctx.RawArray('i', shape[0] * shape[1])
+    tasks = [(a, b, padding, truncating) for a, b in shard_bounds(len(texts), workers)]
+    with ctx.Pool(workers, initializer=_init_encode, initargs=(texts, encoder, out, shape)) as pool:
+        pool.map(_encode_shard, tasks)
+
+    # La vista mantiene viva la memoria compartida
+    return np.frombuffer(out, dtype=np.int32).reshape(shape)
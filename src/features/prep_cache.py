@@ -0,0 +1,177 @@
+import copy
+import hashlib
+import json
+import os
+import shutil
+import time
+import numpy as np
+
+from features.build_features import (
+    SPLITS, load_and_process_data, load_and_process_data_streaming, load_prepared_data,
+    raw_data_path, missing_data_error
+)
+
+# Parámetros que cambian el split, el vocabulario o las secuencias
+KEY_PARAMS = ('vocab_size', 'max_length', 'oov_tok', 'test_size', 'val_size',
+              'padding_type', 'trunc_type', 'clean_text')
+# Si cambia el código de preprocesamiento, la caché anterior deja de valer
+SOURCE_FILES = ('build_features.py', 'text_normalizer.py', 'vocabulary.py')
+HASH_BLOCK = 1 << 20
+MANIFEST = 'manifest.json'
+
+
+def file_sha256(path, memo_path=None):
+    """
+    Hash del CSV crudo. Si hay memo_path se recuerda junto a (tamaño, mtime)
+    para no releer el archivo entero cuando no cambió.
+    """
+    st = os.stat(path)
+    name = os.path.abspath(path)
+    stamp = [st.st_size, st.st_mtime_ns]
+    memo = {}
+    if memo_path:
+        try:
+            with open(memo_path, 'r') as f:
+                memo = json.load(f)
+            if memo[name]['stat'] == stamp:
+                return memo[name]['sha256']
+        except (OSError, ValueError, KeyError):
+            pass
+
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(HASH_BLOCK), b''):
+            digest.update(block)
+    sha = digest.hexdigest()
+
+    if memo_path:
+        memo[name] = {'stat': stamp, 'sha256': sha}
+        os.makedirs(os.path.dirname(memo_path) or '.', exist_ok=True)
+        with open(memo_path, 'w') as f:
+            json.dump(memo, f, indent=2)
+    return sha
+
+
+def source_sha256():
+    digest = hashlib.sha256()
+    base = os.path.dirname(os.path.abspath(__file__))
+    for name in SOURCE_FILES:
+        with open(os.path.join(base, name), 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def cache_key(config, memo_path=None):
+    params = config['global_params']
+    fields = {
+        'data_sha256': file_sha256(raw_data_path(config, verbose=False), memo_path),
+        'params': {k: params.get(k) for k in KEY_PARAMS},
+        'source_sha256': source_sha256(),
+    }
+    blob = json.dumps(fields, sort_keys=True).encode('utf-8')
+    return hashlib.sha256(blob).hexdigest()[:24], fields
+
+
+class PrepCache:
+    """
+    Caché direccionada por contenido del split, el tokenizer y las secuencias
+    con padding. Cada entrada es un directorio <clave>/ con X_*.npy / y_*.npy
+    (se abren como memmap), tokenizer.pkl, vocab.npz y un manifest.json.
+    """
+
+    def __init__(self, root, max_entries=3):
+        self.root = root
+        self.max_entries = max_entries
+
+    @property
+    def memo_path(self):
+        return os.path.join(self.root, 'raw_hashes.json')
+
+    def entry_dir(self, key):
+        return os.path.join(self.root, key)
+
+    def has(self, key):
+        return os.path.exists(os.path.join(self.entry_dir(key), MANIFEST))
+
+    def load(self, key, config):
+        entry = self.entry_dir(key)
+        # El serving lee tokenizer/vocab de paths: se restauran los de esta entrada
+        for name in ('tokenizer', 'vocabulary'):
+            dst = config['paths'][name]
+            os.makedirs(os.path.dirname(dst) or '.', exist_ok=True)
+            shutil.copyfile(os.path.join(entry, os.path.basename(dst)), dst)
+        os.utime(os.path.join(entry, MANIFEST))  # Marca de uso para el LRU
+        return load_prepared_data(entry)
+
+    def build(self, key, fields, config, streaming=False):
+        os.makedirs(self.root, exist_ok=True)
+        tmp = os.path.join(self.root, f".tmp-{key}-{os.getpid()}")
+        shutil.rmtree(tmp, ignore_errors=True)
+        os.makedirs(tmp)
+
+        try:
+            if streaming:
+                # Los memmaps se escriben directamente dentro de la entrada
+                cfg = copy.deepcopy(config)
+                cfg['paths']['prepared_data'] = tmp
+                load_and_process_data_streaming(cfg)
+            else:
+                splits = load_and_process_data(config)
+                for name, (X, y) in zip(SPLITS, splits):
+                    np.save(os.path.join(tmp, f"X_{name}.npy"), X.astype(np.int32, copy=False))
+                    np.save(os.path.join(tmp, f"y_{name}.npy"), y)
+
+            for name in ('tokenizer', 'vocabulary'):
+                src = config['paths'][name]
+                shutil.copyfile(src, os.path.join(tmp, os.path.basename(src)))
+            with open(os.path.join(tmp, MANIFEST), 'w') as f:
+                json.dump(dict(fields, key=key, created=time.time()), f, indent=2)
+
+            # Publicación atómica: una entrada a medio escribir nunca es válida
+            final = self.entry_dir(key)
+            shutil.rmtree(final, ignore_errors=True)
+            os.replace(tmp, final)
+        finally:
+            shutil.rmtree(tmp, ignore_errors=True)
+
+        self._prune(keep=key)
+        return load_prepared_data(final)
+
+    def _prune(self, keep):
+        entries = []
+        for name in os.listdir(self.root):
+            manifest = os.path.join(self.root, name, MANIFEST)
+            if name != keep and os.path.exists(manifest):
+                entries.append((os.path.getmtime(manifest), name))
+        # Se borran las menos usadas hasta quedar en max_entries (incluida la nueva)
+        entries.sort(reverse=True)
+        for _, name in entries[max(0, self.max_entries - 1):]:
+            shutil.rmtree(os.path.join(self.root, name), ignore_errors=True)
+
+
+def prepare_data(config):
+    """
+    Devuelve ((X_train, y_train), (X_val, y_val), (X_test, y_test)).
+    Si ni el CSV ni los parámetros cambiaron, lee la caché en vez de
+    volver a separar, tokenizar y rellenar.
+    """
+    settings = config.get('preprocessing_cache', {})
+    streaming = config['global_params'].get('streaming', False)
+    if not settings.get('enabled', True):
+        loader = load_and_process_data_streaming if streaming else load_and_process_data
+        return loader(config)
+
+    path = raw_data_path(config)
+    if not os.path.exists(path):
+        raise missing_data_error(path)
+
+    cache = PrepCache(settings.get('path', './data/cache/prepared/'), settings.get('max_entries', 3))
+    start = time.perf_counter()
+    key, fields = cache_key(config, cache.memo_path)
+    if cache.has(key):
+        splits = cache.load(key, config)
+        print(f"-> Datos preparados desde caché ({key}) en {time.perf_counter() - start:.2f} s")
+        return splits
+
+    print(f"-> Caché de preprocesamiento vacía para {key}, procesando...")
+    return cache.build(key, fields, config, streaming=streaming)
@@ -0,0 +1,4 @@
+# Parámetros con los que sirve la app web. Los comparten el serving (web/),
+# la cuantización, la cascada y los benchmarks: no importar web/ desde model/.
+MAX_LEN = 250  # Longitud de padding usada al servir
+FAKE_THRESHOLD = 0.85  # Probabilidad por encima de la cual el texto es FAKE
@@ -0,0 +1,65 @@
+import re
+import string
+
+from features.vocabulary import DEFAULT_FILTERS
+
+# Patrones precompilados (antes se recompilaban en cada llamada)
+URL_RE = re.compile(r'https?://\S+|www\.\S+')
+TAG_RE = re.compile(r'<.*?>')
+# Una clase de caracteres compilada es más rápida que str.translate con borrados
+PUNCT_RE = re.compile(f'[{re.escape(string.punctuation)}]')
+
+# Tamaño aproximado de cada bloque cuando se corta temprano
+CHUNK_CHARS = 4096
+# Mismo corte en palabras que el Tokenizer: sus filtros (\t, \n, ...) también separan
+SPLIT_TABLE = str.maketrans({c: ' ' for c in DEFAULT_FILTERS})
+
+
+def _clean_chunk(text):
+    # El orden es el del clean_text original y los modelos entrenados dependen de él:
+    # las URLs se borran antes que las etiquetas ('<a href=http://x>link</a>' -> 'a href'),
+    # así que una sola alternancia URL|etiqueta|puntuación no da el mismo texto.
+    # Minúsculas primero: la URL_RE en minúsculas conserva el prefijo literal que
+    # acelera la búsqueda (con re.IGNORECASE o clases [hH] es 3 veces más lenta)
+    text = text.lower()
+    if 'http' in text or 'www.' in text:
+        text = URL_RE.sub('', text)
+    if '<' in text:
+        text = TAG_RE.sub('', text)
+    return PUNCT_RE.sub('', text).replace('\n', ' ')
+
+
+def _count_tokens(text):
+    # Exactamente los tokens que verá el Tokenizer: si se contaran de más se cortaría antes de tiempo
+    return sum(1 for w in text.translate(SPLIT_TABLE).split(' ') if w)
+
+
+def clean_text(text, max_tokens=None):
+    """
+    Normaliza un texto: minúsculas, sin URLs, sin etiquetas HTML,
+    sin puntuación y sin saltos de línea.
+    Si se pasa max_tokens, deja de procesar cuando ya hay suficientes palabras
+    (válido con truncado 'post' y un Tokenizer con token OOV).
+    """
+    text = str(text)
+    if max_tokens is None or len(text) <= CHUNK_CHARS:
+        return _clean_chunk(text)
+
+    # Se corta siempre en un salto de línea: ni URLs ni etiquetas lo cruzan,
+    # así el resultado es idéntico al de procesar el texto completo
+    parts = []
+    tokens = 0
+    pos = 0
+    while pos < len(text) and tokens < max_tokens:
+        cut = text.find('\n', pos + CHUNK_CHARS)
+        end = len(text) if cut == -1 else cut + 1
+        chunk = _clean_chunk(text[pos:end])
+        parts.append(chunk)
+        tokens += _count_tokens(chunk)
+        pos = end
+    return ''.join(parts)
+
+
+def clean_texts(texts, max_tokens=None):
+    """Versión por lotes de clean_text, compartida por entrenamiento y servidor."""
+    return [clean_text(t, max_tokens) for t in texts]
@@ -0,0 +1,137 @@
+import numpy as np
+from collections import Counter
+from itertools import islice, repeat
+
+# Mismos valores por defecto que tf.keras Tokenizer
+DEFAULT_FILTERS = '!"#$%&()*+,-./:;<=>?@[\\]^_`{|}~\t\n'
+
+
+def split_words(text, table, lower=True, split=" "):
+    # Mismo resultado que text_to_word_sequence de Keras
+    if lower:
+        text = text.lower()
+    return [w for w in text.translate(table).split(split) if w]
+
+
+class WordCounter:
+    """
+    Conteo de palabras que reproduce el orden de Tokenizer.fit_on_texts
+    aunque los textos lleguen desordenados o en trozos: cada palabra recuerda
+    su primera aparición como (rank del texto, posición dentro del texto).
+    """
+
+    def __init__(self, filters=DEFAULT_FILTERS, lower=True, split=" "):
+        self.lower = lower
+        self.split = split
+        self._table = str.maketrans({c: split for c in filters})
+        self.counts = Counter()
+        self.first_seen = {}
+        self.document_count = 0
+
+    def update(self, texts, ranks):
+        counts = self.counts
+        first_seen = self.first_seen
+        for text, rank in zip(texts, ranks):
+            words = split_words(text, self._table, self.lower, self.split)
+            counts.update(words)
+            for pos, w in enumerate(dict.fromkeys(words)):
+                key = (rank, pos)
+                prev = first_seen.get(w)
+                if prev is None or key < prev:
+                    first_seen[w] = key
+            self.document_count += 1
+
+    def merge(self, other):
+        self.counts.update(other.counts)
+        for w, key in other.first_seen.items():
+            prev = self.first_seen.get(w)
+            if prev is None or key < prev:
+                self.first_seen[w] = key
+        self.document_count += other.document_count
+
+    def ordered_counts(self):
+        # Orden de inserción que habría tenido word_counts en Keras
+        words = sorted(self.first_seen, key=self.first_seen.__getitem__)
+        return [(w, self.counts[w]) for w in words]
+
+    def vocabulary(self, oov_token=None):
+        # Igual que fit_on_texts: por frecuencia descendente, empates por aparición
+        ordered = sorted(self.ordered_counts(), key=lambda x: x[1], reverse=True)
+        words = [w for w, _ in ordered]
+        return ([oov_token] if oov_token else []) + words
+
+
+def export_vocabulary(tokenizer, path):
+    """
+    Exporta el vocabulario de un Tokenizer de Keras a un .npz sin pickle.
+    Solo guarda las palabras con índice < num_words (las únicas que usa
+    texts_to_sequences), ordenadas por índice: la palabra i-ésima tiene id i+1.
+    """
+    num_words = tokenizer.num_words or (len(tokenizer.word_index) + 1)
+    limit = min(num_words, len(tokenizer.word_index) + 1)
+    words = [tokenizer.index_word[i] for i in range(1, limit)]
+
+    np.savez(
+        path,
+        words=np.array(words, dtype=str),
+        oov_token=np.array(tokenizer.oov_token or ""),
+        filters=np.array(tokenizer.filters),
+        lower=np.array(tokenizer.lower),
+        split=np.array(tokenizer.split),
+    )
+
+
+class VocabEncoder:
+    """
+    Codificador por lotes equivalente a texts_to_sequences + pad_sequences.
+    Escribe directamente en una matriz int32 prealocada y, con truncado 'post',
+    deja de leer palabras cuando la fila ya está llena.
+    """
+
+    def __init__(self, words, oov_token=None, filters=DEFAULT_FILTERS, lower=True, split=" "):
+        self.word_index = {w: i for i, w in enumerate(words, start=1)}
+        self.oov_index = self.word_index.get(oov_token) if oov_token else None
+        self.lower = lower
+        self.split = split
+        self._table = str.maketrans({c: split for c in filters})
+
+    @classmethod
+    def load(cls, path):
+        data = np.load(path, allow_pickle=False)
+        return cls(
+            data['words'].tolist(),
+            oov_token=str(data['oov_token']) or None,
+            filters=str(data['filters']),
+            lower=bool(data['lower']),
+            split=str(data['split']),
+        )
+
+    @classmethod
+    def from_tokenizer(cls, tokenizer):
+        num_words = tokenizer.num_words or (len(tokenizer.word_index) + 1)
+        limit = min(num_words, len(tokenizer.word_index) + 1)
+        words = [tokenizer.index_word[i] for i in range(1, limit)]
+        return cls(words, tokenizer.oov_token, tokenizer.filters, tokenizer.lower, tokenizer.split)
+
+    def _ids(self, text):
+        tokens = split_words(text, self._table, self.lower, self.split)
+        get = self.word_index.get
+        if self.oov_index is not None:
+            return map(get, tokens, repeat(self.oov_index))
+        # Sin token OOV las palabras desconocidas se descartan
+        return filter(None, map(get, tokens))
+
+    def encode_batch(self, texts, maxlen, padding='post', truncating='post'):
+        out = np.zeros((len(texts), maxlen), dtype=np.int32)
+        for i, text in enumerate(texts):
+            ids = self._ids(text)
+            if truncating == 'post':
+                row = np.fromiter(islice(ids, maxlen), dtype=np.int32)
+            else:
+                row = np.fromiter(ids, dtype=np.int32)[-maxlen:]
+
+            if padding == 'post':
+                out[i, :len(row)] = row
+            else:
+                out[i, maxlen - len(row):] = row
+        return out
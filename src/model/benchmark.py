@@ -0,0 +1,359 @@
+import yaml
+import os
+import sys
+import glob
+import json
+import time
+import argparse
+import multiprocessing
+import numpy as np
+import pandas as pd
+import tensorflow as tf
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Agregar ruta base para imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from model_arch import build_model_architecture
+from serving import ServingFunction
+from lite_runtime import TFLiteFunction
+from numpy_engine import DenseEngine
+from quantize import MODES, tflite_path
+from features.serving_params import MAX_LEN as SERVING_MAX_LENGTH
+
+BATCH_SIZES = (1, 2, 4, 8, 16, 32, 64, 128, 256)
+THREAD_COUNTS = (1, 2, 4)
+# Métricas que se comparan contra la línea base: (columna, True si más alto es mejor)
+REGRESSION_METRICS = [("p50 (ms)", False), ("p95 (ms)", False), ("p99 (ms)", False)] + \
+    [(f"filas/s b={b}", True) for b in BATCH_SIZES]
+
+
+def load_or_build(config, exp):
+    # Usa el modelo entrenado si existe; si no, la arquitectura sin entrenar (la latencia es la misma)
+    model_path = os.path.join(config['paths']['output_models'], f"{exp['name']}.keras")
+    if os.path.exists(model_path):
+        return tf.keras.models.load_model(model_path), True
+    model = build_model_architecture(
+        config['global_params']['vocab_size'],
+        config['global_params']['max_length'],
+        exp
+    )
+    return model, False
+
+
+def time_calls(fn, x, n_iter):
+    latencies = []
+    for _ in range(n_iter):
+        start = time.perf_counter()
+        fn(x)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return np.array(latencies)
+
+
+def benchmark_serving(config, n_iter=200, warmup=10):
+    vocab_size = config['global_params']['vocab_size']
+    rng = np.random.default_rng(42)
+    x = rng.integers(1, vocab_size, size=(1, SERVING_MAX_LENGTH)).astype(np.int32)
+
+    results = []
+    for exp in config['experiments']:
+        print(f"-> Benchmark: {exp['name']}")
+        model, trained = load_or_build(config, exp)
+        serving_fn = ServingFunction(model, SERVING_MAX_LENGTH)
+
+        predict = lambda rows: model.predict(rows, verbose=0)
+        for _ in range(warmup):
+            predict(x)
+            serving_fn(x)
+
+        before = time_calls(predict, x, n_iter)
+        after = time_calls(serving_fn, x, n_iter)
+
+        results.append({
+            "Experimento": exp['name'],
+            "Entrenado": trained,
+            "predict p50 (ms)": round(float(np.percentile(before, 50)), 3),
+            "predict p95 (ms)": round(float(np.percentile(before, 95)), 3),
+            "tf.function p50 (ms)": round(float(np.percentile(after, 50)), 3),
+            "tf.function p95 (ms)": round(float(np.percentile(after, 95)), 3),
+            "Speedup p50": round(float(np.percentile(before, 50) / np.percentile(after, 50)), 2),
+        })
+
+    return pd.DataFrame(results)
+
+
+def _measure_model(model_path, threads, n_iter, out):
+    # Corre en un proceso nuevo: hilos de TF fijados antes de crear los pools y ru_maxrss propio
+    tf.config.threading.set_intra_op_parallelism_threads(threads)
+    tf.config.threading.set_inter_op_parallelism_threads(threads)
+
+    start = time.perf_counter()
+    model = tf.keras.models.load_model(model_path)
+    load_s = time.perf_counter() - start
+
+    rng = np.random.default_rng(42)
+    vocab = model.layers[0].input_dim if hasattr(model.layers[0], 'input_dim') else 1000
+    rows = rng.integers(1, vocab, size=(max(BATCH_SIZES), SERVING_MAX_LENGTH)).astype(np.int32)
+
+    # Primera predicción en frío: lo que vería un servidor que recién cargó el modelo
+    start = time.perf_counter()
+    model.predict(rows[:1], verbose=0)
+    cold_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    serving_fn = ServingFunction(model, SERVING_MAX_LENGTH, max(BATCH_SIZES))
+    trace_s = time.perf_counter() - start
+
+    single = time_calls(serving_fn, rows[:1], n_iter)
+    result = {
+        "Modelo": os.path.basename(model_path),
+        "Hilos TF": threads,
+        "Carga (s)": round(load_s, 3),
+        "Primera predicción (ms)": round(cold_ms, 2),
+        "Trazado (s)": round(trace_s, 3),
+        "p50 (ms)": round(float(np.percentile(single, 50)), 3),
+        "p95 (ms)": round(float(np.percentile(single, 95)), 3),
+        "p99 (ms)": round(float(np.percentile(single, 99)), 3),
+    }
+    for batch in BATCH_SIZES:
+        # Menos repeticiones en lotes grandes: el tiempo total queda acotado
+        reps = max(3, n_iter // batch)
+        seconds = time_calls(serving_fn, rows[:batch], reps).sum() / 1000
+        result[f"filas/s b={batch}"] = round(batch * reps / seconds, 1)
+
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        result["RSS pico (MB)"] = round(peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024, 1)
+    out.put(result)
+
+
+def benchmark_inference(models_dir, thread_counts=THREAD_COUNTS, n_iter=200):
+    """
+    Costo de servir cada .keras de models/: carga, primera predicción,
+    latencia de una petición (p50/p95/p99), filas/s por tamaño de lote
+    y memoria pico, con distinta cantidad de hilos de TF.
+    """
+    ctx = multiprocessing.get_context('spawn')
+    results = []
+    for model_path in sorted(glob.glob(os.path.join(models_dir, '*.keras'))):
+        for threads in thread_counts:
+            print(f"-> Benchmark: {os.path.basename(model_path)} ({threads} hilos)")
+            out = ctx.Queue()
+            proc = ctx.Process(target=_measure_model, args=(model_path, threads, n_iter, out))
+            proc.start()
+            proc.join()
+            if proc.exitcode != 0:
+                print(f"   (falló con código {proc.exitcode})")
+                continue
+            results.append(out.get())
+    return pd.DataFrame(results)
+
+
+def check_regressions(df_res, baseline, tolerance=0.2):
+    """
+    Compara contra la línea base (mismo modelo y cantidad de hilos).
+    Devuelve las métricas que empeoraron más de `tolerance`.
+    """
+    base = {(r["Modelo"], r["Hilos TF"]): r for r in baseline}
+    regressions = []
+    for row in df_res.to_dict('records'):
+        ref = base.get((row["Modelo"], row["Hilos TF"]))
+        if ref is None:
+            continue
+        for metric, higher_is_better in REGRESSION_METRICS:
+            old, new = ref.get(metric), row.get(metric)
+            if not old or new is None:
+                continue
+            change = (old - new) / old if higher_is_better else (new - old) / old
+            if change > tolerance:
+                regressions.append({"Modelo": row["Modelo"], "Hilos TF": row["Hilos TF"],
+                                    "Métrica": metric, "Base": old, "Actual": new,
+                                    "Empeora": f"{change:.0%}"})
+    return pd.DataFrame(regressions)
+
+
+def run_inference_suite(config, args):
+    models_dir = config['paths']['output_models']
+    report_path = os.path.join(models_dir, "benchmark_inference.json")
+    baseline_path = os.path.join(models_dir, "benchmark_inference_baseline.json")
+
+    print("--- BENCHMARK: costo de inferencia por modelo ---")
+    df_res = benchmark_inference(models_dir, args.threads, args.n_iter)
+    print(df_res.to_string())
+
+    report = {"created": time.strftime("%Y-%m-%d %H:%M:%S"), "cpu_count": os.cpu_count(),
+              "tensorflow": tf.__version__, "results": df_res.to_dict('records')}
+    with open(report_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    df_res.to_csv(os.path.join(models_dir, "benchmark_inference.csv"), index=False)
+    print(f"\nReporte guardado en: {report_path}")
+
+    if args.update_baseline or not os.path.exists(baseline_path):
+        with open(baseline_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"Línea base actualizada: {baseline_path}")
+        return 0
+
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)['results']
+    regressions = check_regressions(df_res, baseline, args.tolerance)
+    if regressions.empty:
+        print(f"Sin regresiones respecto de la línea base (tolerancia {args.tolerance:.0%})")
+        return 0
+    print("\n--- REGRESIONES ---")
+    print(regressions.to_string())
+    return 1
+
+
+def evaluation_rows(config, max_length, limit=5000):
+    # Split de test recortado al largo del servidor; sin datos, filas aleatorias (solo concordancia)
+    try:
+        from features.prep_cache import prepare_data
+        _, _, (X_test, y_test) = prepare_data(config)
+        X_test, y_test = np.asarray(X_test[:limit]), np.asarray(y_test[:limit])
+    except (OSError, KeyError) as e:
+        print(f"-> Sin split de test ({e}); se compara solo contra Keras")
+        rng = np.random.default_rng(42)
+        X_test = rng.integers(1, config['global_params']['vocab_size'], size=(500, max_length))
+        # Largos variados: parte de cada fila queda como padding
+        X_test[np.arange(max_length) >= rng.integers(1, max_length + 1, size=(500, 1))] = 0
+        y_test = None
+    rows = np.zeros((len(X_test), max_length), dtype=np.int32)
+    rows[:, :min(max_length, X_test.shape[1])] = X_test[:, :max_length]
+    return rows, y_test
+
+
+def benchmark_quantized(config, n_iter=200):
+    """
+    Keras float32 vs cada variante .tflite de models/: tamaño, latencia de
+    una petición, filas/s con lotes de 32, concordancia con Keras y
+    diferencia de accuracy en el split de test.
+    """
+    models_dir = config['paths']['output_models']
+    max_length = config.get('quantization', {}).get('max_length', SERVING_MAX_LENGTH)
+    rows, y_test = evaluation_rows(config, max_length)
+
+    results = []
+    for exp in config['experiments']:
+        keras_path = os.path.join(models_dir, f"{exp['name']}.keras")
+        if not os.path.exists(keras_path):
+            continue
+        print(f"-> Benchmark cuantizado: {exp['name']}")
+        variants = [('float32', keras_path, ServingFunction(tf.keras.models.load_model(keras_path), max_length))]
+        variants += [(mode, tflite_path(models_dir, exp['name'], mode), None) for mode in MODES]
+
+        base = None
+        for mode, path, fn in variants:
+            if not os.path.exists(path):
+                continue
+            fn = fn or TFLiteFunction(path)
+            probs = fn(rows)
+            single = time_calls(fn, rows[:1], n_iter)
+            reps = max(3, n_iter // 32)
+            batch_s = time_calls(fn, rows[:32], reps).sum() / 1000
+            row = {
+                "Experimento": exp['name'],
+                "Variante": mode,
+                "Tamaño (KB)": round(os.path.getsize(path) / 1024, 1),
+                "p50 (ms)": round(float(np.percentile(single, 50)), 3),
+                "filas/s b=32": round(32 * reps / batch_s, 1),
+            }
+            if base is None:
+                base = dict(row, probs=probs)
+            row["Reducción tamaño"] = round(base["Tamaño (KB)"] / row["Tamaño (KB)"], 2)
+            row["Speedup p50"] = round(base["p50 (ms)"] / row["p50 (ms)"], 2)
+            row["Concordancia"] = round(float(np.mean((probs > 0.5) == (base["probs"] > 0.5))), 4)
+            row["Máx. dif. prob"] = round(float(np.max(np.abs(probs - base["probs"]))), 4)
+            if y_test is not None:
+                acc = float(np.mean((probs > 0.5).astype(int) == y_test.reshape(-1)))
+                base.setdefault("acc", acc)
+                row["Accuracy"] = round(acc, 4)
+                row["Δ Accuracy"] = round(acc - base["acc"], 4)
+            results.append(row)
+
+    return pd.DataFrame(results)
+
+
+def benchmark_numpy_engine(config, n_iter=200, atol=1e-5):
+    """
+    Keras (tf.function) vs DenseEngine para los experimentos 'dense':
+    diferencia máxima de probabilidad, latencia de una petición y filas/s.
+    """
+    models_dir = config['paths']['output_models']
+    rows, _ = evaluation_rows(config, SERVING_MAX_LENGTH)
+
+    results = []
+    for exp in config['experiments']:
+        keras_path = os.path.join(models_dir, f"{exp['name']}.keras")
+        if exp['type'] != 'dense' or not os.path.exists(keras_path):
+            continue
+        print(f"-> Benchmark NumPy: {exp['name']}")
+        keras_fn = ServingFunction(tf.keras.models.load_model(keras_path), SERVING_MAX_LENGTH, 256)
+        engine = DenseEngine.from_keras(keras_path, SERVING_MAX_LENGTH)
+
+        diff = float(np.max(np.abs(engine(rows) - keras_fn(rows))))
+        if diff > atol:
+            raise AssertionError(f"DenseEngine difiere de Keras en {exp['name']}: {diff:.2e}")
+
+        row = {"Experimento": exp['name'], "Máx. dif. prob": diff}
+        for name, fn in (("Keras", keras_fn), ("NumPy", engine)):
+            fn(rows[:1])
+            row[f"{name} p50 (ms)"] = round(float(np.percentile(time_calls(fn, rows[:1], n_iter), 50)), 4)
+            reps = max(3, n_iter // 32)
+            row[f"{name} filas/s b=256"] = round(256 * reps / (time_calls(fn, rows[:256], reps).sum() / 1000), 1)
+        row["Speedup p50"] = round(row["Keras p50 (ms)"] / row["NumPy p50 (ms)"], 2)
+        results.append(row)
+
+    return pd.DataFrame(results)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmarks de inferencia de los modelos.")
+    parser.add_argument('--inference', action='store_true',
+                        help="Suite completa por cada .keras de models/ (en vez de predict vs tf.function)")
+    parser.add_argument('--quantized', action='store_true',
+                        help="Compara cada .keras con sus variantes .tflite (tamaño, velocidad, accuracy)")
+    parser.add_argument('--numpy', action='store_true',
+                        help="Compara los modelos 'dense' en Keras con el motor NumPy (DenseEngine)")
+    parser.add_argument('--threads', type=int, nargs='+', default=list(THREAD_COUNTS))
+    parser.add_argument('--n-iter', type=int, default=200)
+    parser.add_argument('--tolerance', type=float, default=0.2, help="Empeoramiento tolerado (0.2 = 20%%)")
+    parser.add_argument('--update-baseline', action='store_true')
+    args = parser.parse_args()
+
+    with open("config/config.yaml", "r") as f:
+        config = yaml.safe_load(f)
+
+    if args.inference:
+        sys.exit(run_inference_suite(config, args))
+
+    if args.numpy:
+        print("--- BENCHMARK: Keras vs motor NumPy (modelos dense) ---")
+        df_res = benchmark_numpy_engine(config, args.n_iter)
+        print(df_res.to_string())
+        csv_path = os.path.join(config['paths']['output_models'], "benchmark_numpy.csv")
+        df_res.to_csv(csv_path, index=False)
+        print(f"\nReporte guardado en: {csv_path}")
+        sys.exit(0)
+
+    if args.quantized:
+        print("--- BENCHMARK: Keras float32 vs TFLite cuantizado ---")
+        df_res = benchmark_quantized(config, args.n_iter)
+        print(df_res.to_string())
+        csv_path = os.path.join(config['paths']['output_models'], "benchmark_quantized.csv")
+        df_res.to_csv(csv_path, index=False)
+        print(f"\nReporte guardado en: {csv_path}")
+        sys.exit(0)
+
+    print("--- BENCHMARK: model.predict vs tf.function ---")
+    df_res = benchmark_serving(config)
+    print(df_res)
+
+    csv_path = os.path.join(config['paths']['output_models'], "benchmark_serving.csv")
+    df_res.to_csv(csv_path, index=False)
+    print(f"\nReporte guardado en: {csv_path}")
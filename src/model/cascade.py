@@ -0,0 +1,187 @@
+import yaml
+import os
+import sys
+import json
+import time
+import numpy as np
+
+# Agregar ruta base para imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from features.serving_params import MAX_LEN, FAKE_THRESHOLD
+
+# Cascada de modelos: el rápido decide solo; si su probabilidad cae en la banda
+# [low, high] alrededor de FAKE_THRESHOLD, decide el pesado.
+DEFAULT_BAND = (0.5, 0.97)
+GRID_POINTS = 101  # Candidatos por lado de la banda (cuantiles de la probabilidad del modelo rápido)
+
+
+def serving_function(model_path, max_length=MAX_LEN):
+    # El mismo camino que el servidor web: NumPy para los 'dense', tf.function para el resto
+    from numpy_engine import DenseEngine
+    try:
+        return DenseEngine.from_keras(model_path, max_length)
+    except ValueError:
+        import tensorflow as tf
+        from serving import ServingFunction
+        return ServingFunction(tf.keras.models.load_model(model_path), max_length, 256)
+
+
+def serving_rows(X, max_length=MAX_LEN):
+    # Secuencias recortadas a lo que ve el servidor (primeros max_length tokens)
+    rows = np.zeros((len(X), max_length), dtype=np.int32)
+    sample = np.asarray(X)[:, :max_length]
+    rows[:, :sample.shape[1]] = sample
+    return rows
+
+
+def predict_all(fn, rows, batch_size=256):
+    return np.concatenate([np.asarray(fn(rows[i:i + batch_size])).reshape(-1)
+                           for i in range(0, len(rows), batch_size)])
+
+
+def band_grid(p_fast, p_slow, y, threshold=FAKE_THRESHOLD):
+    """
+    Accuracy y fracción escalada de cada banda candidata (lows × highs).
+    Con p_fast ordenada, lo que cambia al escalar un rango es una suma
+    acumulada: toda la grilla sale en O(n log n + L·H), sin recorrer filas.
+    """
+    y = np.asarray(y).reshape(-1)
+    fast_ok = ((p_fast > threshold).astype(int) == y).astype(np.int64)
+    slow_ok = ((p_slow > threshold).astype(int) == y).astype(np.int64)
+
+    below, above = p_fast[p_fast <= threshold], p_fast[p_fast > threshold]
+    q = np.linspace(0, 1, GRID_POINTS)
+    lows = np.unique(np.concatenate([np.quantile(below, q) if len(below) else [], [threshold]]))
+    highs = np.unique(np.concatenate([np.quantile(above, q) if len(above) else [], [threshold]]))
+
+    order = np.argsort(p_fast, kind='stable')
+    sorted_p = p_fast[order]
+    gain = np.concatenate([[0], np.cumsum((slow_ok - fast_ok)[order])])
+    lo_idx = np.searchsorted(sorted_p, lows, side='left')
+    hi_idx = np.searchsorted(sorted_p, highs, side='right')
+
+    n = len(y)
+    accuracy = (fast_ok.sum() + gain[hi_idx][None, :] - gain[lo_idx][:, None]) / n
+    escalated = (hi_idx[None, :] - lo_idx[:, None]) / n
+    return lows, highs, accuracy, escalated
+
+
+def tune_band(p_fast, p_slow, y, threshold=FAKE_THRESHOLD, max_accuracy_drop=0.002):
+    """
+    Banda más angosta (menos escalados) cuya accuracy queda a lo sumo
+    `max_accuracy_drop` por debajo de correr siempre el modelo pesado.
+    """
+    lows, highs, accuracy, escalated = band_grid(p_fast, p_slow, y, threshold)
+    slow_acc = float(np.mean((p_slow > threshold).astype(int) == np.asarray(y).reshape(-1)))
+    feasible = accuracy >= slow_acc - max_accuracy_drop - 1e-12
+    if not feasible.any():
+        # Solo por redondeo: escalar todo iguala al modelo pesado
+        feasible = accuracy >= accuracy.max()
+    cost = np.where(feasible, escalated, np.inf)
+    best = np.flatnonzero(cost == cost.min())
+    i, j = np.unravel_index(best[np.argmax(accuracy.reshape(-1)[best])], accuracy.shape)
+    return (float(lows[i]), float(highs[j]))
+
+
+def cascade_predict(p_fast, p_slow, band):
+    # Probabilidad que devolvería la cascada (p_slow solo en las filas escaladas)
+    escalate = (p_fast >= band[0]) & (p_fast <= band[1])
+    return np.where(escalate, p_slow, p_fast), escalate
+
+
+def evaluate(p_fast, p_slow, y, band, threshold=FAKE_THRESHOLD):
+    y = np.asarray(y).reshape(-1)
+    probs, escalate = cascade_predict(p_fast, p_slow, band)
+    acc = lambda p: round(float(np.mean((p > threshold).astype(int) == y)), 4)
+    return {
+        "escalated": round(float(escalate.mean()), 4),
+        "accuracy_fast": acc(p_fast),
+        "accuracy_slow": acc(p_slow),
+        "accuracy_cascade": acc(probs),
+        "agreement_slow": round(float(np.mean((probs > threshold) == (p_slow > threshold))), 4),
+    }
+
+
+def measure_latency(fast_fn, slow_fn, rows, band, n_rows=200):
+    """Latencia por petición (una fila) de cada modo, en ms: p50 y media."""
+    rows = rows[:n_rows]
+    for fn in (fast_fn, slow_fn):
+        fn(rows[:1])  # Trazado / primer llamado fuera de la medición
+
+    def cascade_fn(row):
+        p = float(np.asarray(fast_fn(row)).reshape(-1)[0])
+        if band[0] <= p <= band[1]:
+            slow_fn(row)
+
+    result = {}
+    for name, fn in (("fast", fast_fn), ("slow", slow_fn), ("cascade", cascade_fn)):
+        latencies = []
+        for i in range(len(rows)):
+            start = time.perf_counter()
+            fn(rows[i:i + 1])
+            latencies.append((time.perf_counter() - start) * 1000)
+        result[f"{name}_p50_ms"] = round(float(np.percentile(latencies, 50)), 3)
+        result[f"{name}_mean_ms"] = round(float(np.mean(latencies)), 3)
+    return result
+
+
+def tune_cascade(config, val, test):
+    """
+    Ajusta la banda con el split de validación, la evalúa en test y la
+    guarda en serving.cascade.band_file para el servidor web.
+    """
+    settings = config.get('serving', {}).get('cascade', {})
+    models_dir = config['paths']['output_models']
+    fast_path = os.path.join(models_dir, settings.get('fast_model', 'Exp2_Simple_Dense.keras'))
+    slow_path = os.path.join(models_dir, settings.get('slow_model', 'Exp3_Complex_LSTM.keras'))
+
+    print("\n--- AJUSTANDO CASCADA DE MODELOS ---")
+    missing = [p for p in (fast_path, slow_path) if not os.path.exists(p)]
+    if missing:
+        print(f"-> Faltan {', '.join(os.path.basename(p) for p in missing)}; se omite")
+        return None
+
+    fast_fn, slow_fn = serving_function(fast_path), serving_function(slow_path)
+    (X_val, y_val), (X_test, y_test) = val, test
+    val_rows, test_rows = serving_rows(X_val), serving_rows(X_test)
+    p_val = predict_all(fast_fn, val_rows), predict_all(slow_fn, val_rows)
+    p_test = predict_all(fast_fn, test_rows), predict_all(slow_fn, test_rows)
+
+    band = tune_band(*p_val, y_val, FAKE_THRESHOLD, settings.get('max_accuracy_drop', 0.002))
+    report = {
+        "fast_model": os.path.basename(fast_path),
+        "slow_model": os.path.basename(slow_path),
+        "threshold": FAKE_THRESHOLD,
+        "band": [round(band[0], 6), round(band[1], 6)],
+        "validation": evaluate(*p_val, y_val, band),
+        "test": evaluate(*p_test, y_test, band),
+        "latency": measure_latency(fast_fn, slow_fn, test_rows, band),
+    }
+
+    test_report, latency = report["test"], report["latency"]
+    print(f"-> Banda: [{band[0]:.4f}, {band[1]:.4f}] alrededor del umbral {FAKE_THRESHOLD}")
+    print(f"-> Escalados a {report['slow_model']}: {test_report['escalated']:.1%} del test")
+    print(f"-> Accuracy test: rápido {test_report['accuracy_fast']:.2%} | pesado {test_report['accuracy_slow']:.2%} "
+          f"| cascada {test_report['accuracy_cascade']:.2%}")
+    print(f"-> Latencia media por petición: rápido {latency['fast_mean_ms']:.2f} ms | pesado "
+          f"{latency['slow_mean_ms']:.2f} ms | cascada {latency['cascade_mean_ms']:.2f} ms")
+
+    band_file = settings.get('band_file', 'models/cascade.json')
+    os.makedirs(os.path.dirname(os.path.abspath(band_file)), exist_ok=True)
+    with open(band_file, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"-> Guardado en: {band_file}")
+    return report
+
+
+if __name__ == "__main__":
+    from features.prep_cache import prepare_data
+
+    with open("config/config.yaml", "r") as f:
+        config = yaml.safe_load(f)
+
+    # Banda ajustada en validación y reportada en test (desde la caché de preprocesamiento si existe)
+    _, val, test = prepare_data(config)
+    tune_cascade(config, val, test)
@@ -0,0 +1,74 @@
+import os
+import threading
+import numpy as np
+
+# Runtime de serving sin TensorFlow: este módulo no debe importarlo al cargarse.
+try:
+    # Intérprete liviano de LiteRT
+    from ai_edge_litert.interpreter import Interpreter
+except ImportError:
+    try:
+        # Paquete anterior de LiteRT (tflite-runtime)
+        from tflite_runtime.interpreter import Interpreter
+    except ImportError:
+        Interpreter = None
+
+
+def load_interpreter_class():
+    # Sin runtime liviano instalado se usa el de TensorFlow (importarlo cuesta segundos)
+    if Interpreter is not None:
+        return Interpreter
+    import tensorflow as tf
+    return tf.lite.Interpreter
+
+
+class TFLiteFunction:
+    """
+    Misma interfaz que ServingFunction pero sobre un modelo .tflite
+    (cuantizado con quantize.py). Los modelos con batch dinámico se
+    invocan una vez por lote; los de batch fijo (LSTM) fila por fila.
+    El intérprete no es thread-safe: las llamadas se serializan.
+    """
+
+    def __init__(self, path, max_length=None, num_threads=None):
+        self.interpreter = load_interpreter_class()(model_path=path, num_threads=num_threads)
+        inp = self.interpreter.get_input_details()[0]
+        self._input = inp['index']
+        self._output = self.interpreter.get_output_details()[0]['index']
+        self.np_dtype = inp['dtype']
+        # Largo con el que se exportó; las filas se recortan o rellenan a este valor
+        self.max_length = int(inp['shape'][1])
+        self.fixed_batch = int(inp['shape_signature'][0]) if inp['shape_signature'][0] > 0 else None
+        self.size_bytes = os.path.getsize(path)
+        self._lock = threading.Lock()
+        self._batch = int(inp['shape'][0])
+        self.interpreter.allocate_tensors()
+
+    def _invoke(self, rows):
+        if self.fixed_batch is None and len(rows) != self._batch:
+            self.interpreter.resize_tensor_input(self._input, [len(rows), self.max_length])
+            self.interpreter.allocate_tensors()
+            self._batch = len(rows)
+        self.interpreter.set_tensor(self._input, rows)
+        self.interpreter.invoke()
+        return self.interpreter.get_tensor(self._output)[:, 0].copy()
+
+    def __call__(self, rows):
+        rows = np.asarray(rows)
+        if rows.ndim == 1:
+            rows = rows[None, :]
+        padded = np.zeros((len(rows), self.max_length), dtype=self.np_dtype)
+        padded[:, :min(rows.shape[1], self.max_length)] = rows[:, :self.max_length]
+
+        with self._lock:
+            if self.fixed_batch is None:
+                return self._invoke(padded)
+            step = self.fixed_batch
+            outputs = []
+            for start in range(0, len(padded), step):
+                chunk = padded[start:start + step]
+                n = len(chunk)
+                if n < step:
+                    chunk = np.concatenate([chunk, np.zeros((step - n, self.max_length), chunk.dtype)])
+                outputs.append(self._invoke(chunk)[:n])
+            return np.concatenate(outputs)
@@ -1,6 +1,7 @@
 import tensorflow as tf
 
-def build_model_architecture(vocab_size, max_length, exp_config):
+def build_model_architecture(vocab_size, max_length, exp_config, variable_length=False):
+    # variable_length: lotes de largo variable (tf.data con buckets); el padding (id 0) se enmascara (salvo en la CNN)
     model_type = exp_config['type']
     embedding_dim = exp_config['embedding_dim']
     units = exp_config['units']
@@ -8,10 +9,13 @@ def build_model_architecture(vocab_size, max_length, exp_config):
     model = tf.keras.Sequential()
     
     # 1. Entrada explícita
-    model.add(tf.keras.layers.Input(shape=(max_length,)))
+    model.add(tf.keras.layers.Input(shape=(None if variable_length else max_length,)))
     
     # 2. Embedding
-    model.add(tf.keras.layers.Embedding(vocab_size, embedding_dim))
+    # Conv1D no propaga la máscara (Keras la descarta con un aviso): la CNN no se enmascara
+    # y ve el padding de cada lote como los ceros del modo con largo fijo
+    mask_zero = variable_length and model_type != 'cnn'
+    model.add(tf.keras.layers.Embedding(vocab_size, embedding_dim, mask_zero=mask_zero))
     
     # --- LOGICA DE SELECCIÓN DE ARQUITECTURA ---
     if model_type == 'lstm':
@@ -0,0 +1,122 @@
+import io
+import json
+import zipfile
+import numpy as np
+
+try:
+    # Suma por fila como producto disperso (filas × vocabulario) @ embeddings
+    from scipy import sparse
+except ImportError:
+    sparse = None
+
+# Motor NumPy para la arquitectura 'dense': Embedding → GlobalAveragePooling1D → Dense(relu) → Dense(sigmoid).
+# No importa TensorFlow: lee los pesos directamente del .keras (zip con config.json + model.weights.h5).
+ACTIVATIONS = {
+    'relu': lambda x: np.maximum(x, 0),
+    'sigmoid': lambda x: 1 / (1 + np.exp(-x)),
+    'linear': lambda x: x,
+}
+SKIPPED_LAYERS = ('InputLayer', 'Dropout')  # Sin efecto en inferencia
+SPARSE_MIN_TOKENS = 2048  # Por debajo, armar la matriz dispersa cuesta más que reduceat
+
+
+def _snake(name):
+    # Mismo nombre de grupo que usa Keras al guardar los pesos (Dense -> dense, dense_1, ...)
+    return "".join(f"_{c.lower()}" if c.isupper() else c for c in name).lstrip('_')
+
+
+def read_keras_file(path):
+    """Devuelve [(clase, config, [pesos])] por capa de un .keras Sequential."""
+    import h5py
+
+    with zipfile.ZipFile(path) as archive:
+        config = json.loads(archive.read('config.json'))
+        weights = h5py.File(io.BytesIO(archive.read('model.weights.h5')), 'r')
+
+    layers, seen = [], {}
+    for layer in config['config']['layers']:
+        cls = layer['class_name']
+        if cls == 'InputLayer':
+            continue
+        key = _snake(cls)
+        n = seen.get(key, 0)
+        seen[key] = n + 1
+        group = weights['layers'].get(key if n == 0 else f"{key}_{n}")
+        variables = group['vars'] if group is not None else {}
+        layers.append((cls, layer['config'], [np.asarray(variables[str(i)]) for i in range(len(variables))]))
+    weights.close()
+    return layers
+
+
+class DenseEngine:
+    """
+    Misma interfaz que ServingFunction para el modelo 'dense', en NumPy.
+    El pooling suma solo los embeddings de los tokens reales; las
+    posiciones de padding (id 0) se suman de una vez como
+    n_pad * embedding[0], igual que GlobalAveragePooling1D sin máscara,
+    que también promedia sobre el padding.
+    """
+
+    def __init__(self, embeddings, dense_layers, max_length, mask_zero=False):
+        self.embeddings = embeddings
+        self.dense_layers = dense_layers  # [(W, b, activación)]
+        self.max_length = max_length
+        self.mask_zero = mask_zero
+        self.size_bytes = embeddings.nbytes + sum(W.nbytes + b.nbytes for W, b, _ in dense_layers)
+
+    @staticmethod
+    def supports(layers):
+        classes = [cls for cls, _, _ in layers if cls not in SKIPPED_LAYERS]
+        return (len(classes) >= 3 and classes[:2] == ['Embedding', 'GlobalAveragePooling1D']
+                and all(cls == 'Dense' for cls in classes[2:])
+                and all(cfg.get('activation', 'linear') in ACTIVATIONS
+                        for cls, cfg, _ in layers if cls == 'Dense'))
+
+    @classmethod
+    def from_keras(cls, path, max_length):
+        layers = read_keras_file(path)
+        if not cls.supports(layers):
+            raise ValueError(f"{path} no es un modelo 'dense' (Embedding → GlobalAveragePooling1D → Dense)")
+        embedding = next((cfg, w) for name, cfg, w in layers if name == 'Embedding')
+        dense_layers = [(w[0], w[1], cfg.get('activation', 'linear'))
+                        for name, cfg, w in layers if name == 'Dense']
+        return cls(embedding[1][0], dense_layers, max_length, embedding[0].get('mask_zero', False))
+
+    def pool(self, rows):
+        n_rows, length = rows.shape
+        real = rows != 0
+        counts = real.sum(axis=1)
+
+        # Solo los tokens reales; quedan agrupados por fila
+        ids = rows[real]
+        bounds = np.zeros(n_rows + 1, dtype=np.int64)
+        np.cumsum(counts, out=bounds[1:])
+
+        if sparse is not None and len(ids) >= SPARSE_MIN_TOKENS:
+            tokens = sparse.csr_matrix((np.ones(len(ids), dtype=self.embeddings.dtype), ids, bounds),
+                                       shape=(n_rows, len(self.embeddings)))
+            sums = np.asarray(tokens @ self.embeddings)
+        else:
+            sums = np.zeros((n_rows, self.embeddings.shape[1]), dtype=self.embeddings.dtype)
+            has_tokens = counts > 0
+            if len(ids):
+                sums[has_tokens] = np.add.reduceat(np.take(self.embeddings, ids, axis=0),
+                                                   bounds[:-1][has_tokens], axis=0)
+
+        if self.mask_zero:
+            return sums / np.maximum(counts, 1)[:, None].astype(sums.dtype)
+        sums += (length - counts)[:, None].astype(sums.dtype) * self.embeddings[0]
+        return sums / np.float32(length)
+
+    def __call__(self, rows):
+        rows = np.asarray(rows)
+        if rows.ndim == 1:
+            rows = rows[None, :]
+        # Mismo recorte/relleno que ServingFunction: las filas tienen max_length posiciones
+        padded = np.zeros((len(rows), self.max_length), dtype=np.int64)
+        padded[:, :min(rows.shape[1], self.max_length)] = rows[:, :self.max_length]
+
+        x = self.pool(padded)
+        for W, b, activation in self.dense_layers:
+            x = ACTIVATIONS[activation](x @ W + b)
+        return x[:, 0]
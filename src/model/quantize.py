@@ -0,0 +1,98 @@
+import yaml
+import os
+import sys
+import tempfile
+import numpy as np
+import tensorflow as tf
+
+# Agregar ruta base para imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from features.serving_params import MAX_LEN as SERVING_MAX_LENGTH
+
+# dynamic: pesos INT8 | int8: además activaciones calibradas con validación | float16: pesos FP16
+MODES = ('dynamic', 'int8', 'float16')
+
+
+def is_recurrent(model):
+    # Las LSTM solo convierten con batch fijo (TensorList) y la calibración INT8 no las soporta
+    return any(isinstance(layer, (tf.keras.layers.RNN, tf.keras.layers.Bidirectional))
+               for layer in model.layers)
+
+
+def calibration_data(X_val, max_length, n_samples=200, seed=42):
+    # Muestra de validación recortada a lo que ve el servidor (primeros max_length tokens)
+    rng = np.random.default_rng(seed)
+    idx = np.sort(rng.choice(len(X_val), size=min(n_samples, len(X_val)), replace=False))
+    rows = np.zeros((len(idx), max_length), dtype=np.int32)
+    sample = np.asarray(X_val[idx])[:, :max_length]
+    rows[:, :sample.shape[1]] = sample
+    return rows
+
+
+def convert(model, mode, max_length=SERVING_MAX_LENGTH, calibration=None):
+    """Convierte un modelo Keras a TFLite cuantizado. Devuelve los bytes del .tflite."""
+    inputs = getattr(model, 'inputs', None)
+    dtype = tf.as_dtype(inputs[0].dtype) if inputs else tf.float32
+    batch = 1 if is_recurrent(model) else None
+
+    with tempfile.TemporaryDirectory() as tmp:
+        model.export(tmp, format='tf_saved_model', verbose=False,
+                     input_signature=[tf.TensorSpec([batch, max_length], dtype)])
+        converter = tf.lite.TFLiteConverter.from_saved_model(tmp)
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+        if mode == 'float16':
+            converter.target_spec.supported_types = [tf.float16]
+        elif mode == 'int8':
+            if calibration is None:
+                raise ValueError("El modo int8 necesita datos de calibración")
+            np_dtype = dtype.as_numpy_dtype
+            converter.representative_dataset = lambda: ([row[None, :].astype(np_dtype)] for row in calibration)
+        return converter.convert()
+
+
+def tflite_path(models_dir, name, mode):
+    return os.path.join(models_dir, f"{name}.{mode}.tflite")
+
+
+def export_quantized(config, X_val, modes=None, n_samples=None):
+    """
+    Exporta variantes TFLite de cada experimento entrenado:
+    models/<experimento>.<modo>.tflite
+    """
+    settings = config.get('quantization', {})
+    modes = modes or settings.get('modes', list(MODES))
+    n_samples = n_samples or settings.get('calibration_samples', 200)
+    max_length = settings.get('max_length', SERVING_MAX_LENGTH)
+    models_dir = config['paths']['output_models']
+    calibration = calibration_data(X_val, max_length, n_samples)
+
+    print("\n--- EXPORTANDO MODELOS CUANTIZADOS (TFLite) ---")
+    exported = []
+    for exp in config['experiments']:
+        keras_path = os.path.join(models_dir, f"{exp['name']}.keras")
+        if not os.path.exists(keras_path):
+            continue
+        model = tf.keras.models.load_model(keras_path)
+        for mode in modes:
+            if mode == 'int8' and is_recurrent(model):
+                print(f"-> {exp['name']}: int8 calibrado no soportado en LSTM, se omite (usar 'dynamic')")
+                continue
+            path = tflite_path(models_dir, exp['name'], mode)
+            with open(path, 'wb') as f:
+                f.write(convert(model, mode, max_length, calibration))
+            ratio = os.path.getsize(keras_path) / os.path.getsize(path)
+            print(f"-> {os.path.basename(path)}: {os.path.getsize(path) / 1024:.0f} KB ({ratio:.1f}x más chico)")
+            exported.append(path)
+    return exported
+
+
+if __name__ == "__main__":
+    from features.prep_cache import prepare_data
+
+    with open("config/config.yaml", "r") as f:
+        config = yaml.safe_load(f)
+
+    # Calibración con el split de validación (desde la caché de preprocesamiento si existe)
+    _, (X_val, _), _ = prepare_data(config)
+    export_quantized(config, X_val)
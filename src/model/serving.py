@@ -0,0 +1,68 @@
+import numpy as np
+import tensorflow as tf
+
+
+def batch_buckets(max_batch_size):
+    # Tamaños de lote permitidos: potencias de 2 hasta max_batch_size
+    buckets = []
+    size = 1
+    while size < max_batch_size:
+        buckets.append(size)
+        size *= 2
+    buckets.append(max_batch_size)
+    return buckets
+
+
+class ServingFunction:
+    """
+    Función de inferencia en modo grafo para un modelo Keras ya cargado.
+    Traza una función concreta con forma fija por cada bucket de lote,
+    así cada llamada rellena el lote al bucket más cercano y nunca re-traza.
+    Evita el data adapter y los callbacks que usa model.predict().
+    """
+
+    def __init__(self, model, max_length, max_batch_size=32):
+        self.model = model
+        self.max_length = max_length
+        self.buckets = batch_buckets(max_batch_size)
+
+        # Respetar el dtype de la entrada declarada (Input por defecto es float32)
+        inputs = getattr(model, 'inputs', None)
+        self.dtype = tf.as_dtype(inputs[0].dtype) if inputs else tf.float32
+
+        fn = tf.function(lambda x: model(x, training=False))
+        self._concrete = {
+            b: fn.get_concrete_function(tf.TensorSpec([b, max_length], self.dtype))
+            for b in self.buckets
+        }
+
+        # Calentar cada bucket para que la primera petición no pague la inicialización
+        for b in self.buckets:
+            self._concrete[b](tf.zeros([b, max_length], self.dtype))
+
+    def _bucket_for(self, n):
+        for b in self.buckets:
+            if b >= n:
+                return b
+        return self.buckets[-1]
+
+    def __call__(self, rows):
+        rows = np.asarray(rows)
+        if rows.ndim == 1:
+            rows = rows[None, :]
+
+        outputs = []
+        step = self.buckets[-1]
+        for start in range(0, len(rows), step):
+            chunk = rows[start:start + step]
+            n = len(chunk)
+            bucket = self._bucket_for(n)
+
+            padded = np.zeros((bucket, self.max_length), dtype=self.dtype.as_numpy_dtype)
+            padded[:n, :chunk.shape[1]] = chunk[:, :self.max_length]
+
+            out = self._concrete[bucket](tf.constant(padded))
+            outputs.append(out.numpy()[:n, 0])
+
+        return np.concatenate(outputs)
+
@@ -4,14 +4,189 @@ import sys
 import pandas as pd
 import time  # <--- NUEVO: Para medir tiempo
 import numpy as np
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+import tensorflow as tf
 from tensorflow.keras.callbacks import EarlyStopping
 from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score, roc_auc_score, confusion_matrix
 
 # Agregar ruta base para imports
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from features.build_features import load_and_process_data
+from features.build_features import SPLITS, make_dataset, make_bucketed_dataset, load_prepared_data
+from features.prep_cache import prepare_data
 from model_arch import build_model_architecture
+from quantize import export_quantized
+from cascade import tune_cascade
+
+# Costo relativo aproximado por tipo (para lanzar primero los experimentos largos)
+TYPE_COST = {'lstm': 10, 'cnn': 2, 'dense': 1}
+
+
+def make_inputs(config, splits, pipeline):
+    """Datos para fit/predict según el pipeline: arrays, memmap por lotes o buckets."""
+    (X_train, y_train), (X_val, y_val), (X_test, y_test) = splits
+    batch_size = config['global_params']['batch_size']
+
+    if pipeline == 'bucketed':
+        boundaries = config['global_params'].get('bucket_boundaries', [64, 128, 256, 384])
+        return {
+            "fit": dict(x=make_bucketed_dataset(X_train, y_train, batch_size, boundaries, shuffle=True),
+                        validation_data=make_bucketed_dataset(X_val, y_val, batch_size, boundaries)),
+            # Sin buckets para no desordenar las predicciones respecto de y_test
+            "test": make_bucketed_dataset(X_test, batch_size=batch_size, bucket=False),
+            "y_test": y_test,
+        }
+    if config['global_params'].get('streaming', False):
+        # Secuencias en memmap; el entrenamiento las lee por lotes con tf.data
+        return {
+            "fit": dict(x=make_dataset(X_train, y_train, batch_size, shuffle=True),
+                        validation_data=make_dataset(X_val, y_val, batch_size)),
+            "test": make_dataset(X_test, batch_size=batch_size),
+            "y_test": y_test,
+        }
+    return {
+        "fit": dict(x=X_train, y=y_train, batch_size=batch_size, validation_data=(X_val, y_val)),
+        "test": X_test,
+        "y_test": y_test,
+    }
+
+
+def train_experiment(config, exp, pipeline, inputs, save_suffix="", verbose=1):
+    print(f"\n{'='*50}")
+    print(f" ENTRENANDO: {exp['name']} ({pipeline})")
+    print(f"{'='*50}")
+
+    # Construir Modelo
+    model = build_model_architecture(
+        config['global_params']['vocab_size'],
+        config['global_params']['max_length'],
+        exp,
+        variable_length=pipeline == 'bucketed'
+    )
+
+    # Verificar parámetros
+    params_count = model.count_params()
+    print(f"-> Arquitectura: {exp['type'].upper()}")
+    print(f"-> Unidades: {exp['units']}")
+    print(f"-> Total Parámetros: {params_count:,}")
+
+    # Configurar Early Stopping
+    early_stop = EarlyStopping(monitor='val_loss', patience=2, restore_best_weights=True)
+
+    # --- INICIO CRONÓMETRO ---
+    start_time = time.time()
+
+    history = model.fit(
+        **inputs['fit'],
+        epochs=config['global_params']['epochs'],
+        callbacks=[early_stop],
+        verbose=verbose
+    )
+
+    # --- FIN CRONÓMETRO ---
+    end_time = time.time()
+    training_time = end_time - start_time
+    print(f"-> Tiempo de entrenamiento ({exp['name']}): {training_time:.2f} segundos")
+
+    # --- EVALUACIÓN EXHAUSTIVA ---
+    # Hacemos predicciones sobre el Test Set
+    y_test = inputs['y_test']
+    y_pred_prob = model.predict(inputs['test'], verbose=0)
+    # Convertimos probabilidades a 0 o 1 (usando 0.5 como umbral)
+    y_pred = (y_pred_prob > 0.5).astype(int)
+
+    # Calcular todas las métricas
+    acc = accuracy_score(y_test, y_pred)
+    prec = precision_score(y_test, y_pred)
+    rec = recall_score(y_test, y_pred)
+    f1 = f1_score(y_test, y_pred)
+    auc = roc_auc_score(y_test, y_pred_prob)
+
+    # Desglosar Matriz de Confusión (Vital para el informe)
+    tn, fp, fn, tp = confusion_matrix(y_test, y_pred).ravel()
+
+    print(f"-> Resultados {exp['name']}: Acc={acc:.2%} | F1={f1:.2%} | Time={training_time:.1f}s")
+
+    # Guardar Modelo
+    model.save(os.path.join(config['paths']['output_models'], f"{exp['name']}{save_suffix}.keras"))
+
+    # Guardar TODO en la lista de resultados
+    return {
+        "Experimento": exp['name'],
+        "Pipeline": pipeline,
+        "Tipo": exp['type'],
+        "Unidades": exp['units'],
+        "Parámetros": params_count,
+        "Tiempo (seg)": round(training_time, 2),
+        "Accuracy": round(acc, 4),
+        "Precision": round(prec, 4),  # ¿Qué tan confiable es cuando dice FAKE?
+        "Recall": round(rec, 4),      # ¿Cuántos FAKES atrapó del total?
+        "F1-Score": round(f1, 4),     # Balance entre Precision y Recall
+        "AUC-ROC": round(auc, 4),     # Capacidad de distinción general
+        "Falsos Positivos": int(fp),  # Noticias reales marcadas como fake (Error grave)
+        "Falsos Negativos": int(fn)   # Fakes que se escaparon (Error grave)
+    }
+
+
+# --- EJECUCIÓN EN PARALELO ---
+# Estado de cada proceso worker
+_SPLITS = None
+_INPUTS = {}
+
+
+def _init_worker(data_dir, threads):
+    global _SPLITS
+    # Presupuesto de hilos propio, antes de que TF cree sus thread pools
+    tf.config.threading.set_intra_op_parallelism_threads(threads)
+    tf.config.threading.set_inter_op_parallelism_threads(max(1, min(2, threads)))
+    # Los arrays se abren como memmap: todos los workers comparten las mismas páginas
+    _SPLITS = load_prepared_data(data_dir)
+
+
+def _run_task(config, exp, pipeline, save_suffix):
+    if pipeline not in _INPUTS:
+        _INPUTS[pipeline] = make_inputs(config, _SPLITS, pipeline)
+    return train_experiment(config, exp, pipeline, _INPUTS[pipeline], save_suffix, verbose=2)
+
+
+def shared_data_dir(config, splits):
+    # Si los splits ya son memmaps (caché o streaming) se reutiliza su directorio
+    X_train = splits[0][0]
+    if isinstance(X_train, np.memmap) and X_train.filename:
+        return os.path.dirname(X_train.filename)
+    out_dir = config['paths']['prepared_data']
+    os.makedirs(out_dir, exist_ok=True)
+    for name, (X, y) in zip(SPLITS, splits):
+        np.save(os.path.join(out_dir, f"X_{name}.npy"), X)
+        np.save(os.path.join(out_dir, f"y_{name}.npy"), y)
+    return out_dir
+
+
+def experiment_cost(exp):
+    return TYPE_COST.get(exp['type'], 1) * exp['units'] * exp['embedding_dim']
+
+
+def launch_order(tasks):
+    # Los más costosos primero para que no queden solos al final del barrido
+    return sorted(range(len(tasks)), key=lambda i: experiment_cost(tasks[i][0]), reverse=True)
+
+
+def run_parallel(config, tasks, splits, workers):
+    threads = config['global_params'].get('threads_per_worker') or \
+        max(1, (os.cpu_count() or 1) // workers)
+    print(f"-> {len(tasks)} entrenamientos en {workers} procesos ({threads} hilos TF cada uno)")
+    data_dir = shared_data_dir(config, splits)
+
+    order = launch_order(tasks)
+    ctx = multiprocessing.get_context('spawn')  # TF no es seguro con fork
+    with ProcessPoolExecutor(workers, mp_context=ctx, initializer=_init_worker,
+                             initargs=(data_dir, threads)) as pool:
+        futures = {i: pool.submit(_run_task, config, *tasks[i]) for i in order}
+        # El reporte conserva el orden de config.yaml
+        return [futures[i].result() for i in range(len(tasks))]
+
 
 def run_training():
     # 1. Cargar Configuración
@@ -22,98 +197,49 @@ def run_training():
 
     # 2. Procesar Datos (Una vez para todos)
     print("--- PREPARANDO DATOS ---")
-    (X_train, y_train), (X_val, y_val), (X_test, y_test) = load_and_process_data(config)
-
-    results = []
-
-    # 3. Ejecutar los 3 Experimentos
-    for exp in config['experiments']:
-        print(f"\n{'='*50}")
-        print(f" ENTRENANDO: {exp['name']}")
-        print(f"{'='*50}")
-        
-        # Construir Modelo
-        model = build_model_architecture(
-            config['global_params']['vocab_size'],
-            config['global_params']['max_length'],
-            exp
-        )
-        
-        # Verificar parámetros
-        params_count = model.count_params()
-        print(f"-> Arquitectura: {exp['type'].upper()}")
-        print(f"-> Unidades: {exp['units']}")
-        print(f"-> Total Parámetros: {params_count:,}")
-        
-        # Configurar Early Stopping
-        early_stop = EarlyStopping(monitor='val_loss', patience=2, restore_best_weights=True)
-        
-        # --- INICIO CRONÓMETRO ---
-        start_time = time.time()
-        
-        history = model.fit(
-            X_train, y_train,
-            epochs=config['global_params']['epochs'],
-            batch_size=config['global_params']['batch_size'],
-            validation_data=(X_val, y_val),
-            callbacks=[early_stop],
-            verbose=1
-        )
-        
-        # --- FIN CRONÓMETRO ---
-        end_time = time.time()
-        training_time = end_time - start_time
-        print(f"-> Tiempo de entrenamiento: {training_time:.2f} segundos")
-
-        # --- EVALUACIÓN EXHAUSTIVA ---
-        # Hacemos predicciones sobre el Test Set
-        y_pred_prob = model.predict(X_test, verbose=0)
-        # Convertimos probabilidades a 0 o 1 (usando 0.5 como umbral)
-        y_pred = (y_pred_prob > 0.5).astype(int)
-        
-        # Calcular todas las métricas
-        acc = accuracy_score(y_test, y_pred)
-        prec = precision_score(y_test, y_pred)
-        rec = recall_score(y_test, y_pred)
-        f1 = f1_score(y_test, y_pred)
-        auc = roc_auc_score(y_test, y_pred_prob)
-        
-        # Desglosar Matriz de Confusión (Vital para el informe)
-        tn, fp, fn, tp = confusion_matrix(y_test, y_pred).ravel()
-        
-        print(f"-> Resultados: Acc={acc:.2%} | F1={f1:.2%} | Time={training_time:.1f}s")
-        
-        # Guardar Modelo
-        model.save(os.path.join(config['paths']['output_models'], f"{exp['name']}.keras"))
-        
-        # Guardar TODO en la lista de resultados
-        results.append({
-            "Experimento": exp['name'],
-            "Tipo": exp['type'],
-            "Unidades": exp['units'],
-            "Parámetros": params_count,
-            "Tiempo (seg)": round(training_time, 2),
-            "Accuracy": round(acc, 4),
-            "Precision": round(prec, 4),  # ¿Qué tan confiable es cuando dice FAKE?
-            "Recall": round(rec, 4),      # ¿Cuántos FAKES atrapó del total?
-            "F1-Score": round(f1, 4),     # Balance entre Precision y Recall
-            "AUC-ROC": round(auc, 4),     # Capacidad de distinción general
-            "Falsos Positivos": fp,       # Noticias reales marcadas como fake (Error grave)
-            "Falsos Negativos": fn        # Fakes que se escaparon (Error grave)
-        })
+    # Reutiliza split/tokenizer/secuencias si el CSV y los parámetros no cambiaron
+    splits = prepare_data(config)
+
+    # padded: 500 tokens por fila | bucketed: sin padding, lotes agrupados por largo | both: ambos
+    input_pipeline = config['global_params'].get('input_pipeline', 'padded')
+    pipelines = ['padded', 'bucketed'] if input_pipeline == 'both' else [input_pipeline]
+
+    # 3. Ejecutar los Experimentos
+    # En modo 'both' el modelo con buckets no pisa al original
+    tasks = [(exp, pipeline, "_Bucketed" if pipeline == 'bucketed' and len(pipelines) > 1 else "")
+             for exp in config['experiments'] for pipeline in pipelines]
+    workers = min(config['global_params'].get('parallel_experiments', 1), len(tasks))
+
+    sweep_start = time.time()
+    if workers > 1:
+        results = run_parallel(config, tasks, splits, workers)
+    else:
+        inputs = {p: make_inputs(config, splits, p) for p in pipelines}
+        results = [train_experiment(config, exp, pipeline, inputs[pipeline], suffix)
+                   for exp, pipeline, suffix in tasks]
+    sweep_time = time.time() - sweep_start
 
     # 4. Generar Reporte Completo
     print("\n\n--- REPORTE FINAL DETALLADO ---")
     df_res = pd.DataFrame(results)
-    
+
     # Reordenar columnas para que sea más legible
-    cols = ["Experimento", "Tiempo (seg)", "Accuracy", "F1-Score", "Recall", "Precision", "Parámetros", "Falsos Positivos", "Falsos Negativos"]
+    cols = ["Experimento", "Pipeline", "Tiempo (seg)", "Accuracy", "F1-Score", "Recall", "Precision", "Parámetros", "Falsos Positivos", "Falsos Negativos"]
     print(df_res[cols])
-    
+    print(f"\n-> Tiempo total del barrido: {sweep_time:.1f} s ({workers} proceso(s))")
+
     # Guardar CSV
     csv_path = os.path.join(config['paths']['output_models'], "resultados_finales_completo.csv")
     df_res.to_csv(csv_path, index=False)
     print(f"\nReporte guardado en: {csv_path}")
 
+    # 5. Variantes TFLite cuantizadas (calibradas con validación)
+    if config.get('quantization', {}).get('enabled', False):
+        export_quantized(config, splits[1][0])
+
+    # 6. Banda de la cascada rápido → pesado (validación) y reporte en test
+    if config.get('serving', {}).get('cascade', {}).get('enabled', False):
+        tune_cascade(config, splits[1], splits[2])
+
 if __name__ == "__main__":
-    run_training()
\ No newline at end of file
+    run_training()
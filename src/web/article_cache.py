@@ -0,0 +1,117 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class CachedArticle:
+    def __init__(self, url, title, text, etag=None, last_modified=None):
+        self.url = url
+        self.title = title
+        self.text = text
+        self.etag = etag
+        self.last_modified = last_modified
+        self.checked_at = time.time()
+        # (modelo, versión del archivo, idioma) -> (label, confidence, translated)
+        self.predictions = {}
+
+    def size(self):
+        size = len(self.url) + len(self.title) + len(self.text)
+        for _, _, translated in self.predictions.values():
+            size += len(translated)
+        return size
+
+
+class ArticleCache:
+    """
+    Caché de artículos scrapeados por URL, con sus predicciones por modelo.
+    Dentro de `fresh_seconds` se sirve sin tocar la red; después se revalida
+    con ETag/Last-Modified. Se desaloja por LRU según el tamaño total.
+    """
+
+    def __init__(self, max_mb=64, fresh_seconds=300):
+        self.max_size = max_mb * 1024 * 1024
+        self.fresh_seconds = fresh_seconds
+
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self.prediction_hits = 0
+
+    def get(self, url):
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is not None:
+                self._entries.move_to_end(url)
+            return entry
+
+    def is_fresh(self, entry):
+        return time.time() - entry.checked_at < self.fresh_seconds
+
+    def mark_hit(self):
+        with self._lock:
+            self.hits += 1
+
+    def mark_revalidated(self, entry, etag=None, last_modified=None):
+        with self._lock:
+            entry.checked_at = time.time()
+            entry.etag = etag or entry.etag
+            entry.last_modified = last_modified or entry.last_modified
+            self.revalidated += 1
+
+    def put(self, url, title, text, etag=None, last_modified=None):
+        with self._lock:
+            self.misses += 1
+            entry = CachedArticle(url, title, text, etag, last_modified)
+
+            old = self._entries.pop(url, None)
+            if old is not None:
+                self._size -= old.size()
+                # Si el contenido no cambió, las predicciones siguen valiendo
+                if old.title == title and old.text == text:
+                    entry.predictions = old.predictions
+
+            self._entries[url] = entry
+            self._size += entry.size()
+            self._evict()
+            return entry
+
+    def get_prediction(self, entry, key):
+        with self._lock:
+            pred = entry.predictions.get(key)
+            if pred is not None:
+                self.prediction_hits += 1
+            return pred
+
+    def set_prediction(self, entry, key, prediction):
+        with self._lock:
+            # Las predicciones de otra versión del mismo modelo quedan obsoletas
+            stale = [k for k in entry.predictions if k[0] == key[0] and k[1] != key[1]]
+            in_cache = self._entries.get(entry.url) is entry
+            if in_cache:
+                self._size -= entry.size()
+            for k in stale:
+                del entry.predictions[k]
+            entry.predictions[key] = prediction
+            if in_cache:
+                self._size += entry.size()
+                self._evict()
+
+    def _evict(self):
+        while self._size > self.max_size and len(self._entries) > 1:
+            _, old = self._entries.popitem(last=False)
+            self._size -= old.size()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "size_mb": round(self._size / (1024 * 1024), 2),
+                "hits": self.hits,
+                "revalidated": self.revalidated,
+                "misses": self.misses,
+                "prediction_hits": self.prediction_hits,
+            }
@@ -0,0 +1,116 @@
+import threading
+import queue
+import time
+from concurrent.futures import Future
+import numpy as np
+
+# Marca para detener el hilo del batcher
+_STOP = object()
+
+
+class MicroBatcher:
+    """
+    Agrupa peticiones concurrentes en un solo forward pass.
+    Cada petición espera como máximo `max_wait_ms` o hasta que el lote
+    alcance `max_batch_size` filas, y recibe solo su propio resultado.
+    """
+
+    def __init__(self, predict_fn, max_batch_size=32, max_wait_ms=5, name="model"):
+        self.predict_fn = predict_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.name = name
+
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._closed = False
+
+        # Métricas
+        self.total_batches = 0
+        self.total_items = 0
+        self.last_batch_size = 0
+        self.max_batch_seen = 0
+        self.batch_size_counts = {}
+
+        self._thread = threading.Thread(target=self._loop, name=f"batcher-{name}", daemon=True)
+        self._thread.start()
+
+    def submit(self, row):
+        future = Future()
+        with self._lock:
+            if not self._closed:
+                self._queue.put((np.asarray(row), future))
+                return future
+        # El modelo fue desalojado mientras llegaba la petición: se resuelve directo
+        self._run_batch([(np.asarray(row), future)])
+        return future
+
+    def predict(self, row, timeout=None):
+        return self.submit(row).result(timeout=timeout)
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+            self._queue.put(_STOP)
+
+    def _loop(self):
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                return
+            batch = [item]
+            stop = False
+
+            # Juntar más peticiones hasta llenar el lote o vencer la ventana
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stop = True
+                    break
+                batch.append(item)
+
+            self._run_batch(batch)
+            if stop:
+                return
+
+    def _run_batch(self, batch):
+        try:
+            # Una fila con otra forma o dtype falla acá: el error llega a todo el lote
+            # y el hilo del batcher sigue atendiendo
+            rows = np.stack([row for row, _ in batch])
+            outputs = self.predict_fn(rows)
+        except Exception as e:
+            for _, future in batch:
+                future.set_exception(e)
+            return
+
+        for (_, future), out in zip(batch, outputs):
+            future.set_result(out)
+
+        size = len(batch)
+        with self._lock:
+            self.total_batches += 1
+            self.total_items += size
+            self.last_batch_size = size
+            self.max_batch_seen = max(self.max_batch_seen, size)
+            self.batch_size_counts[size] = self.batch_size_counts.get(size, 0) + 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                "model": self.name,
+                "queue_depth": self._queue.qsize(),
+                "total_batches": self.total_batches,
+                "total_items": self.total_items,
+                "avg_batch_size": round(self.total_items / self.total_batches, 2) if self.total_batches else 0.0,
+                "last_batch_size": self.last_batch_size,
+                "max_batch_size_seen": self.max_batch_seen,
+                "batch_size_counts": dict(sorted(self.batch_size_counts.items())),
+            }
@@ -0,0 +1,324 @@
+import asyncio
+import gzip
+import multiprocessing
+import os
+import random
+import resource
+import sys
+import threading
+import time
+import tracemalloc
+import urllib.request
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+# Agregar ruta base para imports
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from fetcher import ArticleFetcher
+from extractor import extract_article
+from reference_samples import soup_extract_article, MALFORMED_CASES, EN_SENTENCES, ES_SENTENCES
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../'))
+MODELS_DIR = os.path.join(BASE_DIR, 'models')
+HTML_CORPUS_DIR = os.path.join(BASE_DIR, 'data', 'benchmark', 'html')
+
+UPSTREAM_DELAY = 0.5  # Segundos que tarda el "sitio de noticias" en responder
+N_REQUESTS = 20
+
+ARTICLE_HTML = (
+    "<html><head><title>Stub</title></head><body><h1>Stub headline</h1>"
+    + "".join(f"<p>Paragraph {i} of a slow news site.</p>" for i in range(200))
+    + "</body></html>"
+).encode('utf-8')
+
+
+class SlowHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        time.sleep(UPSTREAM_DELAY)
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(ARTICLE_HTML)))
+        self.end_headers()
+        self.wfile.write(ARTICLE_HTML)
+
+    def log_message(self, *args):
+        pass
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+
+def start_stub_server():
+    server = StubServer(('127.0.0.1', 0), SlowHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def blocking_fetch_all(urls):
+    # Equivalente al scrape_article original: una descarga bloqueante tras otra
+    for url in urls:
+        with urllib.request.urlopen(url, timeout=10) as response:
+            response.read()
+
+
+async def async_fetch_all(urls, max_per_host):
+    fetcher = ArticleFetcher(max_per_host=max_per_host)
+    try:
+        return await asyncio.gather(*(fetcher.fetch(url) for url in urls))
+    finally:
+        await fetcher.aclose()
+
+
+def benchmark_fetcher():
+    server = start_stub_server()
+    host, port = server.server_address
+    urls = [f"http://{host}:{port}/article/{i}" for i in range(N_REQUESTS)]
+
+    try:
+        start = time.perf_counter()
+        blocking_fetch_all(urls)
+        blocking_time = time.perf_counter() - start
+
+        results = {"Bloqueante (secuencial)": blocking_time}
+        for per_host in (4, N_REQUESTS):
+            start = time.perf_counter()
+            asyncio.run(async_fetch_all(urls, per_host))
+            results[f"Async (max_per_host={per_host})"] = time.perf_counter() - start
+    finally:
+        server.shutdown()
+
+    print(f"-> {N_REQUESTS} descargas, upstream con {UPSTREAM_DELAY}s de latencia")
+    for name, seconds in results.items():
+        print(f"   {name:<28} {seconds:6.2f} s")
+
+
+# --- EXTRACCIÓN HTML ---
+def generate_html_corpus(seed=7):
+    """
+    Genera las páginas de data/benchmark/html: portadas de noticias con mucho
+    CSS y JSON embebido en <script>, menús largos y el artículo en <p>.
+    """
+    rng = random.Random(seed)
+    words = ("the government said on tuesday that officials would review the claims made by "
+             "several reports about the election results and the economy while critics argued "
+             "that the new policy could affect millions of people across the country").split()
+
+    def sentence(n):
+        return " ".join(rng.choice(words) for _ in range(n)).capitalize() + "."
+
+    def paragraph():
+        parts = [sentence(rng.randint(8, 25)) for _ in range(rng.randint(2, 5))]
+        i = rng.randrange(len(parts))
+        parts[i] = parts[i].replace("the", '<a href="/tag/x">the</a>', 1)
+        if rng.random() < 0.3:
+            parts.append("<em>Reporting &amp; analysis</em> &mdash; staff.")
+        return "<p>" + " ".join(parts) + "</p>"
+
+    def script_blob(kb):
+        items = ",".join('{"id":%d,"html":"<p>ad slot %d<\\/p>","t":"%s"}' % (i, i, sentence(6))
+                         for i in range(kb * 12))
+        return "<script>window.__STATE__=[" + items + "];</script>"
+
+    def page(n_paragraphs, script_kb, nav_items):
+        html = ["<!DOCTYPE html><html lang='en'><head><meta charset='utf-8'><title>News</title><style>"]
+        html += [".c%d{margin:%dpx;color:#%06x}" % (i, i % 20, i * 997 % 0xffffff) for i in range(script_kb * 20)]
+        html += ["</style>", script_blob(script_kb), "</head><body><nav><ul>"]
+        html += [f"<li><a href='/s/{i}'>Section {i}</a></li>" for i in range(nav_items)]
+        html += ["</ul></nav><main><article><header>",
+                 "<h1>  Officials <span>review</span> the election claims  </h1>",
+                 "<p class='byline'>By Staff Reporter</p></header><!-- ad --><div class='body'>"]
+        for i in range(n_paragraphs):
+            html.append(paragraph())
+            if i % 7 == 3:
+                html.append("<figure><img src='x.jpg'><figcaption>Photo caption</figcaption></figure>")
+                html.append(script_blob(1))
+        html += ["</div></article></main><footer>"]
+        html += [f"<div class='f'><a href='#'>Link {i}</a></div>" for i in range(nav_items)]
+        html += ["<p>© News Corp. All rights reserved.</p></footer>", script_blob(script_kb), "</body></html>"]
+        return "".join(html).encode('utf-8')
+
+    os.makedirs(HTML_CORPUS_DIR, exist_ok=True)
+    for name, args in (("small", (15, 8, 40)), ("medium", (40, 60, 200)), ("large", (200, 400, 1200))):
+        with gzip.open(os.path.join(HTML_CORPUS_DIR, f"{name}.html.gz"), 'wb', compresslevel=9) as f:
+            f.write(page(*args))
+
+
+def load_html_corpus():
+    if not os.path.isdir(HTML_CORPUS_DIR):
+        generate_html_corpus()
+    pages = {}
+    for fname in sorted(os.listdir(HTML_CORPUS_DIR)):
+        if fname.endswith('.html.gz'):
+            with gzip.open(os.path.join(HTML_CORPUS_DIR, fname), 'rb') as f:
+                pages[fname[:-len('.html.gz')]] = f.read()
+    return pages
+
+
+def check_extractor_parity(pages):
+    for page_name, html in pages.items():
+        if soup_extract_article(html) != extract_article(html):
+            raise AssertionError(f"El extractor difiere de BeautifulSoup en {page_name}")
+    for html, expected, soup_agrees in MALFORMED_CASES:
+        text = extract_article(html)[1]
+        if text != expected:
+            raise AssertionError(f"{html!r}: {text!r} en vez de {expected!r}")
+        if soup_agrees and soup_extract_article(html)[1] != text:
+            raise AssertionError(f"{html!r}: difiere de BeautifulSoup")
+
+
+EXTRACTORS = {
+    "BeautifulSoup": soup_extract_article,
+    "Streaming": extract_article,
+    "Streaming (60 párrafos)": lambda html: extract_article(html, max_paragraphs=60),
+}
+
+
+def _measure_extractor(name, html, n_repeats, out):
+    # Corre en un proceso nuevo: ru_maxrss es el pico de ese proceso
+    fn = EXTRACTORS[name]
+    best = float('inf')
+    for _ in range(n_repeats):
+        start = time.perf_counter()
+        fn(html)
+        best = min(best, time.perf_counter() - start)
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+    # Pico de memoria Python asignada durante una extracción
+    tracemalloc.start()
+    fn(html)
+    _, peak_alloc = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    out.put((best, peak_rss, peak_alloc / (1024 * 1024)))
+
+
+def benchmark_extractor(n_repeats=5):
+    pages = load_html_corpus()
+    ctx = multiprocessing.get_context('spawn')
+
+    check_extractor_parity(pages)
+    print(f"-> Paridad con BeautifulSoup: OK (+{len(MALFORMED_CASES)} casos de HTML mal formado)")
+    print(f"   {'Página':<8} {'KB':>7} {'Extractor':<26} {'Tiempo (ms)':>12} {'Pico RSS (MB)':>14} {'Pico alloc (MB)':>16}")
+    for page_name, html in pages.items():
+        for name in EXTRACTORS:
+            out = ctx.Queue()
+            proc = ctx.Process(target=_measure_extractor, args=(name, html, n_repeats, out))
+            proc.start()
+            seconds, rss_mb, alloc_mb = out.get()
+            proc.join()
+            print(f"   {page_name:<8} {len(html) / 1024:7.0f} {name:<26} {seconds * 1000:12.2f} {rss_mb:14.1f} {alloc_mb:16.2f}")
+
+
+# --- ARRANQUE EN FRÍO DEL SERVIDOR ---
+COLD_START_TEXT = "Breaking news: officials confirm the report was published today after a long review."
+
+
+def _measure_cold_start(backend, model_name, out):
+    # Proceso nuevo: import de la app + primera predicción, como tras un reinicio del contenedor
+    start = time.perf_counter()
+    import main
+    import_s = time.perf_counter() - start
+    main.RUNTIME = 'lite' if backend == 'lite' else 'tensorflow'
+    main.SERVING_CONFIG['numpy_dense'] = backend == 'numpy'
+
+    start = time.perf_counter()
+    main.get_prediction(COLD_START_TEXT, lang="en", model_name=model_name)
+    first_s = time.perf_counter() - start
+    out.put({
+        "import_s": import_s,
+        "first_s": first_s,
+        "rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "tensorflow": 'tensorflow' in sys.modules,
+    })
+
+
+def benchmark_cold_start(model_name="Exp2_Simple_Dense.keras", variant="float16", n_runs=3):
+    """
+    Tiempo hasta la primera predicción y RSS de un proceso nuevo de la app:
+    .keras con TensorFlow, .keras con el motor NumPy y .tflite (runtime lite).
+    """
+    stem = model_name[:-len('.keras')]
+    required = [model_name, f"{stem}.{variant}.tflite"]
+    missing = [f for f in required if not os.path.exists(os.path.join(MODELS_DIR, f))]
+    if missing:
+        print(f"-> Faltan {missing} en models/ (entrenar y correr src/model/quantize.py)")
+        return
+
+    ctx = multiprocessing.get_context('spawn')
+    print(f"   {'Backend':<12} {'Import (s)':>11} {'1ª predicción (s)':>18} {'Total (s)':>10} {'RSS (MB)':>9}  TensorFlow")
+    for backend in ("tensorflow", "numpy", "lite"):
+        runs = []
+        for _ in range(n_runs):
+            out = ctx.Queue()
+            proc = ctx.Process(target=_measure_cold_start, args=(backend, model_name, out))
+            proc.start()
+            runs.append(out.get())
+            proc.join()
+        # Mediana de las corridas (la primera puede pagar la caché de disco)
+        best = sorted(runs, key=lambda r: r["import_s"] + r["first_s"])[len(runs) // 2]
+        print(f"   {backend:<12} {best['import_s']:11.2f} {best['first_s']:18.2f} "
+              f"{best['import_s'] + best['first_s']:10.2f} {best['rss_mb']:9.0f}  "
+              f"{'importado' if best['tensorflow'] else 'no'}")
+
+
+# --- DETECCIÓN DE IDIOMA ---
+def mixed_language_sample(n_texts=1000, share_en=0.5, seed=3):
+    # Textos pegados en la app: titulares sueltos o varias oraciones, en inglés o en español
+    rng = random.Random(seed)
+    sample = []
+    for _ in range(n_texts):
+        lang = "en" if rng.random() < share_en else "es"
+        pool = EN_SENTENCES if lang == "en" else ES_SENTENCES
+        sample.append((lang, " ".join(rng.choices(pool, k=rng.randint(1, 8)))))
+    return sample
+
+
+def benchmark_language_id(n_texts=1000):
+    sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+    from features.lang_id import LanguageDetector
+
+    detector = LanguageDetector()
+    sample = mixed_language_sample(n_texts)
+    detected, timings = [], []
+    for _, text in sample:
+        start = time.perf_counter()
+        detected.append(detector.detect(text))
+        timings.append(time.perf_counter() - start)
+
+    # Con el selector en español: antes se traducía todo; ahora solo lo no detectado como inglés
+    calls_before = len(sample)
+    calls_after = sum(1 for lang in detected if lang != "en")
+    decided = [(truth, lang) for (truth, _), lang in zip(sample, detected) if lang is not None]
+    spanish_skipped = sum(1 for (truth, _), lang in zip(sample, detected) if truth == "es" and lang == "en")
+    timings.sort()
+
+    print(f"-> {n_texts} textos ({sum(1 for t, _ in sample if t == 'en')} en inglés), selector en 'es'")
+    print(f"   Llamadas al traductor: {calls_before} -> {calls_after} "
+          f"({calls_before - calls_after} evitadas, {(calls_before - calls_after) / calls_before:.0%})")
+    print(f"   Aciertos del detector: {sum(t == l for t, l in decided) / max(len(decided), 1):.2%} "
+          f"| sin decidir: {n_texts - len(decided)} | español sin traducir: {spanish_skipped}")
+    print(f"   Latencia: p50 {timings[len(timings) // 2] * 1e6:.0f} µs | "
+          f"p99 {timings[int(len(timings) * 0.99)] * 1e6:.0f} µs")
+
+    # Titulares sueltos (el caso más corto que se pega en la app): todos deben decidirse bien
+    headlines = [("en", s) for s in EN_SENTENCES] + [("es", s) for s in ES_SENTENCES]
+    wrong = [(truth, lang, text) for truth, text in headlines
+             if (lang := detector.detect(text)) != truth]
+    print(f"   Titulares sueltos: {len(headlines) - len(wrong)}/{len(headlines)} correctos")
+    for truth, lang, text in wrong:
+        print(f"     [{truth} -> {lang or 'sin decidir'}] {text}")
+
+
+if __name__ == "__main__":
+    print("--- BENCHMARK: descarga bloqueante vs ArticleFetcher ---")
+    benchmark_fetcher()
+
+    print("\n--- BENCHMARK: BeautifulSoup vs extractor streaming ---")
+    benchmark_extractor()
+
+    print("\n--- BENCHMARK: detección local de idioma (traducciones evitadas) ---")
+    benchmark_language_id()
+
+    print("\n--- BENCHMARK: arranque en frío, TensorFlow vs NumPy vs runtime lite ---")
+    benchmark_cold_start()
@@ -0,0 +1,148 @@
+import codecs
+import re
+from html.parser import HTMLParser
+
+# Contenido que BeautifulSoup.get_text() tampoco devuelve
+SKIP_TAGS = {'script', 'style', 'template'}
+# Bloques cuyo cierre también cierra un <p> abierto dentro de ellos (HTML5: cierre implícito)
+BLOCK_TAGS = {'html', 'body', 'main', 'article', 'section', 'div', 'aside', 'header', 'footer',
+              'nav', 'blockquote', 'figure', 'form', 'ul', 'ol', 'li', 'dl', 'dt', 'dd',
+              'table', 'tr', 'td', 'th'}
+CHARSET_RE = re.compile(rb'charset=["\']?([\w-]+)', re.IGNORECASE)
+P_START_RE = re.compile(rb'<p[\s>]', re.IGNORECASE)
+FEED_CHARS = 65536
+
+
+class ParagraphCounter:
+    """
+    Corte de la descarga: cuenta aperturas <p> (muchas páginas no los cierran)
+    en cada chunk nuevo, sin volver a recorrer lo ya descargado. Guarda los
+    últimos bytes por si una etiqueta quedó partida entre dos chunks.
+    """
+
+    OVERLAP = 2  # Largo del patrón '<p>' menos uno: una apertura no entra entera en la cola
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.count = 0
+        self._tail = b''
+
+    def __call__(self, chunk):
+        data = self._tail + bytes(chunk)
+        self.count += len(P_START_RE.findall(data))
+        self._tail = data[-self.OVERLAP:]
+        return self.count >= self.limit
+
+
+class ArticleExtractor(HTMLParser):
+    """
+    Parser incremental (estilo SAX): solo guarda el texto del primer <h1>
+    y de los <p>, descarta <script>/<style> y no construye ningún árbol.
+    Un <p> sin cerrar termina, como en HTML5, en el siguiente <p> o al
+    cerrarse el bloque que lo contiene.
+    """
+
+    def __init__(self, max_paragraphs=None):
+        super().__init__(convert_charrefs=True)
+        self.max_paragraphs = max_paragraphs
+        self.title = None
+        self.paragraphs = []
+
+        self._skip_depth = 0
+        self._h1_depth = 0
+        self._h1_parts = None
+        self._in_p = False
+        self._block_depth = 0
+        self._p_block_depth = 0  # Bloques abiertos cuando empezó el <p> actual
+        self._p_parts = []
+
+    @property
+    def done(self):
+        return self.max_paragraphs is not None and len(self.paragraphs) >= self.max_paragraphs
+
+    def handle_starttag(self, tag, attrs):
+        if tag in SKIP_TAGS:
+            self._skip_depth += 1
+        elif tag == 'h1' and self.title is None:
+            self._h1_depth += 1
+            if self._h1_parts is None:
+                self._h1_parts = []
+        elif tag == 'p':
+            if self._in_p:
+                self._flush_paragraph()
+            self._in_p = True
+            self._p_block_depth = self._block_depth
+        elif tag in BLOCK_TAGS:
+            self._block_depth += 1
+
+    def handle_endtag(self, tag):
+        if tag in SKIP_TAGS:
+            self._skip_depth = max(0, self._skip_depth - 1)
+        elif tag == 'h1' and self._h1_parts is not None and self.title is None:
+            self._h1_depth -= 1
+            if self._h1_depth <= 0:
+                self.title = "".join(self._h1_parts)
+        elif tag == 'p' and self._in_p:
+            self._flush_paragraph()
+        elif tag in BLOCK_TAGS:
+            self._block_depth = max(0, self._block_depth - 1)
+            if self._in_p and self._block_depth < self._p_block_depth:
+                self._flush_paragraph()
+
+    def handle_data(self, data):
+        if self._skip_depth:
+            return
+        if self._h1_depth > 0 and self.title is None:
+            self._h1_parts.append(data)
+        if self._in_p:
+            self._p_parts.append(data)
+
+    def _flush_paragraph(self):
+        self.paragraphs.append("".join(self._p_parts))
+        self._p_parts = []
+        self._in_p = False
+
+    def close(self):
+        super().close()
+        # Etiquetas sin cerrar al final del documento
+        if self.title is None and self._h1_parts is not None:
+            self.title = "".join(self._h1_parts)
+        if self._in_p:
+            self._flush_paragraph()
+
+
+def detect_encoding(html):
+    match = CHARSET_RE.search(html[:4096])
+    if match:
+        try:
+            return codecs.lookup(match.group(1).decode('ascii')).name
+        except LookupError:
+            pass
+    return 'utf-8'
+
+
+def extract_article(html, max_paragraphs=None):
+    """
+    Devuelve (título, texto) igual que la versión con BeautifulSoup:
+    el primer <h1> y todos los <p> unidos por espacios. Con <p> sin
+    cerrar, html.parser de BeautifulSoup los anida y repite el texto;
+    acá cada <p> es un párrafo aparte.
+    Con max_paragraphs deja de parsear cuando ya los tiene.
+    """
+    if isinstance(html, bytes):
+        decoder = codecs.getincrementaldecoder(detect_encoding(html))(errors='replace')
+        chunks = (decoder.decode(html[i:i + FEED_CHARS], final=i + FEED_CHARS >= len(html))
+                  for i in range(0, len(html), FEED_CHARS))
+    else:
+        chunks = (html[i:i + FEED_CHARS] for i in range(0, len(html), FEED_CHARS))
+
+    parser = ArticleExtractor(max_paragraphs)
+    for chunk in chunks:
+        parser.feed(chunk)
+        if parser.done:
+            break
+    parser.close()
+
+    title = parser.title.strip() if parser.title is not None else "Sin título"
+    text = " ".join(parser.paragraphs[:max_paragraphs])
+    return title, text
@@ -0,0 +1,87 @@
+import asyncio
+from collections import namedtuple
+from contextlib import asynccontextmanager
+from urllib.parse import urlsplit
+import httpx
+
+# status 304 => el contenido no cambió y body viene vacío
+FetchResult = namedtuple('FetchResult', ['status', 'body', 'etag', 'last_modified'])
+
+
+class ArticleFetcher:
+    """
+    Descargador asíncrono con un único cliente HTTP compartido (pool de conexiones).
+    Limita conexiones simultáneas por host, corta el cuerpo en max_bytes y deja
+    de leer en cuanto ya hay texto suficiente: `enough()` crea, por descarga,
+    un callable que recibe cada chunk nuevo y devuelve True para cortar.
+    """
+
+    def __init__(self, timeout=10, max_bytes=2 * 1024 * 1024, max_connections=100,
+                 max_per_host=4, enough=None):
+        self.timeout = timeout
+        self.max_bytes = max_bytes
+        self.max_connections = max_connections
+        self.max_per_host = max_per_host
+        self.enough = enough
+
+        self._client = None
+        self._host_limits = {}
+
+    def _get_client(self):
+        # Se crea perezosamente dentro del event loop del servidor
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                headers={'User-Agent': 'Mozilla/5.0'},
+                timeout=self.timeout,
+                follow_redirects=True,
+                limits=httpx.Limits(max_connections=self.max_connections,
+                                    max_keepalive_connections=self.max_connections // 2),
+            )
+        return self._client
+
+    @asynccontextmanager
+    async def _host_limit(self, url):
+        # Semáforo por host solo mientras haya descargas a ese host (en curso o esperando):
+        # el dict no crece con cada host distinto que se visitó alguna vez
+        host = urlsplit(url).netloc.lower()
+        slot = self._host_limits.setdefault(host, [asyncio.Semaphore(self.max_per_host), 0])
+        slot[1] += 1
+        try:
+            async with slot[0]:
+                yield
+        finally:
+            slot[1] -= 1
+            if slot[1] == 0:
+                del self._host_limits[host]
+
+    async def fetch(self, url, etag=None, last_modified=None):
+        # Revalidación condicional si ya tenemos una copia
+        headers = {}
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+
+        client = self._get_client()
+        async with self._host_limit(url):
+            async with client.stream('GET', url, headers=headers) as response:
+                validators = (response.headers.get('ETag'), response.headers.get('Last-Modified'))
+                if response.status_code == 304:
+                    return FetchResult(304, b'', *validators)
+                response.raise_for_status()
+
+                body = bytearray()
+                enough = self.enough() if self.enough is not None else None
+                async for chunk in response.aiter_bytes():
+                    body += chunk
+                    if len(body) >= self.max_bytes:
+                        del body[self.max_bytes:]
+                        break
+                    if enough is not None and enough(chunk):
+                        break
+                return FetchResult(response.status_code, bytes(body), *validators)
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
@@ -1,22 +1,48 @@
 from fasthtml.common import *
-import tensorflow as tf
-import pickle
 import numpy as np
-import requests
-from bs4 import BeautifulSoup
-from tensorflow.keras.preprocessing.sequence import pad_sequences
-from deep_translator import GoogleTranslator
+import asyncio
+import json
 import os
-import re
-import string
 import markdown
 import csv
+import sys
+import threading
+import yaml
+from contextlib import contextmanager
 from datetime import datetime
 
+# Agregar ruta base para imports
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from batching import MicroBatcher
+from registry import ModelRegistry, ModelEntry
+from translation_cache import TranslationCache
+from fetcher import ArticleFetcher
+from extractor import extract_article, ParagraphCounter
+from article_cache import ArticleCache
+from prediction_cache import PredictionCache
+from features.text_normalizer import clean_text
+from features.lang_id import LanguageDetector
+from scoring import (MAX_LEN, load_encoder, load_serving_function, label_for, score_items,
+                     parse_batch_payload, PayloadError)
+from metrics import stage, REQUEST_SECONDS, render_metrics, render_gauges
+from profiler import SlowRequestProfiler
+from starlette.responses import StreamingResponse, Response, JSONResponse
+
 # --- CONFIGURACIÓN ---
 BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../'))
 MODELS_DIR = os.path.join(BASE_DIR, 'models')
 FEEDBACK_FILE = os.path.join(BASE_DIR, 'data', 'feedback', 'user_feedback.csv')
+CONFIG_FILE = os.path.join(BASE_DIR, 'config', 'config.yaml')
+
+# Configuración de serving (sección 'serving' del config.yaml)
+SERVING_CONFIG = {}
+if os.path.exists(CONFIG_FILE):
+    with open(CONFIG_FILE, 'r') as f:
+        SERVING_CONFIG = (yaml.safe_load(f) or {}).get('serving', {}) or {}
+BATCHING_CONFIG = SERVING_CONFIG.get('batching', {})
+BULK_CONFIG = SERVING_CONFIG.get('bulk', {})
 
 # Asegurar que el archivo CSV exista con cabeceras
 os.makedirs(os.path.dirname(FEEDBACK_FILE), exist_ok=True)
@@ -26,73 +52,282 @@ if not os.path.exists(FEEDBACK_FILE):
         writer.writerow(['timestamp', 'text', 'model_prediction', 'user_correction'])
 
 # Variables globales
-current_model = None
 tokenizer = None
-current_model_name = ""
 text_language = "es"  # Idioma del texto a analizar (no de la UI)
+DEFAULT_MODEL = "Exp1_Base_LSTM.keras"
+REGISTRY_CONFIG = SERVING_CONFIG.get('registry', {})
+TRANSLATION_CONFIG = SERVING_CONFIG.get('translation_cache', {})
+FETCH_CONFIG = SERVING_CONFIG.get('fetch', {})
+ARTICLE_CACHE_CONFIG = SERVING_CONFIG.get('article_cache', {})
+PREDICTION_CACHE_CONFIG = SERVING_CONFIG.get('prediction_cache', {})
+LANGUAGE_ID_CONFIG = SERVING_CONFIG.get('language_id', {})
+CASCADE_CONFIG = SERVING_CONFIG.get('cascade', {})
+PROFILING_CONFIG = SERVING_CONFIG.get('profiling', {})
+# tensorflow: modelos .keras | lite: variantes .tflite, el proceso nunca importa TensorFlow
+RUNTIME = SERVING_CONFIG.get('runtime', 'tensorflow')
+LITE_VARIANT = SERVING_CONFIG.get('lite_variant', 'float16')
+
+# Caché de traducciones ES→EN (memoria + SQLite en data/)
+translation_cache = TranslationCache(
+    os.path.join(BASE_DIR, TRANSLATION_CONFIG.get('path', 'data/cache/translations.sqlite3')),
+    max_memory_items=TRANSLATION_CONFIG.get('max_memory_items', 1024),
+    max_disk_items=TRANSLATION_CONFIG.get('max_disk_items', 100000),
+    ttl_hours=TRANSLATION_CONFIG.get('ttl_hours', 720)
+)
+
+# Probabilidades por hash de los tokens + modelo (memoria + SQLite opcional compartido entre workers)
+prediction_cache = PredictionCache(
+    os.path.join(BASE_DIR, PREDICTION_CACHE_CONFIG['path']) if PREDICTION_CACHE_CONFIG.get('path') else None,
+    max_memory_items=PREDICTION_CACHE_CONFIG.get('max_memory_items', 4096),
+    max_disk_items=PREDICTION_CACHE_CONFIG.get('max_disk_items', 200000),
+    ttl_hours=PREDICTION_CACHE_CONFIG.get('ttl_hours', 720)
+) if PREDICTION_CACHE_CONFIG.get('enabled', True) else None
+
+# Detección local de idioma: con el selector en español, los textos en inglés no se traducen
+language_detector = LanguageDetector(
+    max_chars=LANGUAGE_ID_CONFIG.get('max_chars', 400),
+    min_share=LANGUAGE_ID_CONFIG.get('min_share', 0.65)
+) if LANGUAGE_ID_CONFIG.get('enabled', True) else None
+
+# Cascada: el modelo rápido decide solo; las probabilidades dudosas pasan al pesado
+CASCADE_MODEL = "cascade"  # Valor del selector de modelos
+CASCADE_FAST = CASCADE_CONFIG.get('fast_model', 'Exp2_Simple_Dense.keras')
+CASCADE_SLOW = CASCADE_CONFIG.get('slow_model', 'Exp3_Complex_LSTM.keras')
+
+def load_cascade_band():
+    # Banda ajustada en validación por src/model/cascade.py; si no existe, la del config
+    path = os.path.join(BASE_DIR, CASCADE_CONFIG.get('band_file', 'models/cascade.json'))
+    if os.path.exists(path):
+        with open(path, 'r') as f:
+            tuned = json.load(f)
+        if (tuned.get('fast_model'), tuned.get('slow_model')) == (CASCADE_FAST, CASCADE_SLOW):
+            return tuple(tuned['band'])
+    return tuple(CASCADE_CONFIG.get('band', [0.5, 0.97]))
+
+CASCADE_BAND = load_cascade_band()
+cascade_lock = threading.Lock()
+cascade_stats = {"requests": 0, "escalated": 0, "errors": 0}
+
+def model_version(model_name):
+    # Cambia si el archivo .keras se reemplaza en disco
+    st = os.stat(os.path.join(MODELS_DIR, model_name))
+    return (st.st_mtime_ns, st.st_size)
+
+def resolve_model_name(model_name):
+    # La cascada se carga por su modelo rápido; el pesado solo cuando hace falta
+    if model_name == CASCADE_MODEL:
+        model_name = CASCADE_FAST
+    # En modo lite un .keras se sirve con su variante cuantizada (src/model/quantize.py)
+    if RUNTIME == 'lite' and model_name.endswith('.keras'):
+        return f"{model_name[:-len('.keras')]}.{LITE_VARIANT}.tflite"
+    return model_name
+
+def load_model_entry(model_name):
+    model_path = os.path.join(MODELS_DIR, model_name)
+    version = model_version(model_name)
+    max_batch_size = BATCHING_CONFIG.get('max_batch_size', 32)
+
+    # Intérprete TFLite (.tflite), NumPy (.keras dense) o función de grafo trazada por bucket de lote
+    model, serving_fn = load_serving_function(model_path, max_batch_size, SERVING_CONFIG.get('numpy_dense', True))
+    # Cola de inferencia por lotes
+    batcher = MicroBatcher(
+        serving_fn,
+        max_batch_size=max_batch_size,
+        max_wait_ms=BATCHING_CONFIG.get('max_wait_ms', 5),
+        name=model_name
+    )
+    return ModelEntry(model_name, model, batcher, version)
+
+# Modelos residentes en memoria (cada petición elige el suyo, sin swap global)
+registry = ModelRegistry(
+    load_model_entry,
+    max_models=REGISTRY_CONFIG.get('max_models', 2),
+    max_memory_mb=REGISTRY_CONFIG.get('max_memory_mb'),
+    is_stale=lambda entry: model_version(entry.name) != entry.version
+)
+
+# Perfil por muestreo de las peticiones lentas (desactivado por defecto)
+profiler = SlowRequestProfiler(
+    os.path.join(BASE_DIR, PROFILING_CONFIG.get('dir', 'data/profiles')),
+    slow_ms=PROFILING_CONFIG.get('slow_ms', 1000),
+    interval_ms=PROFILING_CONFIG.get('interval_ms', 5),
+    enabled=PROFILING_CONFIG.get('enabled', False)
+)
 
-def load_resources(model_name="Exp1_Base_LSTM.keras"):
-    global current_model, tokenizer, current_model_name
+@contextmanager
+def observe_request(route, model_name):
+    with REQUEST_SECONDS.time(route=route, model=model_name), profiler.profile(f"{route} {model_name}"):
+        yield
+
+def load_resources(model_name=DEFAULT_MODEL):
+    global tokenizer
     if tokenizer is None:
-        tok_path = os.path.join(MODELS_DIR, 'tokenizer.pkl')
-        with open(tok_path, 'rb') as handle:
-            tokenizer = pickle.load(handle)
-    if current_model is None or current_model_name != model_name:
-        model_path = os.path.join(MODELS_DIR, model_name)
-        current_model = tf.keras.models.load_model(model_path)
-        current_model_name = model_name
+        tokenizer = load_encoder(MODELS_DIR)
+    return registry.get(resolve_model_name(model_name))
 
 # --- LÓGICA DE NEGOCIO ---
-def clean_text(text):
-    text = str(text).lower()
-    text = re.sub(r'https?://\S+|www\.\S+', '', text)
-    text = re.sub(r'<.*?>', '', text)
-    text = re.sub(f'[{re.escape(string.punctuation)}]', '', text)
-    text = re.sub(r'\n', ' ', text)
-    return text
-
-def get_prediction(text, lang="es"):
+def translate_to_english(text):
+    # Si la traducción falla se usa el texto original
+    try:
+        return translation_cache.translate(text[:2000], source='es', target='en')
+    except:
+        return text
+
+def get_prediction(text, lang="es", model_name=None):
     """
-    Predice si una noticia es FAKE o REAL.
-    Si lang='es', traduce a inglés primero.
+    Predice si una noticia es FAKE o REAL con el modelo indicado.
+    Si lang='es', traduce a inglés primero (salvo que el texto ya esté en inglés).
     Si lang='en', usa el texto directamente.
+    Con model_name='cascade' decide el modelo rápido salvo en la banda de duda.
     """
-    load_resources(current_model_name if current_model_name else "Exp1_Base_LSTM.keras")
-    
+    model_name = model_name or DEFAULT_MODEL
+    entry = load_resources(model_name)
+
+    # El selector puede quedar en español con artículos en inglés: se evita la ida a la red
+    if lang == "es" and language_detector is not None:
+        with stage("detect_language", entry.name):
+            if language_detector.detect(text) == "en":
+                lang = "en"
+
     # Solo traducir si el texto está en español
     if lang == "es":
-        try:
-            translated = GoogleTranslator(source='es', target='en').translate(text[:2000])
-        except:
-            translated = text
+        with stage("translate", entry.name):
+            translated = translate_to_english(text)
     else:
         translated = text  # Ya está en inglés, no traducir
 
-    cleaned = clean_text(translated)
-    seq = tokenizer.texts_to_sequences([cleaned])
-    padded = pad_sequences(seq, maxlen=250, padding='post', truncating='post')
+    # Solo se usan los primeros MAX_LEN tokens: el normalizador corta ahí
+    with stage("clean_text", entry.name):
+        cleaned = clean_text(translated, max_tokens=MAX_LEN)
+    with stage("tokenize", entry.name):
+        padded = tokenizer.encode_batch([cleaned], MAX_LEN, padding='post', truncating='post')
     
-    pred_prob = current_model.predict(padded)[0][0]
-    is_fake = pred_prob > 0.85
-    confidence = pred_prob * 100 if is_fake else (1 - pred_prob) * 100
-    label = "FAKE" if is_fake else "REAL"
+    pred_prob = predict_row(entry, padded[0])
+    if model_name == CASCADE_MODEL:
+        pred_prob = escalate_if_uncertain(pred_prob, padded[0])
+    label, confidence = label_for(pred_prob)
     
     return label, confidence, translated
 
-def scrape_article(url):
+def predict_row(entry, row):
+    # Misma secuencia de tokens con el mismo archivo de modelo: no hace falta volver a inferir
+    pred_prob, key = None, None
+    if prediction_cache is not None:
+        key = prediction_cache.make_key(row, entry.name, entry.version)
+        pred_prob = prediction_cache.get(key)
+    if pred_prob is None:
+        # La predicción se encola y se resuelve junto a otras peticiones concurrentes
+        with stage("inference", entry.name):
+            pred_prob = entry.predict(row)
+        if key is not None:
+            prediction_cache.put(key, pred_prob)
+    return pred_prob
+
+def in_cascade_band(probs):
+    return (CASCADE_BAND[0] <= probs) & (probs <= CASCADE_BAND[1])
+
+def count_cascade(requests, escalated):
+    with cascade_lock:
+        cascade_stats["requests"] += requests
+        cascade_stats["escalated"] += escalated
+
+def cascade_failed(error):
+    # Sin el modelo pesado (falta o falla) la cascada degrada al rápido en vez de responder 500
+    with cascade_lock:
+        cascade_stats["errors"] += 1
+    print(f"-> Cascada: falló {CASCADE_SLOW} ({error}); se usa la probabilidad de {CASCADE_FAST}")
+
+def escalate_if_uncertain(pred_prob, row):
+    # Fuera de la banda el modelo rápido ya coincide con el pesado (ajustado en validación)
+    escalate = bool(in_cascade_band(float(pred_prob)))
+    count_cascade(1, int(escalate))
+    if not escalate:
+        return pred_prob
     try:
-        headers = {'User-Agent': 'Mozilla/5.0'}
-        response = requests.get(url, headers=headers, timeout=10)
-        soup = BeautifulSoup(response.content, 'html.parser')
-        title = soup.find('h1').get_text().strip() if soup.find('h1') else "Sin título"
-        paragraphs = soup.find_all('p')
-        text = " ".join([p.get_text() for p in paragraphs])
-        return title, text
+        return predict_row(load_resources(CASCADE_SLOW), row)
+    except Exception as e:
+        cascade_failed(e)
+        return pred_prob
+
+def cascade_predict_batch(fast_entry):
+    # API masiva: la banda se aplica por lote y solo las filas dudosas pasan por el modelo pesado
+    def predict(rows):
+        probs = np.asarray(fast_entry.predict_batch(rows), dtype=np.float64).reshape(-1)
+        escalate = in_cascade_band(probs)
+        count_cascade(len(probs), int(escalate.sum()))
+        if escalate.any():
+            try:
+                slow = load_resources(CASCADE_SLOW).predict_batch(rows[escalate])
+                probs[escalate] = np.asarray(slow, dtype=np.float64).reshape(-1)
+            except Exception as e:
+                cascade_failed(e)
+        return probs
+    return predict
+
+def prediction_version(model_name, entry):
+    """
+    Identidad de lo que produjo una predicción guardada: el archivo del modelo
+    y, en la cascada, también el del modelo pesado y la banda.
+    """
+    if model_name != CASCADE_MODEL:
+        return entry.version
+    try:
+        slow_version = model_version(resolve_model_name(CASCADE_SLOW))
+    except OSError:
+        slow_version = None
+    return (entry.version, slow_version, CASCADE_BAND)
+
+def paragraph_limit():
+    # Corte de la descarga: ya hay más párrafos de los que el modelo va a leer
+    return ParagraphCounter(FETCH_CONFIG.get('stop_after_paragraphs', 60) + 1)
+
+# Cliente HTTP compartido (pool de conexiones) para todas las descargas
+fetcher = ArticleFetcher(
+    timeout=FETCH_CONFIG.get('timeout', 10),
+    max_bytes=FETCH_CONFIG.get('max_bytes', 2 * 1024 * 1024),
+    max_connections=FETCH_CONFIG.get('max_connections', 100),
+    max_per_host=FETCH_CONFIG.get('max_per_host', 4),
+    enough=paragraph_limit
+)
+
+# Artículos ya scrapeados (y sus predicciones) por URL
+article_cache = ArticleCache(
+    max_mb=ARTICLE_CACHE_CONFIG.get('max_mb', 64),
+    fresh_seconds=ARTICLE_CACHE_CONFIG.get('fresh_seconds', 300)
+)
+
+async def scrape_article(url, model_name=""):
+    """
+    Devuelve (artículo, None) o (None, error).
+    Usa la copia en caché si está fresca; si no, revalida con ETag/Last-Modified.
+    model_name solo etiqueta las métricas de la petición.
+    """
+    cached = article_cache.get(url)
+    if cached is not None and article_cache.is_fresh(cached):
+        article_cache.mark_hit()
+        return cached, None
+    try:
+        with stage("fetch", model_name):
+            result = await fetcher.fetch(
+                url,
+                etag=cached.etag if cached else None,
+                last_modified=cached.last_modified if cached else None
+            )
+        if result.status == 304 and cached is not None:
+            article_cache.mark_revalidated(cached, result.etag, result.last_modified)
+            return cached, None
+
+        # El parseo es CPU: se hace fuera del event loop
+        with stage("extract", model_name):
+            title, text = await asyncio.to_thread(
+                extract_article, result.body, FETCH_CONFIG.get('stop_after_paragraphs', 60)
+            )
+        return article_cache.put(url, title, text, result.etag, result.last_modified), None
     except Exception as e:
         return None, str(e)
 
 # --- FASTHTML APP ---
-app = FastHTML(hdrs=(picolink,))
+app = FastHTML(hdrs=(picolink,), on_shutdown=[fetcher.aclose])
 
 # Estilos modernos y minimalistas
 style_css = """
@@ -557,7 +792,12 @@ style_css = """
 
 @app.route("/")
 def home():
-    models = [f for f in os.listdir(MODELS_DIR) if f.endswith('.keras')]
+    models = [f for f in os.listdir(MODELS_DIR)
+              if f.endswith('.tflite') or (RUNTIME != 'lite' and f.endswith('.keras'))]
+    options = [Option(m, value=m) for m in models]
+    if CASCADE_CONFIG.get('enabled', False) and all(
+            os.path.exists(os.path.join(MODELS_DIR, resolve_model_name(m))) for m in (CASCADE_FAST, CASCADE_SLOW)):
+        options.append(Option(f"Cascada: {CASCADE_FAST} → {CASCADE_SLOW}", value=CASCADE_MODEL))
     
     sidebar = Aside(
         H2("Detector de Fake News", cls="sidebar-title"),
@@ -586,7 +826,7 @@ def home():
         # Selector de modelo
         Div(
             Label("🧠 Modelo de IA"),
-            Select(*[Option(m, value=m) for m in models], name="model_name", hx_post="/set_model", hx_target="#model-status"),
+            Select(*options, name="model_name", hx_post="/set_model", hx_target="#model-status"),
             Div(f"Estado: Listo", id="model-status"),
             cls="section-card"
         ),
@@ -600,6 +840,7 @@ def home():
                 Input(type="url", name="url", placeholder="https://ejemplo.com/noticia", required=True, cls="mb-2"),
                 Button("Analizar URL", cls="w-full contrast"), 
                 hx_post="/predict_url", 
+                hx_include="[name='model_name']",
                 hx_target="#result-container", 
                 hx_indicator="#loading"
             ),
@@ -615,6 +856,7 @@ def home():
                 Textarea(name="text", placeholder="Pega aquí el contenido de la noticia para analizar...", rows=6, required=True, cls="mb-2"),
                 Button("Analizar Texto", cls="w-full secondary"), 
                 hx_post="/predict_text", 
+                hx_include="[name='model_name']",
                 hx_target="#result-container", 
                 hx_indicator="#loading"
             ),
@@ -648,8 +890,53 @@ def set_text_language(text_lang: str):
     lang_display = "Español → Inglés" if text_lang == "es" else "Inglés (sin traducción)"
     return f"⚙️ Configurado: {lang_display}"
 
+@app.get("/metrics")
+def prometheus_metrics():
+    # Formato de exposición de texto de Prometheus
+    gauges = [render_gauges("fakenews_registry", registry.stats()),
+              render_gauges("fakenews_translation_cache", translation_cache.stats()),
+              render_gauges("fakenews_article_cache", article_cache.stats())]
+    if language_detector is not None:
+        # detected_en = traducciones evitadas (solo se detecta con el selector en español)
+        gauges.append(render_gauges("fakenews_language_id", language_detector.stats()))
+    if prediction_cache is not None:
+        gauges.append(render_gauges("fakenews_prediction_cache", prediction_cache.stats()))
+    if CASCADE_CONFIG.get('enabled', False):
+        gauges.append(render_gauges("fakenews_cascade", cascade_metrics()))
+    gauges += [render_gauges("fakenews_batcher", e.batcher.stats(), {"model": e.name}) for e in registry.loaded()]
+    return Response(render_metrics(*gauges), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+@app.get("/metrics/batching")
+def batching_metrics():
+    return {e.name: e.batcher.stats() for e in registry.loaded()}
+
+@app.get("/metrics/registry")
+def registry_metrics():
+    return registry.stats()
+
+@app.get("/metrics/translation")
+def translation_metrics():
+    return translation_cache.stats()
+
+@app.get("/metrics/article_cache")
+def article_cache_metrics():
+    return article_cache.stats()
+
+@app.get("/metrics/prediction_cache")
+def prediction_cache_metrics():
+    return prediction_cache.stats() if prediction_cache is not None else {"enabled": False}
+
+@app.get("/metrics/cascade")
+def cascade_metrics():
+    with cascade_lock:
+        stats = dict(cascade_stats)
+    stats["escalated_fraction"] = round(stats["escalated"] / stats["requests"], 4) if stats["requests"] else 0.0
+    stats["band_low"], stats["band_high"] = CASCADE_BAND
+    return stats
+
 @app.post("/set_model")
 def set_model(model_name: str):
+    # Solo precarga el modelo; cada formulario envía su model_name
     load_resources(model_name)
     return f"✅ Modelo activo: {model_name}"
 
@@ -702,27 +989,66 @@ def render_full_result(title, text, label, confidence, translated, was_translate
     )
 
 @app.post("/predict_url")
-def predict_url(url: str, model_name: str = None):
-    if model_name: load_resources(model_name)
-    title, text = scrape_article(url)
-    if not title: 
-        return Div(
-            f"❌ Error al obtener la URL: {text}", 
-            style="color: var(--accent-danger); padding: 2rem; text-align: center; background: var(--bg-card); border-radius: 8px;"
-        )
-    
-    full_text = title + " " + text
-    was_translated = (text_language == "es")
-    label, conf, trans = get_prediction(full_text, text_language)
-    
-    return render_full_result(title, text, label, conf, trans, was_translated)
+async def predict_url(url: str, model_name: str = None):
+    model_name = model_name or DEFAULT_MODEL
+    with observe_request("/predict_url", model_name):
+        article, error = await scrape_article(url, model_name)
+        if article is None: 
+            return Div(
+                f"❌ Error al obtener la URL: {error}", 
+                style="color: var(--accent-danger); padding: 2rem; text-align: center; background: var(--bg-card); border-radius: 8px;"
+            )
+        
+        title, text = article.title, article.text
+        full_text = title + " " + text
+
+        # Predicción cacheada por modelo + versión del archivo + idioma
+        entry = await asyncio.to_thread(load_resources, model_name)
+        key = (model_name, prediction_version(model_name, entry), text_language)
+        prediction = article_cache.get_prediction(article, key)
+        if prediction is None:
+            prediction = await asyncio.to_thread(get_prediction, full_text, text_language, model_name)
+            article_cache.set_prediction(article, key, prediction)
+        label, conf, trans = prediction
+        # Sin traducción si el texto ya estaba en inglés (o si la traducción falló)
+        was_translated = trans != full_text
+        
+        return render_full_result(title, text, label, conf, trans, was_translated)
 
 @app.post("/predict_text")
 def predict_text(text: str, model_name: str = None):
-    if model_name: load_resources(model_name)
-    was_translated = (text_language == "es")
-    label, conf, trans = get_prediction(text, text_language)
-    return render_full_result("Texto Manual", text, label, conf, trans, was_translated)
+    model_name = model_name or DEFAULT_MODEL
+    with observe_request("/predict_text", model_name):
+        label, conf, trans = get_prediction(text, text_language, model_name)
+        was_translated = trans != text
+        return render_full_result("Texto Manual", text, label, conf, trans, was_translated)
+
+@app.post("/api/v1/predict_batch")
+async def predict_batch(request: Request):
+    """
+    Puntuación masiva. Body JSON:
+      {"texts": ["...", ...]} o {"items": [{"id": ..., "text": ...}, ...]}
+      opcionales: "model_name", "lang" ("en" por defecto), "batch_size"
+    Responde NDJSON, una línea por texto, a medida que se procesa cada lote.
+    """
+    # Errores del cliente: 400 con el índice del ítem inválido, antes de cargar el modelo
+    try:
+        payload = await request.json()
+    except ValueError:
+        return JSONResponse({"error": "El body no es JSON válido"}, status_code=400)
+    try:
+        items, batch_size = parse_batch_payload(payload, BULK_CONFIG.get('batch_size', 256))
+    except PayloadError as e:
+        return JSONResponse({"error": str(e), "index": e.index}, status_code=400)
+
+    model_name = payload.get('model_name') or DEFAULT_MODEL
+    entry = await asyncio.to_thread(load_resources, model_name)
+    translate = translate_to_english if payload.get('lang', 'en') == 'es' else None
+    predict_fn = cascade_predict_batch(entry) if model_name == CASCADE_MODEL else entry.predict_batch
+
+    rows = score_items(items, tokenizer, predict_fn, batch_size=batch_size, translate=translate)
+    return StreamingResponse((json.dumps(row, ensure_ascii=False) + "\n" for row in rows),
+                             media_type="application/x-ndjson")
 
 @app.post("/submit_feedback")
 def submit_feedback(text_content: str, model_pred: str, user_correction: str):
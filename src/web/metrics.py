@@ -0,0 +1,114 @@
+import re
+import threading
+import time
+from contextlib import contextmanager
+
+# Segundos: desde tokenizar un texto corto hasta descargar una página lenta
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1,
+                   0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+_NAME_RE = re.compile(r'[^a-zA-Z0-9_]')
+
+
+def _escape(value):
+    return str(value).replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n')
+
+
+def _labels(names, values, extra=None):
+    pairs = list(zip(names, values)) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+def _format(value):
+    if value == float('inf'):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Histogram:
+    """
+    Histograma acumulativo al estilo Prometheus (buckets, _sum y _count)
+    con etiquetas. Seguro entre hilos: se observa desde el event loop,
+    desde asyncio.to_thread y desde el hilo del batcher.
+    """
+
+    def __init__(self, name, help_text, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float('inf'),)
+        self._lock = threading.Lock()
+        self._series = {}  # valores de etiquetas -> [conteos por bucket, suma, total]
+
+    def observe(self, value, **labels):
+        key = tuple(str(labels.get(n, "")) for n in self.labelnames)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[0][i] += 1
+                    break
+            series[1] += value
+            series[2] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = sorted((k, ([*v[0]], v[1], v[2])) for k, v in self._series.items())
+        for key, (counts, total, count) in series:
+            cumulative = 0
+            for bound, n in zip(self.buckets, counts):
+                cumulative += n
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, key, ('le', _format(bound)))} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, key)} {_format(total)}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, key)} {count}")
+        return lines
+
+
+def render_gauges(prefix, stats, labels=None):
+    """Exporta los valores numéricos de un dict de stats() como gauges."""
+    lines = []
+    label_str = _labels(tuple(labels), tuple(labels.values())) if labels else ""
+    for key, value in stats.items():
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            continue
+        name = _NAME_RE.sub('_', f"{prefix}_{key}")
+        lines.append(f"# TYPE {name} gauge")
+        lines.append(f"{name}{label_str} {_format(value)}")
+    return lines
+
+
+# Tiempos por etapa del camino caliente y por petición completa
+STAGE_SECONDS = Histogram(
+    "fakenews_stage_seconds",
+    "Duración de cada etapa de una predicción (fetch, extract, detect_language, translate, clean_text, tokenize, inference).",
+    ("stage", "model"),
+)
+REQUEST_SECONDS = Histogram(
+    "fakenews_request_seconds",
+    "Duración total de las peticiones de predicción.",
+    ("route", "model"),
+)
+
+
+def stage(name, model):
+    # Uso: with stage("translate", model_name): ...
+    return STAGE_SECONDS.time(stage=name, model=model)
+
+
+def render_metrics(*extra_lines):
+    lines = STAGE_SECONDS.render() + REQUEST_SECONDS.render()
+    for block in extra_lines:
+        lines.extend(block)
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,80 @@
+"""
+Puntuación masiva de noticias desde la línea de comandos.
+
+Ejemplos:
+    python -m src.web.predict_batch --input feed.jsonl --model Exp2_Simple_Dense.keras
+    python -m src.web.predict_batch --input feed.csv --text-field combined_text -o out.ndjson
+    python -m src.web.predict_batch --text "Primera noticia" --text "Segunda noticia"
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+
+# Agregar ruta base para imports
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from scoring import load_encoder, load_serving_function, score_items
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../'))
+MODELS_DIR = os.path.join(BASE_DIR, 'models')
+
+
+def read_items(path, text_field='text', id_field='id'):
+    """Genera (id, texto) desde un .jsonl, un .csv o texto plano (una noticia por línea)."""
+    handle = sys.stdin if path == '-' else open(path, 'r', encoding='utf-8', newline='')
+    try:
+        if path.endswith('.csv'):
+            for row in csv.DictReader(handle):
+                yield row.get(id_field), row[text_field]
+        elif path.endswith('.jsonl') or path.endswith('.ndjson'):
+            for line in handle:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                if isinstance(record, str):
+                    yield None, record
+                else:
+                    yield record.get(id_field), record[text_field]
+        else:
+            for line in handle:
+                if line.strip():
+                    yield None, line.rstrip('\n')
+    finally:
+        if handle is not sys.stdin:
+            handle.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Puntúa noticias en lote y escribe NDJSON.")
+    parser.add_argument('--input', '-i', help="Archivo .jsonl/.csv/.txt ('-' para stdin)")
+    parser.add_argument('--text', action='append', help="Texto a puntuar (se puede repetir)")
+    parser.add_argument('--output', '-o', default='-', help="Archivo NDJSON de salida ('-' para stdout)")
+    parser.add_argument('--model', default='Exp2_Simple_Dense.keras', help="Modelo .keras o .tflite dentro de models/")
+    parser.add_argument('--text-field', default='text')
+    parser.add_argument('--id-field', default='id')
+    parser.add_argument('--batch-size', type=int, default=256)
+    args = parser.parse_args(argv)
+
+    if not args.input and not args.text:
+        parser.error("Indica --input o al menos un --text")
+
+    encoder = load_encoder(MODELS_DIR)
+    _, serving_fn = load_serving_function(os.path.join(MODELS_DIR, args.model), args.batch_size)
+
+    items = read_items(args.input, args.text_field, args.id_field) if args.input \
+        else ((None, t) for t in args.text)
+
+    out = sys.stdout if args.output == '-' else open(args.output, 'w', encoding='utf-8')
+    try:
+        for row in score_items(items, encoder, serving_fn, batch_size=args.batch_size):
+            out.write(json.dumps(row, ensure_ascii=False) + "\n")
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+import hashlib
+import numpy as np
+
+from two_tier_cache import TwoTierCache
+
+
+class PredictionCache(TwoTierCache):
+    """
+    Caché de probabilidades por hash de la secuencia de tokens ya con padding
+    y de la identidad del archivo del modelo: textos que solo difieren en lo
+    que borra clean_text (espacios, puntuación, mayúsculas) comparten entrada.
+    Sin db_path queda solo en memoria; con SQLite la comparten los workers de uvicorn.
+    """
+
+    def __init__(self, db_path=None, max_memory_items=4096, max_disk_items=200000, ttl_hours=720):
+        super().__init__(db_path, 'predictions', 'probability', 'REAL',
+                         max_memory_items, max_disk_items, ttl_hours)
+
+    @staticmethod
+    def make_key(token_ids, model_name, version):
+        # int32 fijo: el mismo texto da la misma clave sin importar el dtype del encoder
+        ids = np.ascontiguousarray(token_ids, dtype=np.int32)
+        digest = hashlib.sha256(f"{model_name}:{version}:".encode('utf-8'))
+        digest.update(ids.tobytes())
+        return digest.hexdigest()
+
+    def put(self, key, probability):
+        super().put(key, float(probability))
+
+    def stats(self):
+        stats = super().stats()
+        stats["shared"] = self._db is not None
+        return stats
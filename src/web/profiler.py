@@ -0,0 +1,75 @@
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+
+class SlowRequestProfiler:
+    """
+    Profiler por muestreo para peticiones lentas. Mientras dura la petición,
+    un hilo toma la pila de todos los hilos del proceso cada `interval_ms`
+    (incluye los de asyncio.to_thread y el batcher). Si la petición supera
+    `slow_ms` se guardan las pilas en formato "collapsed" (flamegraph.pl,
+    speedscope); si no, se descartan. Solo un perfil a la vez.
+    """
+
+    def __init__(self, out_dir, slow_ms=1000, interval_ms=5, enabled=False, max_files=50):
+        self.out_dir = out_dir
+        self.slow = slow_ms / 1000.0
+        self.interval = interval_ms / 1000.0
+        self.enabled = enabled
+        self.max_files = max_files
+        self._busy = threading.Lock()
+        self.captured = 0
+
+    @contextmanager
+    def profile(self, name):
+        if not self.enabled or not self._busy.acquire(blocking=False):
+            yield
+            return
+
+        stacks = Counter()
+        stop = threading.Event()
+        sampler = threading.Thread(target=self._sample, args=(stacks, stop), daemon=True)
+        start = time.perf_counter()
+        sampler.start()
+        try:
+            yield
+        finally:
+            stop.set()
+            sampler.join()
+            elapsed = time.perf_counter() - start
+            self._busy.release()
+            if elapsed >= self.slow and stacks:
+                self._dump(name, elapsed, stacks)
+
+    def _sample(self, stacks, stop):
+        own = threading.get_ident()
+        names = {}
+        while not stop.wait(self.interval):
+            for thread in threading.enumerate():
+                names[thread.ident] = thread.name
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                parts = []
+                while frame is not None:
+                    code = frame.f_code
+                    parts.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+                    frame = frame.f_back
+                parts.append(names.get(ident, str(ident)))
+                stacks[";".join(reversed(parts))] += 1
+
+    def _dump(self, name, elapsed, stacks):
+        os.makedirs(self.out_dir, exist_ok=True)
+        files = sorted(os.listdir(self.out_dir))
+        if len(files) >= self.max_files:
+            return
+        safe = "".join(c if c.isalnum() else "_" for c in name).strip("_")
+        path = os.path.join(self.out_dir, f"{time.strftime('%Y%m%d-%H%M%S')}_{safe}_{int(elapsed * 1000)}ms.folded")
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, count in stacks.most_common():
+                f.write(f"{stack} {count}\n")
+        self.captured += 1
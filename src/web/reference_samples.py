@@ -0,0 +1,49 @@
+# Muestras de referencia compartidas por benchmark.py y los tests (tests/):
+# el extractor original con BeautifulSoup, HTML mal formado y titulares en inglés/español
+
+
+def soup_extract_article(html):
+    # Versión original con BeautifulSoup (referencia)
+    from bs4 import BeautifulSoup
+    soup = BeautifulSoup(html, 'html.parser')
+    title = soup.find('h1').get_text().strip() if soup.find('h1') else "Sin título"
+    paragraphs = soup.find_all('p')
+    return title, " ".join([p.get_text() for p in paragraphs])
+
+
+# HTML mal formado: (html, texto esperado, ¿coincide BeautifulSoup?). html.parser de
+# BeautifulSoup anida los <p> sin cerrar y repite su texto; el esperado sigue el cierre implícito de HTML5
+MALFORMED_CASES = [
+    ("<h1>t</h1><p>one<p>two<p>three", "one two three", False),
+    ("<p>a</p><div><p>b</div><p>c</p>", "a b c", True),
+    ("<div><p>x<div>y</div>z</p></div>", "xyz", True),
+    ("<ul><li><p>uno<li><p>dos</ul><p>tres", "uno dos tres", False),
+    ("<section><p>abierto</section><article><p>otro</article>", "abierto otro", True),
+]
+
+
+# Titulares con el mismo contenido en inglés y en español (detección de idioma)
+EN_SENTENCES = [
+    "The president said on Tuesday that officials would review the claims made by the senator.",
+    "Breaking: Hillary Clinton accused of hiding emails from FBI investigators, sources say.",
+    "Scientists found that the vaccine was effective in preventing severe illness among older adults.",
+    "Police arrested three men after a shooting near the stadium on Saturday night.",
+    "The company announced it will cut 2,000 jobs as sales continue to fall.",
+    "Donald Trump slams the media over its coverage of his rally in Ohio.",
+    "Lawmakers in Washington have until Friday to approve the new budget.",
+    "According to the report, the number of migrants crossing the border rose sharply in May.",
+    "Experts warn that the video shared on Facebook was edited to mislead viewers.",
+    "The former minister denied any wrongdoing and said he would fight the charges in court.",
+]
+ES_SENTENCES = [
+    "El presidente dijo el martes que los funcionarios revisarán las denuncias del senador.",
+    "Última hora: acusan a Hillary Clinton de ocultar correos al FBI, según fuentes.",
+    "Los científicos descubrieron que la vacuna fue eficaz entre los adultos mayores.",
+    "La policía detuvo a tres hombres tras un tiroteo cerca del estadio el sábado por la noche.",
+    "La empresa anunció que recortará 2.000 empleos porque las ventas siguen cayendo.",
+    "Donald Trump arremete contra los medios por la cobertura de su mitin en Ohio.",
+    "Los legisladores en Washington tienen hasta el viernes para aprobar el nuevo presupuesto.",
+    "Según el informe, el número de migrantes que cruzan la frontera aumentó en mayo.",
+    "Los expertos advierten que el video compartido en Facebook fue editado para engañar.",
+    "El exministro negó cualquier irregularidad y dijo que se defenderá en los tribunales.",
+]
@@ -0,0 +1,130 @@
+import threading
+from collections import OrderedDict
+
+
+class ModelEntry:
+    """Un modelo residente con su cola de inferencia."""
+
+    def __init__(self, name, model, batcher, version=None):
+        self.name = name
+        self.model = model
+        self.batcher = batcher
+        # Identidad del archivo .keras del que se cargó (mtime, tamaño)
+        self.version = version
+        # Estimación de memoria: bytes de todos los pesos del modelo (o del .tflite)
+        if hasattr(model, 'get_weights'):
+            self.size_bytes = sum(int(w.nbytes) for w in model.get_weights())
+        else:
+            self.size_bytes = model.size_bytes
+
+    def predict(self, row):
+        return self.batcher.predict(row)
+
+    def predict_batch(self, rows):
+        # Lotes ya armados (API masiva): van directo a la función de serving
+        return self.batcher.predict_fn(rows)
+
+    def close(self):
+        self.batcher.close()
+
+
+class ModelRegistry:
+    """
+    Mantiene varios modelos cargados a la vez, con desalojo LRU acotado
+    por cantidad de modelos y por memoria estimada.
+    Cargar un modelo solo bloquea a quienes piden ese mismo modelo.
+    Si `is_stale(entry)` indica que el archivo cambió, se recarga.
+    """
+
+    def __init__(self, loader, max_models=2, max_memory_mb=None, is_stale=None):
+        self.loader = loader
+        self.is_stale = is_stale
+        self.max_models = max_models
+        self.max_bytes = max_memory_mb * 1024 * 1024 if max_memory_mb else None
+
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._load_locks = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.reloads = 0
+
+    def get(self, name):
+        self._drop_if_stale(name)
+
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is not None:
+                self._entries.move_to_end(name)
+                self.hits += 1
+                return entry
+            # Lock de carga por nombre, vivo solo mientras alguien lo usa: los nombres
+            # desalojados o que no cargan no dejan locks acumulados
+            slot = self._load_locks.setdefault(name, [threading.Lock(), 0])
+            slot[1] += 1
+
+        try:
+            with slot[0]:
+                # Otro hilo pudo haberlo cargado mientras esperábamos
+                with self._lock:
+                    entry = self._entries.get(name)
+                    if entry is not None:
+                        self._entries.move_to_end(name)
+                        self.hits += 1
+                        return entry
+
+                entry = self.loader(name)
+
+                with self._lock:
+                    self.misses += 1
+                    self._entries[name] = entry
+                    self._evict()
+                return entry
+        finally:
+            with self._lock:
+                slot[1] -= 1
+                if slot[1] == 0:
+                    del self._load_locks[name]
+
+    def _drop_if_stale(self, name):
+        if self.is_stale is None:
+            return
+        with self._lock:
+            entry = self._entries.get(name)
+        if entry is None or not self.is_stale(entry):
+            return
+        with self._lock:
+            if self._entries.get(name) is entry:
+                del self._entries[name]
+                entry.close()
+                self.reloads += 1
+
+    def _evict(self):
+        # Nunca se desaloja el modelo recién cargado (último del OrderedDict)
+        while len(self._entries) > 1 and (
+            len(self._entries) > self.max_models
+            or (self.max_bytes and self.memory_bytes() > self.max_bytes)
+        ):
+            _, old = self._entries.popitem(last=False)
+            old.close()
+            self.evictions += 1
+
+    def memory_bytes(self):
+        return sum(e.size_bytes for e in self._entries.values())
+
+    def loaded(self):
+        with self._lock:
+            return list(self._entries.values())
+
+    def stats(self):
+        with self._lock:
+            return {
+                "loaded": list(self._entries.keys()),
+                "memory_mb": round(self.memory_bytes() / (1024 * 1024), 2),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "reloads": self.reloads,
+            }
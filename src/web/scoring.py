@@ -0,0 +1,132 @@
+import os
+import pickle
+import sys
+
+# Agregar ruta base para imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from features.vocabulary import VocabEncoder
+from features.text_normalizer import clean_texts
+from model.lite_runtime import TFLiteFunction
+from model.numpy_engine import DenseEngine
+from features.serving_params import MAX_LEN, FAKE_THRESHOLD
+
+
+def load_encoder(models_dir):
+    vocab_path = os.path.join(models_dir, 'vocab.npz')
+    if os.path.exists(vocab_path):
+        return VocabEncoder.load(vocab_path)
+    # Compatibilidad con modelos entrenados antes de exportar vocab.npz
+    tok_path = os.path.join(models_dir, 'tokenizer.pkl')
+    with open(tok_path, 'rb') as handle:
+        return VocabEncoder.from_tokenizer(pickle.load(handle))
+
+
+def load_serving_function(model_path, max_batch_size=32, numpy_dense=True):
+    """
+    Devuelve (modelo, función de inferencia). Los .tflite corren en el
+    intérprete TFLite y los .keras de tipo 'dense' en NumPy (DenseEngine);
+    TensorFlow solo se importa para el resto de los .keras.
+    """
+    if model_path.endswith('.tflite'):
+        serving_fn = TFLiteFunction(model_path, MAX_LEN)
+        return serving_fn, serving_fn
+    if numpy_dense:
+        try:
+            engine = DenseEngine.from_keras(model_path, MAX_LEN)
+            return engine, engine
+        except ValueError:
+            pass  # Otra arquitectura (LSTM, CNN): se sirve con TensorFlow
+    import tensorflow as tf
+    from model.serving import ServingFunction
+    model = tf.keras.models.load_model(model_path)
+    return model, ServingFunction(model, MAX_LEN, max_batch_size)
+
+
+class PayloadError(ValueError):
+    """Body inválido de la API masiva; `index` señala el ítem con problemas."""
+
+    def __init__(self, message, index=None):
+        super().__init__(message)
+        self.index = index
+
+
+def parse_batch_payload(payload, default_batch_size=256):
+    """
+    Valida el body de /api/v1/predict_batch y devuelve
+    (items [(id, texto)], batch_size). Lanza PayloadError.
+    """
+    if not isinstance(payload, dict):
+        raise PayloadError("El body debe ser un objeto JSON")
+    if 'items' in payload:
+        records = payload['items']
+        if not isinstance(records, list):
+            raise PayloadError('"items" debe ser una lista')
+        items = []
+        for i, item in enumerate(records):
+            if not isinstance(item, dict) or not isinstance(item.get('text'), str):
+                raise PayloadError('Cada ítem debe ser un objeto con "text" (string)', index=i)
+            items.append((item.get('id'), item['text']))
+    else:
+        texts = payload.get('texts', [])
+        if not isinstance(texts, list):
+            raise PayloadError('"texts" debe ser una lista')
+        for i, text in enumerate(texts):
+            if not isinstance(text, str):
+                raise PayloadError('Cada texto debe ser un string', index=i)
+        items = [(None, text) for text in texts]
+
+    batch_size = payload.get('batch_size')
+    if batch_size is None:
+        batch_size = default_batch_size
+    if isinstance(batch_size, bool) or not isinstance(batch_size, int) or batch_size < 1:
+        raise PayloadError('"batch_size" debe ser un entero positivo')
+    return items, batch_size
+
+
+def label_for(prob, threshold=FAKE_THRESHOLD):
+    # Devuelve (label, confianza en %) a partir de la probabilidad de FAKE
+    prob = float(prob)
+    is_fake = prob > threshold
+    confidence = prob * 100 if is_fake else (1 - prob) * 100
+    return ("FAKE" if is_fake else "REAL"), confidence
+
+
+def encode_texts(encoder, texts):
+    cleaned = clean_texts(texts, max_tokens=MAX_LEN)
+    return encoder.encode_batch(cleaned, MAX_LEN, padding='post', truncating='post')
+
+
+def iter_batches(items, batch_size):
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def score_items(items, encoder, predict_fn, batch_size=256, translate=None):
+    """
+    Puntúa un iterable de (id, texto) en lotes de tamaño fijo y va
+    devolviendo un dict por fila, sin acumular el resultado completo.
+    `predict_fn` recibe la matriz int32 del lote y devuelve las probabilidades.
+    """
+    index = 0
+    for batch in iter_batches(items, batch_size):
+        ids = [item_id for item_id, _ in batch]
+        texts = [str(text) for _, text in batch]
+        if translate is not None:
+            texts = [translate(t) for t in texts]
+
+        probs = predict_fn(encode_texts(encoder, texts))
+        for item_id, prob in zip(ids, probs):
+            label, confidence = label_for(prob)
+            row = {"index": index, "label": label,
+                   "confidence": round(confidence, 2), "probability": round(float(prob), 6)}
+            if item_id is not None:
+                row["id"] = item_id
+            yield row
+            index += 1
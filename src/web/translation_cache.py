@@ -0,0 +1,54 @@
+import hashlib
+import threading
+from deep_translator import GoogleTranslator
+
+from two_tier_cache import TwoTierCache
+
+
+class GoogleBackend:
+    """
+    Backend por defecto: un GoogleTranslator por par de idiomas y por hilo.
+    translate() guarda el texto en el propio objeto antes del request, así
+    que compartirlo entre hilos mezclaría los textos de peticiones concurrentes.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+
+    def __call__(self, text, source, target):
+        translators = getattr(self._local, 'translators', None)
+        if translators is None:
+            translators = self._local.translators = {}
+        key = (source, target)
+        if key not in translators:
+            translators[key] = GoogleTranslator(source=source, target=target)
+        return translators[key].translate(text)
+
+
+class TranslationCache(TwoTierCache):
+    """
+    Caché de traducciones por hash del contenido, siempre con SQLite en disco.
+    El backend es cualquier callable (text, source, target) -> str,
+    así las pruebas pueden usar un stub local en vez de la red.
+    """
+
+    def __init__(self, db_path, backend=None, max_memory_items=1024,
+                 max_disk_items=100000, ttl_hours=720):
+        super().__init__(db_path, 'translations', 'translated', 'TEXT',
+                         max_memory_items, max_disk_items, ttl_hours)
+        self.backend = backend or GoogleBackend()
+
+    @staticmethod
+    def make_key(text, source, target):
+        return hashlib.sha256(f"{source}:{target}:{text}".encode('utf-8')).hexdigest()
+
+    def translate(self, text, source='es', target='en'):
+        key = self.make_key(text, source, target)
+        translated = self.get(key)
+        if translated is not None:
+            return translated
+
+        # La llamada remota se hace fuera del lock; si falla no se guarda nada
+        translated = self.backend(text, source, target)
+        self.put(key, translated)
+        return translated
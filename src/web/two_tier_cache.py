@@ -0,0 +1,109 @@
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+class TwoTierCache:
+    """
+    Almacén clave -> valor en dos niveles.
+    Nivel 1: LRU en memoria. Nivel 2 opcional (db_path): SQLite en disco,
+    con TTL y tope de filas, compartido entre procesos.
+    Cada tabla guarda un solo valor en `column` (tipo SQLite `column_type`);
+    las subclases arman la clave y codifican el valor.
+    """
+
+    def __init__(self, db_path, table, column, column_type='TEXT', max_memory_items=1024,
+                 max_disk_items=100000, ttl_hours=720):
+        self.table = table
+        self.column = column
+        self.max_memory_items = max_memory_items
+        self.max_disk_items = max_disk_items
+        self.ttl = ttl_hours * 3600 if ttl_hours else None
+
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        self._db = None
+        if db_path:
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} ("
+                f" key TEXT PRIMARY KEY, {column} {column_type} NOT NULL,"
+                f" created REAL NOT NULL, last_used REAL NOT NULL)"
+            )
+            self._db.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_last_used ON {table}(last_used)")
+            self._db.commit()
+
+    def get(self, key):
+        now = time.time()
+        with self._lock:
+            hit = self._memory.get(key)
+            if hit is not None and not self._expired(hit[1], now):
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return hit[0]
+
+            if self._db is not None:
+                row = self._db.execute(
+                    f"SELECT {self.column}, created FROM {self.table} WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None and not self._expired(row[1], now):
+                    self._db.execute(f"UPDATE {self.table} SET last_used = ? WHERE key = ?", (now, key))
+                    self._db.commit()
+                    self._remember(key, row[0], row[1])
+                    self.disk_hits += 1
+                    return row[0]
+            self.misses += 1
+            return None
+
+    def put(self, key, value):
+        now = time.time()
+        with self._lock:
+            self._remember(key, value, now)
+            if self._db is not None:
+                self._db.execute(
+                    f"INSERT OR REPLACE INTO {self.table} (key, {self.column}, created, last_used) "
+                    f"VALUES (?, ?, ?, ?)",
+                    (key, value, now, now)
+                )
+                self._evict_disk(now)
+                self._db.commit()
+
+    def _expired(self, created, now):
+        return self.ttl is not None and now - created > self.ttl
+
+    def _remember(self, key, value, created):
+        self._memory[key] = (value, created)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_items:
+            self._memory.popitem(last=False)
+
+    def _evict_disk(self, now):
+        if self.ttl is not None:
+            self._db.execute(f"DELETE FROM {self.table} WHERE created < ?", (now - self.ttl,))
+        count = self._db.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+        if count > self.max_disk_items:
+            self._db.execute(
+                f"DELETE FROM {self.table} WHERE key IN ("
+                f" SELECT key FROM {self.table} ORDER BY last_used ASC LIMIT ?)",
+                (count - self.max_disk_items,)
+            )
+
+    def stats(self):
+        with self._lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            return {
+                "memory_items": len(self._memory),
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": round((self.memory_hits + self.disk_hits) / lookups, 4) if lookups else 0.0,
+            }
@@ -0,0 +1,50 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Mismos imports que los scripts: src/ y src/web/ en el path
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.append(SRC_DIR)
+sys.path.append(os.path.join(SRC_DIR, 'web'))
+
+
+def build_config(tmp_path, name, **params):
+    out = tmp_path / name
+    config = {
+        'paths': {'raw_data': str(tmp_path / "data.csv"),
+                  'tokenizer': str(out / "tokenizer.pkl"),
+                  'vocabulary': str(out / "vocab.npz"),
+                  'prepared_data': str(out / "prepared")},
+        'global_params': {'vocab_size': 50, 'max_length': 12, 'oov_tok': "<OOV>",
+                          'test_size': 0.2, 'val_size': 0.2, 'padding_type': 'post',
+                          'trunc_type': 'post', 'chunk_size': 37, 'workers': 1, 'clean_text': True},
+    }
+    config['global_params'].update(params)
+    return config
+
+
+@pytest.fixture
+def small_csv(tmp_path):
+    # Filas con puntuación, mayúsculas, largos variados y algunas vacías (dropna)
+    rng = np.random.default_rng(0)
+    words = [f"Word{i}," for i in range(80)] + ["The", "said", "<b>news</b>", "http://x.io/a"]
+    rows = []
+    for i in range(230):
+        text = " ".join(rng.choice(words, size=int(rng.integers(1, 30))))
+        label = int(rng.integers(0, 2))
+        if i % 41 == 5:
+            text = None
+        if i % 53 == 7:
+            label = None
+        rows.append({'combined_text': text, 'label': label})
+    pd.DataFrame(rows).to_csv(tmp_path / "data.csv", index=False)
+    return tmp_path
+
+
+@pytest.fixture
+def make_config():
+    # Config mínima de preprocesamiento con rutas bajo tmp_path/<name>
+    return build_config
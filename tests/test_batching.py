@@ -0,0 +1,129 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from batching import MicroBatcher
+
+
+class RecordingModel:
+    """Forward pass falso: devuelve la suma de cada fila y registra el tamaño de cada lote."""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.batches = []
+        self._lock = threading.Lock()
+
+    def __call__(self, rows):
+        with self._lock:
+            self.batches.append(len(rows))
+        if self.delay:
+            time.sleep(self.delay)
+        return rows.sum(axis=1)
+
+
+@pytest.fixture
+def make_batcher():
+    batchers = []
+
+    def make(predict_fn, **kwargs):
+        batcher = MicroBatcher(predict_fn, **kwargs)
+        batchers.append(batcher)
+        return batcher
+
+    yield make
+    for batcher in batchers:
+        batcher.close()
+
+
+def test_concurrent_submits_share_one_forward_pass(make_batcher):
+    model = RecordingModel()
+    batcher = make_batcher(model, max_batch_size=32, max_wait_ms=200)
+    futures = [batcher.submit(np.full(4, i)) for i in range(8)]
+    assert [f.result(timeout=5) for f in futures] == [4 * i for i in range(8)]
+    assert model.batches == [8]
+
+
+def test_each_caller_gets_its_own_row_from_threads(make_batcher):
+    model = RecordingModel()
+    batcher = make_batcher(model, max_batch_size=16, max_wait_ms=20)
+    with ThreadPoolExecutor(16) as pool:
+        results = list(pool.map(lambda i: batcher.predict(np.full(3, i), timeout=5), range(64)))
+    assert results == [3 * i for i in range(64)]
+    assert sum(model.batches) == 64 and max(model.batches) <= 16
+
+
+def test_full_batch_flushes_before_the_window(make_batcher):
+    model = RecordingModel()
+    batcher = make_batcher(model, max_batch_size=4, max_wait_ms=10000)
+    start = time.monotonic()
+    futures = [batcher.submit(np.ones(2)) for _ in range(4)]
+    for f in futures:
+        f.result(timeout=5)
+    assert time.monotonic() - start < 5
+    assert model.batches == [4]
+
+
+def test_window_flushes_a_partial_batch(make_batcher):
+    model = RecordingModel()
+    batcher = make_batcher(model, max_batch_size=32, max_wait_ms=20)
+    assert batcher.predict(np.ones(2), timeout=5) == 2
+    assert model.batches == [1]
+
+
+def test_model_error_reaches_every_future_and_the_loop_survives(make_batcher):
+    calls = []
+
+    def failing(rows):
+        calls.append(len(rows))
+        if len(calls) == 1:
+            raise RuntimeError("forward pass roto")
+        return rows.sum(axis=1)
+
+    batcher = make_batcher(failing, max_batch_size=8, max_wait_ms=100)
+    futures = [batcher.submit(np.ones(2)) for _ in range(3)]
+    for f in futures:
+        with pytest.raises(RuntimeError, match="forward pass roto"):
+            f.result(timeout=5)
+    assert batcher.predict(np.ones(2), timeout=5) == 2
+
+
+def test_bad_row_shape_fails_the_batch_without_killing_the_thread(make_batcher):
+    batcher = make_batcher(RecordingModel(), max_batch_size=8, max_wait_ms=100)
+    good, bad = batcher.submit(np.ones(4)), batcher.submit(np.ones(3))
+    for f in (good, bad):
+        with pytest.raises(ValueError):
+            f.result(timeout=5)
+    assert batcher.predict(np.ones(4), timeout=5) == 4
+
+
+def test_metrics_track_batch_sizes_and_queue_depth(make_batcher):
+    release = threading.Event()
+
+    def blocking(rows):
+        release.wait(5)
+        return rows.sum(axis=1)
+
+    batcher = make_batcher(blocking, max_batch_size=2, max_wait_ms=50)
+    futures = [batcher.submit(np.ones(1)) for _ in range(2)]
+    time.sleep(0.1)  # El primer lote (2 filas) queda bloqueado en el modelo
+    futures += [batcher.submit(np.ones(1)) for _ in range(3)]
+    assert batcher.stats()["queue_depth"] == 3
+    release.set()
+    for f in futures:
+        f.result(timeout=5)
+
+    stats = batcher.stats()
+    assert stats["queue_depth"] == 0
+    assert stats["total_items"] == 5 and stats["max_batch_size_seen"] == 2
+    assert stats["batch_size_counts"] == {1: 1, 2: 2}
+    assert stats["avg_batch_size"] == round(5 / 3, 2)
+
+
+def test_closed_batcher_resolves_directly(make_batcher):
+    model = RecordingModel()
+    batcher = make_batcher(model)
+    batcher.close()
+    assert batcher.predict(np.ones(3), timeout=5) == 3
@@ -0,0 +1,91 @@
+import pickle
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from features.build_features import (load_and_process_data, load_and_process_data_streaming, make_bucketed_dataset,
+                                     raw_data_path, read_dataset)
+
+
+def test_raw_data_falls_back_to_csv_when_parquet_missing(tmp_path):
+    config = {'paths': {'raw_data': str(tmp_path / "data_limpio.parquet")}}
+    assert raw_data_path(config) == config['paths']['raw_data']
+
+    pd.DataFrame({'combined_text': ["uno dos"], 'label': [1]}).to_csv(tmp_path / "data_limpio.csv", index=False)
+    path = raw_data_path(config)
+    assert path == str(tmp_path / "data_limpio.csv")
+    assert read_dataset(path, ['combined_text', 'label'])['label'].tolist() == [1]
+
+
+def test_raw_data_prefers_existing_parquet(tmp_path):
+    pytest.importorskip('pyarrow')
+    frame = pd.DataFrame({'combined_text': ["uno dos"], 'label': [0]})
+    frame.to_parquet(tmp_path / "data_limpio.parquet")
+    frame.to_csv(tmp_path / "data_limpio.csv", index=False)
+    config = {'paths': {'raw_data': str(tmp_path / "data_limpio.parquet")}}
+    assert raw_data_path(config) == config['paths']['raw_data']
+
+
+
+@pytest.mark.parametrize("padding,truncating", [("post", "post"), ("pre", "pre")])
+def test_streaming_loader_matches_in_memory_loader(small_csv, make_config, padding, truncating):
+    memory_config = make_config(small_csv, "memory", padding_type=padding, trunc_type=truncating)
+    streaming_config = make_config(small_csv, "streaming", padding_type=padding, trunc_type=truncating)
+    expected = load_and_process_data(memory_config)
+    got = load_and_process_data_streaming(streaming_config)
+
+    for (X_exp, y_exp), (X_got, y_got) in zip(expected, got):
+        assert isinstance(X_got, np.memmap)
+        np.testing.assert_array_equal(np.asarray(X_got), X_exp)
+        np.testing.assert_array_equal(y_got, y_exp.astype(y_got.dtype))
+    assert sum(len(X) for X, _ in got) == len(pd.read_csv(small_csv / "data.csv").dropna())
+
+    with open(memory_config['paths']['tokenizer'], 'rb') as f:
+        memory_tok = pickle.load(f)
+    with open(streaming_config['paths']['tokenizer'], 'rb') as f:
+        streaming_tok = pickle.load(f)
+    assert streaming_tok.word_index == memory_tok.word_index
+
+
+def test_parallel_in_memory_loader_matches_single_process(small_csv, make_config):
+    single = load_and_process_data(make_config(small_csv, "single"))
+    parallel = load_and_process_data(make_config(small_csv, "parallel", workers=2))
+    for (X_a, y_a), (X_b, y_b) in zip(single, parallel):
+        np.testing.assert_array_equal(X_a, X_b)
+        np.testing.assert_array_equal(y_a, y_b)
+
+
+def bucket_edge(length, boundaries, max_length, min_length):
+    return max(min(e for e in sorted(set(boundaries) | {max_length}) if e >= length), min_length)
+
+
+@pytest.mark.parametrize("bucket", [True, False])
+def test_bucketed_batches_are_padded_to_their_own_length(bucket):
+    rng = np.random.default_rng(1)
+    max_length, boundaries, min_length = 40, (8, 16, 24), 5
+    lengths = rng.integers(0, max_length + 1, size=150)
+    X = np.zeros((len(lengths), max_length), dtype=np.int32)
+    for i, n in enumerate(lengths):
+        X[i, :n] = rng.integers(2, 100, size=n)
+    # La etiqueta es el número de fila: si se desalinea, la fila no coincide
+    y = np.arange(len(X))
+
+    dataset = make_bucketed_dataset(X, y, batch_size=16, boundaries=boundaries,
+                                    bucket=bucket, min_length=min_length)
+    seen = []
+    for xb, yb in dataset:
+        xb, rows = xb.numpy(), yb.numpy()
+        # Cada lote llega hasta su fila más larga, redondeado al siguiente borde
+        longest = max(int(lengths[rows].max()), 1)
+        assert xb.shape[1] == bucket_edge(longest, boundaries, max_length, min_length)
+        for row, x in zip(rows, xb):
+            # Texto vacío -> un único <OOV> para que la fila nunca quede toda enmascarada
+            expected = X[row, :lengths[row]] if lengths[row] else np.array([1])
+            np.testing.assert_array_equal(x[:len(expected)], expected)
+            assert not x[len(expected):].any()
+        seen.extend(rows.tolist())
+
+    assert sorted(seen) == list(range(len(X)))
+    if not bucket:
+        assert seen == list(range(len(X)))
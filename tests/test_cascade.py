@@ -0,0 +1,52 @@
+import numpy as np
+
+from model.cascade import FAKE_THRESHOLD, band_grid, cascade_predict, evaluate, tune_band
+
+# El modelo rápido solo se equivoca cerca del umbral; el pesado acierta siempre
+DOUBTFUL = (0.6, 0.95)
+
+
+def synthetic_probs(n=4000, seed=0):
+    rng = np.random.default_rng(seed)
+    p_fast = rng.uniform(0, 1, n)
+    y = (p_fast > FAKE_THRESHOLD).astype(int)
+    doubtful = (p_fast >= DOUBTFUL[0]) & (p_fast <= DOUBTFUL[1])
+    y[doubtful] = rng.integers(0, 2, doubtful.sum())
+    p_slow = np.where(y == 1, rng.uniform(0.9, 1, n), rng.uniform(0, 0.5, n))
+    return p_fast, p_slow, y
+
+
+def test_band_grid_matches_brute_force():
+    p_fast, p_slow, y = synthetic_probs(500)
+    lows, highs, accuracy, escalated = band_grid(p_fast, p_slow, y)
+    assert lows.max() <= FAKE_THRESHOLD <= highs.min()
+    for i in (0, len(lows) // 2, len(lows) - 1):
+        for j in (0, len(highs) // 3, len(highs) - 1):
+            probs, escalate = cascade_predict(p_fast, p_slow, (lows[i], highs[j]))
+            assert np.isclose(escalated[i, j], escalate.mean())
+            assert np.isclose(accuracy[i, j], np.mean((probs > FAKE_THRESHOLD) == y))
+
+
+def test_tuned_band_escalates_only_the_doubtful_rows():
+    p_fast, p_slow, y = synthetic_probs()
+    band = tune_band(p_fast, p_slow, y, max_accuracy_drop=0.002)
+    report = evaluate(p_fast, p_slow, y, band)
+
+    assert report["accuracy_slow"] == 1.0
+    assert report["accuracy_fast"] < 0.9
+    assert report["accuracy_cascade"] >= report["accuracy_slow"] - 0.002
+    # Solo hace falta escalar la zona dudosa (35 % de las filas), no todo
+    assert DOUBTFUL[0] - 0.02 <= band[0] and band[1] <= DOUBTFUL[1] + 0.02
+    assert 0.25 < report["escalated"] <= DOUBTFUL[1] - DOUBTFUL[0] + 0.02
+
+
+def test_looser_accuracy_target_escalates_less():
+    p_fast, p_slow, y = synthetic_probs()
+    strict = evaluate(p_fast, p_slow, y, tune_band(p_fast, p_slow, y, max_accuracy_drop=0.0))
+    loose = evaluate(p_fast, p_slow, y, tune_band(p_fast, p_slow, y, max_accuracy_drop=0.05))
+    free = evaluate(p_fast, p_slow, y, tune_band(p_fast, p_slow, y, max_accuracy_drop=1.0))
+
+    assert strict["accuracy_cascade"] == 1.0
+    assert free["escalated"] <= loose["escalated"] < strict["escalated"]
+    assert loose["accuracy_cascade"] >= 1.0 - 0.05
+    assert free["escalated"] == 0.0 and free["accuracy_cascade"] == free["accuracy_fast"]
@@ -0,0 +1,30 @@
+import pytest
+
+from extractor import extract_article
+from reference_samples import MALFORMED_CASES, soup_extract_article
+
+WELL_FORMED = [
+    "<html><head><title>x</title><script>var p = '<p>no</p>';</script></head>"
+    "<body><h1> Título &amp; más </h1><nav><p>Menú</p></nav>"
+    "<article><p>Primer <b>párrafo</b>.</p><p>Segundo&nbsp;párrafo</p></article></body></html>",
+    "<p>sin título</p><style>p { color: red }</style><p>fin</p>",
+]
+
+
+@pytest.mark.parametrize("html", WELL_FORMED)
+def test_matches_beautifulsoup_on_well_formed_html(html):
+    assert extract_article(html) == soup_extract_article(html)
+    assert extract_article(html.encode('utf-8')) == soup_extract_article(html)
+
+
+@pytest.mark.parametrize("html,expected,soup_agrees", MALFORMED_CASES)
+def test_unclosed_paragraphs_close_implicitly(html, expected, soup_agrees):
+    assert extract_article(html)[1] == expected
+    if soup_agrees:
+        assert soup_extract_article(html)[1] == expected
+
+
+def test_max_paragraphs_counts_unclosed_paragraphs():
+    html = "".join(f"<p>párrafo {i}" for i in range(100))
+    _, text = extract_article(html, max_paragraphs=3)
+    assert text == "párrafo 0 párrafo 1 párrafo 2"
@@ -0,0 +1,157 @@
+import asyncio
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+import httpx
+import pytest
+
+from extractor import P_START_RE, ParagraphCounter
+from fetcher import ArticleFetcher
+
+ETAG = '"v1"'
+BIG_BODY = b"<p>" + b"x" * 200000 + b"</p>"
+CHUNK = b"<p>paragraph</p>" * 64
+N_CHUNKS = 50
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+        try:
+            if self.path == "/article":
+                if self.headers.get("If-None-Match") == ETAG:
+                    self.send_response(304)
+                    self.send_header("ETag", ETAG)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                self._send(b"<html><h1>T</h1><p>body</p></html>", {"ETag": ETAG})
+            elif self.path == "/big":
+                self._send(BIG_BODY)
+            elif self.path == "/stream":
+                # Cuerpo en trozos con pausas: el cliente puede cortar antes del final
+                self.send_response(200)
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                try:
+                    for _ in range(N_CHUNKS):
+                        self.wfile.write(b"%x\r\n%s\r\n" % (len(CHUNK), CHUNK))
+                        self.wfile.flush()
+                        server.chunks_sent += 1
+                        time.sleep(0.01)
+                    self.wfile.write(b"0\r\n\r\n")
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+            elif self.path.startswith("/slow"):
+                time.sleep(0.1)
+                self._send(b"<p>slow</p>")
+            else:
+                self.send_error(404)
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+
+    def _send(self, body, headers=None):
+        self.send_response(200)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    srv.lock = threading.Lock()
+    srv.in_flight = srv.max_in_flight = srv.chunks_sent = 0
+    thread = threading.Thread(target=srv.serve_forever, daemon=True)
+    thread.start()
+    yield srv, f"http://127.0.0.1:{srv.server_address[1]}"
+    srv.shutdown()
+    srv.server_close()
+
+
+def run(fetcher, coro):
+    async def main():
+        try:
+            return await coro
+        finally:
+            await fetcher.aclose()
+    return asyncio.run(main())
+
+
+def test_conditional_revalidation_returns_304(server):
+    _, base = server
+    fetcher = ArticleFetcher()
+    first = run(fetcher, fetcher.fetch(f"{base}/article"))
+    assert first.status == 200 and first.etag == ETAG and b"<h1>T</h1>" in first.body
+
+    again = run(fetcher, fetcher.fetch(f"{base}/article", etag=first.etag))
+    assert again.status == 304 and again.body == b"" and again.etag == ETAG
+
+
+def test_body_is_capped_at_max_bytes(server):
+    _, base = server
+    fetcher = ArticleFetcher(max_bytes=10000)
+    result = run(fetcher, fetcher.fetch(f"{base}/big"))
+    assert result.status == 200
+    assert len(result.body) == 10000
+    assert result.body == BIG_BODY[:10000]
+
+
+def test_enough_stops_reading_early(server):
+    srv, base = server
+    fetcher = ArticleFetcher(enough=lambda: ParagraphCounter(100))
+    result = run(fetcher, fetcher.fetch(f"{base}/stream"))
+    assert result.body.count(b"<p>") >= 100
+    assert len(result.body) < len(CHUNK) * N_CHUNKS
+    time.sleep(0.2)
+    assert srv.chunks_sent < N_CHUNKS
+
+
+def test_per_host_limit(server):
+    srv, base = server
+    fetcher = ArticleFetcher(max_per_host=2)
+
+    async def fetch_all():
+        return await asyncio.gather(*(fetcher.fetch(f"{base}/slow?{i}") for i in range(8)))
+
+    results = run(fetcher, fetch_all())
+    assert all(r.status == 200 for r in results)
+    assert srv.max_in_flight == 2
+    # Sin descargas en curso no quedan semáforos por host
+    assert fetcher._host_limits == {}
+
+
+def test_host_limits_are_dropped_after_errors(server):
+    srv, base = server
+    fetcher = ArticleFetcher()
+    with pytest.raises(httpx.HTTPStatusError):
+        run(fetcher, fetcher.fetch(f"{base}/missing"))
+    assert fetcher._host_limits == {}
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 64, 4096])
+def test_paragraph_counter_matches_a_full_scan(chunk_size):
+    body = (b"<P class=a>x</p><p>y<p\n>z<pre>no</pre><p>" * 50) + b"<html><p"
+    counter = ParagraphCounter(limit=10 ** 9)
+    for i in range(0, len(body), chunk_size):
+        counter(body[i:i + chunk_size])
+    assert counter.count == len(P_START_RE.findall(body)) == 200
+
+
+def test_paragraph_counter_stops_at_limit():
+    counter = ParagraphCounter(limit=3)
+    assert not counter(b"<p>a</p><p")
+    assert not counter(b">b</p>")
+    assert counter(b"<p>c")
@@ -0,0 +1,83 @@
+import string
+
+import numpy as np
+import pandas as pd
+
+from features.ingest import run_ingestion
+from features.near_dedupe import NearDuplicateFilter, minhash_signatures
+
+
+def random_words(rng, n):
+    # Solo letras: clean_series borra las palabras con dígitos
+    letters = np.array(list(string.ascii_lowercase))
+    return ' '.join(''.join(rng.choice(letters, 7)) for _ in range(n))
+
+
+def edited_copy(text, rng, edits=2):
+    words = text.split()
+    for i in rng.choice(len(words), edits, replace=False):
+        words[i] = 'editado'
+    return ' '.join(words)
+
+
+def test_near_copy_is_dropped_and_distinct_text_kept():
+    rng = np.random.default_rng(0)
+    original = random_words(rng, 200)
+    texts = [original, edited_copy(original, rng), random_words(rng, 200)]
+    near_filter = NearDuplicateFilter(num_perm=64, bands=8, threshold=0.8)
+
+    keep = near_filter.filter(minhash_signatures(texts))
+    assert keep.tolist() == [True, False, True]
+    # El índice es incremental: la copia también se detecta en un chunk posterior
+    later = [edited_copy(texts[2], rng), random_words(rng, 200)]
+    assert near_filter.filter(minhash_signatures(later)).tolist() == [False, True]
+    assert (near_filter.kept, near_filter.removed) == (3, 2)
+
+
+def test_signatures_estimate_jaccard():
+    rng = np.random.default_rng(1)
+    a = random_words(rng, 300)
+    sig = minhash_signatures([a, edited_copy(a, rng, edits=1), random_words(rng, 300), a], num_perm=128)
+    similarity = (sig[0] == sig).mean(axis=1)
+    assert similarity[3] == 1.0
+    assert similarity[1] > 0.9
+    assert similarity[2] < 0.1
+
+
+def write_sources(tmp_path, rng):
+    rows = [(f"title {i}", random_words(rng, 40), i % 2) for i in range(40)]
+    first = pd.DataFrame(rows[:25], columns=['title', 'text', 'target'])
+    second = pd.DataFrame(rows[25:], columns=['title', 'text', 'label'])
+    second['label'] = second['label'].map({1: 'FAKE', 0: 'REAL'})
+    planted = pd.DataFrame([
+        ("title 3", random_words(rng, 40), 'REAL'),                       # Título repetido
+        ("otro título", edited_copy(rows[5][1], rng, edits=1), 'FAKE'),   # Copia editada
+        ("corto", random_words(rng, 5), 'REAL'),                          # Menos de min_words
+    ], columns=['title', 'text', 'label'])
+    second = pd.concat([second, planted], ignore_index=True)
+    first.to_csv(tmp_path / "a.csv", index=False)
+    second.to_csv(tmp_path / "b.csv", index=False)
+    return [
+        {'path': str(tmp_path / "a.csv"), 'label_column': 'target'},
+        {'path': str(tmp_path / "b.csv"), 'label_column': 'label', 'label_map': {'FAKE': 1, 'REAL': 0}},
+    ]
+
+
+def test_run_ingestion_is_the_same_with_one_or_two_workers(tmp_path):
+    sources = write_sources(tmp_path, np.random.default_rng(2))
+    config = {
+        'paths': {'raw_data': str(tmp_path / "unused.csv")},
+        'ingestion': {
+            'sources': sources, 'min_words': 20, 'min_final_words': 3,
+            'near_duplicates': {'enabled': True, 'threshold': 0.8, 'num_perm': 64, 'bands': 8},
+        },
+    }
+    serial = run_ingestion(config, str(tmp_path / "serial.csv"), workers=1, chunk_size=7)
+    parallel = run_ingestion(config, str(tmp_path / "parallel.csv"), workers=2, chunk_size=7)
+
+    assert serial['read'] == parallel['read'] == 43
+    assert serial['rows'] == parallel['rows'] == 40
+    for key in ('títulos duplicados', 'casi duplicados', 'menos de 20 palabras'):
+        assert serial[key] == parallel[key] == 1
+    pd.testing.assert_frame_equal(pd.read_csv(tmp_path / "serial.csv"), pd.read_csv(tmp_path / "parallel.csv"))
+    assert "otro título" not in pd.read_csv(tmp_path / "serial.csv")['title'].tolist()
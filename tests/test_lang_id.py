@@ -0,0 +1,22 @@
+import pytest
+
+from features.lang_id import PROFILES, LanguageDetector
+from reference_samples import EN_SENTENCES, ES_SENTENCES
+
+
+@pytest.mark.parametrize("lang", sorted(PROFILES))
+def test_profiles_have_no_duplicate_trigrams(lang):
+    trigrams = PROFILES[lang].split()
+    assert len(trigrams) == len(set(trigrams))
+
+
+@pytest.mark.parametrize("truth,text", [("en", s) for s in EN_SENTENCES] + [("es", s) for s in ES_SENTENCES])
+def test_single_headlines_are_decided(truth, text):
+    assert LanguageDetector().detect(text) == truth
+
+
+def test_short_or_unknown_text_is_undecided():
+    detector = LanguageDetector()
+    assert detector.detect("OK") is None
+    assert detector.detect("12345 !!!") is None
+    assert detector.stats()["detected_unknown"] == 2
@@ -0,0 +1,101 @@
+import os
+import re
+import threading
+import time
+
+from metrics import Histogram, render_gauges
+from profiler import SlowRequestProfiler
+
+# Línea de muestra del formato de texto de Prometheus: nombre{etiquetas} valor
+SAMPLE_RE = re.compile(r'^[a-zA-Z_:][a-zA-Z0-9_:]*(\{([a-zA-Z_][a-zA-Z0-9_]*="(\\.|[^"\\])*",?)*\})? \S+$')
+
+
+def samples(lines):
+    return {line.rsplit(" ", 1)[0]: line.rsplit(" ", 1)[1] for line in lines if not line.startswith("#")}
+
+
+def test_histogram_buckets_are_cumulative():
+    hist = Histogram("t_seconds", "Prueba.", ("stage",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        hist.observe(value, stage="x")
+    lines = hist.render()
+    assert lines[:2] == ["# HELP t_seconds Prueba.", "# TYPE t_seconds histogram"]
+    assert all(SAMPLE_RE.match(line) for line in lines[2:])
+    values = samples(lines)
+    assert values['t_seconds_bucket{stage="x",le="0.1"}'] == "2"   # Límite inclusivo
+    assert values['t_seconds_bucket{stage="x",le="1.0"}'] == "3"
+    assert values['t_seconds_bucket{stage="x",le="+Inf"}'] == "4"
+    assert values['t_seconds_count{stage="x"}'] == "4"
+    assert float(values['t_seconds_sum{stage="x"}']) == 3.65
+
+
+def test_histogram_series_per_label_and_escaping():
+    hist = Histogram("t_seconds", "Prueba.", ("route", "model"), buckets=(1.0,))
+    hist.observe(0.5, route="/predict", model='a"b\\c')
+    hist.observe(0.5, route="/predict_url", model="m")
+    lines = hist.render()
+    assert all(SAMPLE_RE.match(line) for line in lines[2:])
+    assert 't_seconds_count{route="/predict",model="a\\"b\\\\c"} 1' in lines
+    assert 't_seconds_count{route="/predict_url",model="m"} 1' in lines
+
+
+def test_histogram_time_and_threads():
+    hist = Histogram("t_seconds", "Prueba.", ("stage",), buckets=(10.0,))
+    with hist.time(stage="sleep"):
+        time.sleep(0.01)
+    threads = [threading.Thread(target=lambda: [hist.observe(0.001, stage="n") for _ in range(500)])
+               for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    values = samples(hist.render())
+    assert float(values['t_seconds_sum{stage="sleep"}']) >= 0.01
+    assert values['t_seconds_count{stage="n"}'] == "2000"
+
+
+def test_render_gauges_keeps_numbers_only():
+    stats = {"hits": 3, "hit_rate": 0.5, "shared": True, "loaded": ["a"], "band-low": 0.25}
+    lines = render_gauges("fakenews_cache", stats, {"model": "m"})
+    assert lines == [
+        "# TYPE fakenews_cache_hits gauge", 'fakenews_cache_hits{model="m"} 3',
+        "# TYPE fakenews_cache_hit_rate gauge", 'fakenews_cache_hit_rate{model="m"} 0.5',
+        "# TYPE fakenews_cache_band_low gauge", 'fakenews_cache_band_low{model="m"} 0.25',
+    ]
+
+
+def busy(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def test_profiler_saves_only_slow_requests(tmp_path):
+    profiler = SlowRequestProfiler(str(tmp_path), slow_ms=100, interval_ms=2, enabled=True)
+    with profiler.profile("/predict fast"):
+        busy(0.01)
+    assert profiler.captured == 0 and not os.listdir(tmp_path)
+
+    with profiler.profile("/predict slow"):
+        busy(0.2)
+    assert profiler.captured == 1
+    [name] = os.listdir(tmp_path)
+    assert name.endswith("ms.folded") and "predict_slow" in name
+    with open(tmp_path / name) as f:
+        lines = f.read().splitlines()
+    # Formato "collapsed": marco;marco;... conteo
+    assert lines and all(re.match(r'^.+ \d+$', line) for line in lines)
+    assert any("busy (test_metrics.py" in line for line in lines)
+
+
+def test_profiler_disabled_or_busy_does_nothing(tmp_path):
+    disabled = SlowRequestProfiler(str(tmp_path), slow_ms=0, enabled=False)
+    with disabled.profile("x"):
+        busy(0.01)
+    assert disabled.captured == 0
+
+    profiler = SlowRequestProfiler(str(tmp_path), slow_ms=0, interval_ms=1, enabled=True)
+    with profiler.profile("outer"):
+        with profiler.profile("inner"):   # Solo un perfil a la vez
+            busy(0.02)
+    assert profiler.captured == 1
@@ -0,0 +1,30 @@
+import warnings
+
+import numpy as np
+import pytest
+
+from model.model_arch import build_model_architecture
+
+EXPERIMENTS = {
+    'lstm': {'type': 'lstm', 'embedding_dim': 8, 'units': 4},
+    'dense': {'type': 'dense', 'embedding_dim': 8, 'units': 4},
+    'cnn': {'type': 'cnn', 'embedding_dim': 8, 'units': 4},
+}
+
+
+@pytest.mark.parametrize("model_type", sorted(EXPERIMENTS))
+def test_variable_length_masking_only_where_supported(model_type):
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always")
+        model = build_model_architecture(100, 50, EXPERIMENTS[model_type], variable_length=True)
+        out = model(np.array([[5, 6, 7, 8, 9, 0, 0], [3, 4, 5, 6, 7, 8, 9]], dtype=np.int32))
+    assert out.shape == (2, 1)
+    assert model.layers[0].mask_zero == (model_type != 'cnn')
+    assert not [w for w in caught if "mask" in str(w.message)]
+
+
+@pytest.mark.parametrize("model_type", sorted(EXPERIMENTS))
+def test_fixed_length_models_do_not_mask(model_type):
+    model = build_model_architecture(100, 50, EXPERIMENTS[model_type])
+    assert not model.layers[0].mask_zero
+    assert model.input_shape == (None, 50)
@@ -0,0 +1,86 @@
+import numpy as np
+import pytest
+import tensorflow as tf
+
+from model import numpy_engine
+from model.model_arch import build_model_architecture
+from model.numpy_engine import DenseEngine, read_keras_file
+
+MAX_LEN = 20
+VOCAB = 50
+
+
+def saved_model(tmp_path, model_type='dense', variable_length=False, seed=0):
+    tf.keras.utils.set_random_seed(seed)
+    exp = {'type': model_type, 'embedding_dim': 8, 'units': 6}
+    model = build_model_architecture(VOCAB, MAX_LEN, exp, variable_length=variable_length)
+    model.set_weights([w * 3 for w in model.get_weights()])
+    path = tmp_path / f"{model_type}_{variable_length}.keras"
+    model.save(path)
+    return model, str(path)
+
+
+def padded_rows(n=32, seed=1, min_tokens=0):
+    rng = np.random.default_rng(seed)
+    rows = rng.integers(1, VOCAB, size=(n, MAX_LEN))
+    for i, length in enumerate(rng.integers(min_tokens, MAX_LEN + 1, size=n)):
+        rows[i, length:] = 0
+    return rows
+
+
+def test_matches_keras_without_mask(tmp_path):
+    # Sin máscara GlobalAveragePooling1D también promedia el padding (embedding[0])
+    model, path = saved_model(tmp_path)
+    engine = DenseEngine.from_keras(path, MAX_LEN)
+    assert not engine.mask_zero
+
+    rows = padded_rows()
+    rows[0] = 0  # Fila vacía: todo padding
+    expected = model.predict(rows, verbose=0)[:, 0]
+    np.testing.assert_allclose(engine(rows), expected, atol=1e-5)
+
+
+def test_matches_keras_with_mask_zero(tmp_path):
+    model, path = saved_model(tmp_path, variable_length=True)
+    engine = DenseEngine.from_keras(path, MAX_LEN)
+    assert engine.mask_zero
+
+    rows = padded_rows(min_tokens=1)
+    expected = model.predict(rows, verbose=0)[:, 0]
+    np.testing.assert_allclose(engine(rows), expected, atol=1e-5)
+    # Con máscara, una fila corta que el motor rellena da lo mismo que en Keras
+    short = rows[:, :MAX_LEN // 2]
+    full = np.pad(short, ((0, 0), (0, MAX_LEN - short.shape[1])))
+    np.testing.assert_allclose(engine(short), model.predict(full, verbose=0)[:, 0], atol=1e-5)
+
+
+@pytest.mark.parametrize("variable_length", [False, True])
+def test_sparse_pooling_matches_reduceat(tmp_path, monkeypatch, variable_length):
+    if numpy_engine.sparse is None:
+        pytest.skip("scipy no instalado")
+    _, path = saved_model(tmp_path, variable_length=variable_length)
+    engine = DenseEngine.from_keras(path, MAX_LEN)
+    rows = padded_rows(n=300, min_tokens=1)
+
+    monkeypatch.setattr(numpy_engine, 'SPARSE_MIN_TOKENS', 1)
+    with_sparse = engine(rows)
+    monkeypatch.setattr(numpy_engine, 'SPARSE_MIN_TOKENS', 1 << 30)
+    np.testing.assert_allclose(with_sparse, engine(rows), atol=1e-6)
+
+
+def test_rows_are_cropped_and_padded_to_max_length(tmp_path):
+    model, path = saved_model(tmp_path)
+    engine = DenseEngine.from_keras(path, MAX_LEN)
+    rows = padded_rows(n=4, min_tokens=MAX_LEN)
+    long = np.concatenate([rows, np.ones((4, 5), dtype=rows.dtype)], axis=1)
+
+    expected = model.predict(rows, verbose=0)[:, 0]
+    np.testing.assert_allclose(engine(long), expected, atol=1e-5)
+    np.testing.assert_allclose(engine(rows[0]), expected[:1], atol=1e-5)
+
+
+def test_rejects_other_architectures(tmp_path):
+    _, path = saved_model(tmp_path, model_type='lstm')
+    assert not DenseEngine.supports(read_keras_file(path))
+    with pytest.raises(ValueError):
+        DenseEngine.from_keras(path, MAX_LEN)
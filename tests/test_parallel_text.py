@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+from tensorflow.keras.preprocessing.text import Tokenizer
+from tensorflow.keras.preprocessing.sequence import pad_sequences
+
+from features.build_features import tokenizer_from_counter
+from features.parallel_text import count_words_parallel, encode_parallel, shard_bounds
+from features.vocabulary import VocabEncoder, WordCounter
+
+MAX_LEN = 40
+VOCAB_SIZE = 30
+OOV = "<OOV>"
+
+# Palabras que aparecen primero en shards distintos y empates de frecuencia:
+# el merge debe respetar el orden de primera aparición de fit_on_texts
+TEXTS = [
+    "The president said officials would review the claims",
+    "zeta alpha beta gamma",
+    "BREAKING: officials deny the report, calling it fake news!!",
+    "gamma beta alpha zeta zeta",
+    "",
+    "markets fell after the announcement; analysts were surprised",
+    " ".join(f"w{i % 57}" for i in range(120)),
+    "alpha omega president",
+    "tabs\tand\nnewlines   and  spaces",
+    "delta delta epsilon the the",
+    "omega epsilon markets",
+]
+
+
+@pytest.fixture(scope="module")
+def keras_tokenizer():
+    tok = Tokenizer(num_words=VOCAB_SIZE, oov_token=OOV)
+    tok.fit_on_texts(TEXTS)
+    return tok
+
+
+def test_shard_bounds_cover_every_row():
+    for n, shards in ((0, 2), (1, 3), (10, 3), (11, 4), (7, 7)):
+        bounds = shard_bounds(n, shards)
+        covered = [i for a, b in bounds for i in range(a, b)]
+        assert covered == list(range(n))
+
+
+@pytest.mark.parametrize("workers", [1, 2, 3])
+def test_count_merge_matches_fit_on_texts(keras_tokenizer, workers):
+    counter = count_words_parallel(TEXTS, workers)
+    parallel = tokenizer_from_counter(counter, VOCAB_SIZE, OOV)
+    assert list(parallel.word_counts.items()) == list(keras_tokenizer.word_counts.items())
+    assert parallel.word_index == keras_tokenizer.word_index
+    assert parallel.document_count == keras_tokenizer.document_count
+
+
+def test_merge_of_chunks_with_global_ranks(keras_tokenizer):
+    # Como en streaming: cada chunk se cuenta aparte con su rank global
+    whole = WordCounter()
+    whole.update(TEXTS, np.arange(len(TEXTS)))
+    parts = []
+    for a, b in ((6, 11), (0, 3), (3, 6)):
+        part = WordCounter()
+        part.update(TEXTS[a:b], np.arange(a, b))
+        parts.append(part)
+    merged = parts[0]
+    for part in parts[1:]:
+        merged.merge(part)
+    assert list(merged.ordered_counts()) == list(whole.ordered_counts())
+    assert merged.vocabulary(OOV) == whole.vocabulary(OOV)
+
+
+@pytest.mark.parametrize("workers", [1, 2, 3])
+@pytest.mark.parametrize("padding", ["post", "pre"])
+@pytest.mark.parametrize("truncating", ["post", "pre"])
+def test_encode_parallel_matches_pad_sequences(keras_tokenizer, workers, padding, truncating):
+    encoder = VocabEncoder.from_tokenizer(keras_tokenizer)
+    expected = pad_sequences(keras_tokenizer.texts_to_sequences(TEXTS), maxlen=MAX_LEN,
+                             padding=padding, truncating=truncating)
+    got = encode_parallel(encoder, TEXTS, MAX_LEN, workers, padding=padding, truncating=truncating)
+    assert got.dtype == np.int32 and got.shape == (len(TEXTS), MAX_LEN)
+    np.testing.assert_array_equal(got, expected)
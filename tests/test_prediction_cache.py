@@ -0,0 +1,31 @@
+import numpy as np
+
+from prediction_cache import PredictionCache
+
+
+def test_key_ignores_encoder_dtype_and_tracks_model_version():
+    ids = np.array([5, 3, 0, 0])
+    key = PredictionCache.make_key(ids, "Exp2_Simple_Dense.keras", (1, 2))
+    assert key == PredictionCache.make_key(ids.astype(np.int64), "Exp2_Simple_Dense.keras", (1, 2))
+    assert key != PredictionCache.make_key(ids, "Exp2_Simple_Dense.keras", (1, 3))
+    assert key != PredictionCache.make_key(ids, "Exp3_Complex_LSTM.keras", (1, 2))
+
+
+def test_memory_only_cache():
+    cache = PredictionCache(max_memory_items=2)
+    cache.put("a", np.float32(0.25))
+    assert cache.get("a") == 0.25 and isinstance(cache.get("a"), float)
+    cache.put("b", 0.5)
+    cache.put("c", 0.75)
+    assert cache.get("a") is None
+    stats = cache.stats()
+    assert stats["shared"] is False and stats["memory_items"] == 2
+    assert stats["memory_hits"] == 2 and stats["misses"] == 1
+
+
+def test_sqlite_cache_is_shared_between_instances(tmp_path):
+    path = str(tmp_path / "cache" / "predictions.sqlite3")
+    PredictionCache(path).put("k", 0.9)
+    other = PredictionCache(path)
+    assert other.get("k") == 0.9
+    assert other.stats()["disk_hits"] == 1 and other.stats()["shared"] is True
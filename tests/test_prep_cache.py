@@ -0,0 +1,116 @@
+import json
+import os
+
+import numpy as np
+import pytest
+
+import features.prep_cache as prep_cache
+from features.prep_cache import KEY_PARAMS, MANIFEST, PrepCache, cache_key, file_sha256, prepare_data
+
+CHANGED = {'vocab_size': 40, 'max_length': 10, 'oov_tok': "<UNK>", 'test_size': 0.25,
+           'val_size': 0.1, 'padding_type': 'pre', 'trunc_type': 'pre', 'clean_text': False}
+
+
+@pytest.fixture
+def cached_config(small_csv, make_config):
+    config = make_config(small_csv, "run")
+    config['preprocessing_cache'] = {'enabled': True, 'path': str(small_csv / "cache"), 'max_entries': 2}
+    return config
+
+
+@pytest.fixture
+def loader_calls(monkeypatch):
+    calls = []
+    original = prep_cache.load_and_process_data
+
+    def counting(config):
+        calls.append(config['global_params']['max_length'])
+        return original(config)
+
+    monkeypatch.setattr(prep_cache, "load_and_process_data", counting)
+    return calls
+
+
+def test_every_key_param_changes_the_key(cached_config):
+    assert set(CHANGED) == set(KEY_PARAMS)
+    base, _ = cache_key(cached_config)
+    for name, value in CHANGED.items():
+        params = dict(cached_config['global_params'], **{name: value})
+        assert cache_key(dict(cached_config, global_params=params))[0] != base, name
+    # Lo que no toca el preprocesamiento no invalida la caché
+    params = dict(cached_config['global_params'], epochs=99, workers=4, chunk_size=5)
+    assert cache_key(dict(cached_config, global_params=params))[0] == base
+
+
+def test_data_and_source_changes_invalidate(cached_config, monkeypatch):
+    base, fields = cache_key(cached_config)
+    with open(cached_config['paths']['raw_data'], 'a') as f:
+        f.write("one more row,1\n")
+    assert cache_key(cached_config)[0] != base
+
+    key, _ = cache_key(cached_config)
+    monkeypatch.setattr(prep_cache, "source_sha256", lambda: "otro-codigo")
+    assert cache_key(cached_config)[0] != key
+
+
+def test_file_hash_memo_tracks_size_and_mtime(tmp_path):
+    path, memo = tmp_path / "data.csv", str(tmp_path / "memo.json")
+    path.write_text("a,b\n")
+    first = file_sha256(str(path), memo)
+    assert file_sha256(str(path), memo) == first
+    path.write_text("a,b\nc,d\n")
+    assert file_sha256(str(path), memo) != first
+    with open(memo) as f:
+        assert len(json.load(f)) == 1
+
+
+def test_second_run_reads_the_cache(cached_config, loader_calls):
+    built = prepare_data(cached_config)
+    os.remove(cached_config['paths']['tokenizer'])
+    cached = prepare_data(cached_config)
+
+    assert loader_calls == [12]
+    for (X_a, y_a), (X_b, y_b) in zip(built, cached):
+        np.testing.assert_array_equal(X_a, X_b)
+        np.testing.assert_array_equal(y_a, y_b)
+    # El tokenizer de la entrada vuelve a paths para el serving
+    assert os.path.exists(cached_config['paths']['tokenizer'])
+
+
+def test_failed_build_publishes_nothing(cached_config, monkeypatch):
+    def broken(config):
+        raise RuntimeError("falla a mitad del preprocesamiento")
+
+    monkeypatch.setattr(prep_cache, "load_and_process_data", broken)
+    with pytest.raises(RuntimeError):
+        prepare_data(cached_config)
+
+    root = cached_config['preprocessing_cache']['path']
+    key, _ = cache_key(cached_config)
+    assert not PrepCache(root).has(key)
+    assert [name for name in os.listdir(root) if name.startswith('.tmp-')] == []
+
+
+def test_prune_keeps_the_most_recently_used_entries(cached_config, loader_calls):
+    root = cached_config['preprocessing_cache']['path']
+
+    def run(max_length):
+        config = dict(cached_config, global_params=dict(cached_config['global_params'], max_length=max_length))
+        prepare_data(config)
+        return cache_key(config)[0]
+
+    def age(key, seconds):
+        manifest = os.path.join(root, key, MANIFEST)
+        stamp = os.path.getmtime(manifest) - seconds
+        os.utime(manifest, (stamp, stamp))
+
+    a = run(8)
+    age(a, 20)
+    b = run(9)
+    age(b, 10)
+    run(8)                      # Hit: "a" pasa a ser la más reciente
+    c = run(10)                 # max_entries=2: se borra "b"
+
+    cache = PrepCache(root, max_entries=2)
+    assert cache.has(a) and cache.has(c) and not cache.has(b)
+    assert loader_calls == [8, 9, 10]
@@ -0,0 +1,96 @@
+import os
+
+import numpy as np
+import pytest
+import tensorflow as tf
+
+from model.lite_runtime import TFLiteFunction
+from model.model_arch import build_model_architecture
+from model.quantize import convert, export_quantized, is_recurrent
+
+MAX_LEN = 24
+VOCAB = 60
+# Diferencia máxima con Keras por modo (pesos FP16, pesos INT8, activaciones INT8)
+TOLERANCE = {'float16': 1e-3, 'dynamic': 2e-2, 'int8': 5e-2}
+
+
+def tiny_model(model_type, seed=0):
+    tf.keras.utils.set_random_seed(seed)
+    exp = {'type': model_type, 'embedding_dim': 8, 'units': 4}
+    model = build_model_architecture(VOCAB, MAX_LEN, exp)
+    # Pesos más grandes que los iniciales para que la salida no quede pegada a 0.5
+    model.set_weights([w * 4 for w in model.get_weights()])
+    return model
+
+
+def sample_rows(n=16, seed=1):
+    rng = np.random.default_rng(seed)
+    rows = rng.integers(1, VOCAB, size=(n, MAX_LEN)).astype(np.int32)
+    for i, length in enumerate(rng.integers(1, MAX_LEN, size=n)):
+        rows[i, length:] = 0
+    return rows
+
+
+def write_tflite(tmp_path, model, mode, calibration=None):
+    path = tmp_path / f"m.{mode}.tflite"
+    path.write_bytes(convert(model, mode, MAX_LEN, calibration))
+    return str(path)
+
+
+@pytest.mark.parametrize("mode", ["float16", "dynamic", "int8"])
+def test_dense_round_trip_matches_keras(tmp_path, mode):
+    model = tiny_model('dense')
+    rows = sample_rows()
+    fn = TFLiteFunction(write_tflite(tmp_path, model, mode, calibration=sample_rows(64, seed=2)))
+    assert fn.fixed_batch is None and fn.max_length == MAX_LEN
+
+    expected = model.predict(rows, verbose=0)[:, 0]
+    np.testing.assert_allclose(fn(rows), expected, atol=TOLERANCE[mode])
+    # Lotes de otro tamaño y una fila suelta reusan el mismo intérprete
+    np.testing.assert_allclose(fn(rows[:3]), expected[:3], atol=TOLERANCE[mode])
+    np.testing.assert_allclose(fn(rows[5]), expected[5:6], atol=TOLERANCE[mode])
+
+
+def test_int8_requires_calibration():
+    with pytest.raises(ValueError):
+        convert(tiny_model('dense'), 'int8', MAX_LEN)
+
+
+def test_lite_runtime_pads_and_crops_rows(tmp_path):
+    model = tiny_model('dense')
+    fn = TFLiteFunction(write_tflite(tmp_path, model, 'float16'))
+    rows = sample_rows(4)
+    short = rows[:, :10]
+    long = np.concatenate([rows, np.ones((4, 7), dtype=np.int32)], axis=1)
+
+    padded_short = np.zeros_like(rows)
+    padded_short[:, :10] = short
+    np.testing.assert_allclose(fn(short), model.predict(padded_short, verbose=0)[:, 0], atol=1e-3)
+    np.testing.assert_allclose(fn(long), model.predict(rows, verbose=0)[:, 0], atol=1e-3)
+
+
+def test_fixed_batch_lstm_is_invoked_row_by_row(tmp_path):
+    model = tiny_model('lstm')
+    assert is_recurrent(model) and not is_recurrent(tiny_model('dense'))
+    fn = TFLiteFunction(write_tflite(tmp_path, model, 'float16'))
+    assert fn.fixed_batch == 1
+
+    rows = sample_rows(5)
+    np.testing.assert_allclose(fn(rows), model.predict(rows, verbose=0)[:, 0], atol=1e-3)
+
+
+def test_export_skips_int8_for_recurrent_models(tmp_path):
+    models_dir = tmp_path / "models"
+    models_dir.mkdir()
+    tiny_model('dense').save(models_dir / "Tiny_Dense.keras")
+    tiny_model('lstm').save(models_dir / "Tiny_LSTM.keras")
+    config = {
+        'paths': {'output_models': str(models_dir)},
+        'quantization': {'modes': ['dynamic', 'int8'], 'calibration_samples': 32, 'max_length': MAX_LEN},
+        'experiments': [{'name': "Tiny_Dense"}, {'name': "Tiny_LSTM"}, {'name': "Not_Trained"}],
+    }
+    exported = export_quantized(config, sample_rows(64, seed=3))
+
+    assert sorted(os.path.basename(p) for p in exported) == [
+        "Tiny_Dense.dynamic.tflite", "Tiny_Dense.int8.tflite", "Tiny_LSTM.dynamic.tflite"]
+    assert not (models_dir / "Tiny_LSTM.int8.tflite").exists()
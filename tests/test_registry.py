@@ -0,0 +1,98 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from registry import ModelRegistry
+
+MB = 1024 * 1024
+
+
+class FakeEntry:
+    def __init__(self, name, size_bytes=MB, version=0):
+        self.name = name
+        self.size_bytes = size_bytes
+        self.version = version
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class CountingLoader:
+    """Loader falso: cuenta cargas por nombre; opcionalmente lento o con fallas."""
+
+    def __init__(self, sizes=None, delay=0.0, fail=()):
+        self.sizes = sizes or {}
+        self.delay = delay
+        self.fail = set(fail)
+        self.versions = {}
+        self.loads = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, name):
+        with self._lock:
+            self.loads[name] = self.loads.get(name, 0) + 1
+        if self.delay:
+            time.sleep(self.delay)
+        if name in self.fail:
+            raise FileNotFoundError(name)
+        return FakeEntry(name, self.sizes.get(name, MB), self.versions.get(name, 0))
+
+
+def test_lru_eviction_by_count():
+    loader = CountingLoader()
+    registry = ModelRegistry(loader, max_models=2)
+    a = registry.get("a")
+    registry.get("b")
+    registry.get("a")          # "a" pasa a ser el más reciente
+    registry.get("c")          # desaloja "b"
+    assert registry.stats()["loaded"] == ["a", "c"]
+    assert registry.stats()["evictions"] == 1 and not a.closed
+    registry.get("b")
+    assert loader.loads["b"] == 2
+
+
+def test_lru_eviction_by_memory_keeps_the_new_model():
+    loader = CountingLoader(sizes={"a": 3 * MB, "b": 3 * MB, "big": 10 * MB})
+    registry = ModelRegistry(loader, max_models=5, max_memory_mb=7)
+    first = registry.get("a")
+    registry.get("b")
+    assert registry.stats()["loaded"] == ["a", "b"]
+    registry.get("big")        # Excede solo: se desaloja todo lo demás pero queda cargado
+    assert registry.stats()["loaded"] == ["big"]
+    assert first.closed and registry.stats()["evictions"] == 2
+
+
+def test_concurrent_gets_of_the_same_name_load_once():
+    loader = CountingLoader(delay=0.1)
+    registry = ModelRegistry(loader, max_models=2)
+    with ThreadPoolExecutor(8) as pool:
+        entries = list(pool.map(lambda _: registry.get("a"), range(8)))
+    assert loader.loads == {"a": 1}
+    assert all(e is entries[0] for e in entries)
+    assert registry.stats()["misses"] == 1 and registry.stats()["hits"] == 7
+    assert registry._load_locks == {}
+
+
+def test_failed_load_raises_and_leaves_no_lock():
+    loader = CountingLoader(fail={"missing"})
+    registry = ModelRegistry(loader)
+    for _ in range(2):
+        with pytest.raises(FileNotFoundError):
+            registry.get("missing")
+    assert loader.loads["missing"] == 2
+    assert registry._load_locks == {}
+    assert registry.stats()["loaded"] == []
+
+
+def test_stale_file_is_reloaded():
+    loader = CountingLoader()
+    registry = ModelRegistry(loader, is_stale=lambda entry: loader.versions.get(entry.name, 0) != entry.version)
+    old = registry.get("a")
+    assert registry.get("a") is old
+    loader.versions["a"] = 1   # El archivo cambió en disco
+    new = registry.get("a")
+    assert new is not old and new.version == 1 and old.closed
+    assert registry.stats()["reloads"] == 1 and loader.loads["a"] == 2
@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+from scoring import FAKE_THRESHOLD, PayloadError, label_for, parse_batch_payload, score_items
+
+
+def test_parse_texts_and_items():
+    assert parse_batch_payload({"texts": ["a", "b"]}) == ([(None, "a"), (None, "b")], 256)
+    items, batch_size = parse_batch_payload({"items": [{"id": 7, "text": "a"}, {"text": "b"}],
+                                             "batch_size": 32})
+    assert items == [(7, "a"), (None, "b")] and batch_size == 32
+
+
+@pytest.mark.parametrize("payload,index", [
+    ({"items": [{"text": "ok"}, {"id": 2}]}, 1),
+    ({"items": [{"text": "ok"}, {"text": "ok"}, "texto suelto"]}, 2),
+    ({"texts": ["ok", None]}, 1),
+    ({"items": {"text": "no es lista"}}, None),
+    (["no", "es", "objeto"], None),
+    ({"texts": ["ok"], "batch_size": 0}, None),
+    ({"texts": ["ok"], "batch_size": "10"}, None),
+])
+def test_invalid_payloads_point_to_the_bad_item(payload, index):
+    with pytest.raises(PayloadError) as err:
+        parse_batch_payload(payload)
+    assert err.value.index == index
+
+
+def test_label_for_uses_fake_threshold():
+    assert label_for(FAKE_THRESHOLD + 0.01)[0] == "FAKE"
+    assert label_for(FAKE_THRESHOLD)[0] == "REAL"
+
+
+def test_score_items_streams_in_fixed_batches():
+    class Encoder:
+        def encode_batch(self, texts, maxlen, padding='post', truncating='post'):
+            return np.array([[len(t.split())] + [0] * (maxlen - 1) for t in texts], dtype=np.int32)
+
+    batches = []
+
+    def predict(rows):
+        batches.append(len(rows))
+        return rows[:, 0] / 10.0
+
+    items = [(i, "word " * i) for i in range(1, 8)]
+    rows = list(score_items(items, Encoder(), predict, batch_size=3))
+    assert batches == [3, 3, 1]
+    assert [r["id"] for r in rows] == list(range(1, 8))
+    assert [r["label"] for r in rows] == ["FAKE" if i / 10 > FAKE_THRESHOLD else "REAL" for i in range(1, 8)]
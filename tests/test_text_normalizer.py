@@ -0,0 +1,63 @@
+import random
+import re
+import string
+
+import pytest
+
+from features.build_features import training_texts
+from features.text_normalizer import CHUNK_CHARS, clean_text
+from features.vocabulary import DEFAULT_FILTERS, split_words
+
+TABLE = str.maketrans({c: ' ' for c in DEFAULT_FILTERS})
+
+
+def tokens(text):
+    return split_words(text, TABLE)
+
+
+def test_whitespace_only_runs_do_not_stop_early():
+    # Bloques enteros de tabs: para el Tokenizer no son palabras
+    filler = ("\t " * (CHUNK_CHARS // 2) + "\n") * 3
+    text = filler + "real words appear only after the tabs " * 20
+    assert tokens(clean_text(text, max_tokens=10))[:10] == tokens(clean_text(text))[:10]
+
+
+def test_early_stop_keeps_first_tokens():
+    text = "\n".join(f"Line {i}: <b>bold</b> https://x.com/{i} words, more words." for i in range(2000))
+    full = tokens(clean_text(text))
+    for max_tokens in (1, 50, 250, 5000):
+        assert tokens(clean_text(text, max_tokens=max_tokens))[:max_tokens] == full[:max_tokens]
+
+
+def legacy_clean_text(text):
+    # clean_text original de src/web/main.py: los modelos entrenados dependen de este orden
+    text = str(text).lower()
+    text = re.sub(r'https?://\S+|www\.\S+', '', text)
+    text = re.sub(r'<.*?>', '', text)
+    text = re.sub(f'[{re.escape(string.punctuation)}]', '', text)
+    return re.sub(r'\n', ' ', text)
+
+
+@pytest.mark.parametrize("text", [
+    '<a href=http://x.com>link</a> ok',
+    'See HTTPS://Example.com/A?b=1 and WWW.Site.org, <B>bold</B>!',
+    "Reuters (U.S.) - it's \"fake\"\nnews\n\n<p>done</p>",
+    'İstanbul ÅNGSTRÖM < not a tag > www.',
+])
+def test_matches_legacy_clean_text(text):
+    assert clean_text(text) == legacy_clean_text(text)
+
+
+def test_matches_legacy_on_random_markup():
+    rng = random.Random(7)
+    pieces = ["The", "SAID", "http://a.b/c", "www.x.org", "<b>", "</b>", "<", ">", "\n", ",", "it's",
+              "Ü", "(U.S.)", "https://q.io?x=<y>", " "]
+    for _ in range(300):
+        text = " ".join(rng.choices(pieces, k=rng.randint(1, 40)))
+        assert clean_text(text) == legacy_clean_text(text)
+
+
+def test_training_texts_follows_config():
+    texts = ["Hello, <b>World</b>!"]
+    assert training_texts(texts, {'global_params': {'clean_text': True}}) == ["hello world"]
+    assert training_texts(texts, {'global_params': {'clean_text': False}}) == texts
@@ -0,0 +1,54 @@
+import numpy as np
+
+from model.train_model import experiment_cost, launch_order, run_parallel
+
+EXPERIMENTS = [
+    {'name': "Exp1_Base_LSTM", 'type': 'lstm', 'embedding_dim': 16, 'units': 64},
+    {'name': "Exp2_Simple_Dense", 'type': 'dense', 'embedding_dim': 16, 'units': 32},
+    {'name': "Exp3_Complex_LSTM", 'type': 'lstm', 'embedding_dim': 32, 'units': 264},
+    {'name': "Exp4_CNN_Spatial", 'type': 'cnn', 'embedding_dim': 32, 'units': 128},
+]
+
+
+def test_cost_ranks_the_configured_experiments():
+    costs = {exp['name']: experiment_cost(exp) for exp in EXPERIMENTS}
+    assert costs["Exp3_Complex_LSTM"] > costs["Exp1_Base_LSTM"] > costs["Exp2_Simple_Dense"]
+    assert costs["Exp4_CNN_Spatial"] > costs["Exp2_Simple_Dense"]
+    # Un tipo desconocido cuenta como el más barato por unidad
+    assert experiment_cost({'type': 'otro', 'embedding_dim': 16, 'units': 32}) == costs["Exp2_Simple_Dense"]
+
+
+def test_launch_order_puts_expensive_tasks_first():
+    tasks = [(exp, 'padded', "") for exp in EXPERIMENTS]
+    order = launch_order(tasks)
+    assert [EXPERIMENTS[i]['name'] for i in order] == [
+        "Exp3_Complex_LSTM", "Exp1_Base_LSTM", "Exp4_CNN_Spatial", "Exp2_Simple_Dense"]
+    # Empates: se respeta el orden de config.yaml
+    same = [(dict(EXPERIMENTS[1], name=f"d{i}"), 'padded', "") for i in range(3)]
+    assert launch_order(same) == [0, 1, 2]
+
+
+def test_run_parallel_returns_results_in_config_order(tmp_path):
+    rng = np.random.default_rng(0)
+    # Clase 1 usa ids altos: separable en una época
+    def split(n):
+        y = np.arange(n) % 2
+        X = np.where(y[:, None] == 1, rng.integers(25, 50, (n, 20)), rng.integers(2, 25, (n, 20)))
+        return X.astype(np.int32), y
+    splits = (split(64), split(16), split(16))
+    config = {
+        'paths': {'output_models': str(tmp_path / "models"), 'prepared_data': str(tmp_path / "prepared")},
+        'global_params': {'vocab_size': 50, 'max_length': 20, 'batch_size': 16, 'epochs': 1,
+                          'threads_per_worker': 1},
+    }
+    (tmp_path / "models").mkdir()
+    small = [
+        {'name': "tiny_dense", 'type': 'dense', 'embedding_dim': 4, 'units': 4},
+        {'name': "tiny_cnn", 'type': 'cnn', 'embedding_dim': 8, 'units': 8},
+        {'name': "tiny_dense_b", 'type': 'dense', 'embedding_dim': 4, 'units': 2},
+    ]
+    tasks = [(exp, 'padded', "") for exp in small]
+    results = run_parallel(config, tasks, splits, workers=2)
+
+    assert [r["Experimento"] for r in results] == [exp['name'] for exp in small]
+    assert all((tmp_path / "models" / f"{exp['name']}.keras").exists() for exp in small)
@@ -0,0 +1,107 @@
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import translation_cache
+import two_tier_cache
+from translation_cache import GoogleBackend, TranslationCache
+
+
+class StubBackend:
+    """Traductor local: marca el texto y cuenta las llamadas."""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, text, source, target):
+        with self._lock:
+            self.calls += 1
+        if self.delay:
+            time.sleep(random.uniform(0, self.delay))
+        return f"{target}:{text}"
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "cache" / "translations.sqlite3")
+
+
+def test_memory_and_disk_hits(db_path):
+    backend = StubBackend()
+    cache = TranslationCache(db_path, backend=backend)
+    assert cache.translate("hola") == "en:hola"
+    assert cache.translate("hola") == "en:hola"
+    assert backend.calls == 1
+
+    # Otra instancia (otro worker) encuentra la traducción en SQLite
+    other = TranslationCache(db_path, backend=backend)
+    assert other.translate("hola") == "en:hola"
+    assert backend.calls == 1
+    assert other.stats()["disk_hits"] == 1
+    assert cache.stats()["memory_hits"] == 1
+
+
+def test_ttl_expires_entries(db_path, monkeypatch):
+    backend = StubBackend()
+    cache = TranslationCache(db_path, backend=backend, ttl_hours=1)
+    cache.translate("hola")
+    now = time.time()
+    monkeypatch.setattr(two_tier_cache.time, "time", lambda: now + 2 * 3600)
+    cache.translate("hola")
+    assert backend.calls == 2
+
+
+def test_lru_and_disk_caps(db_path):
+    backend = StubBackend()
+    cache = TranslationCache(db_path, backend=backend, max_memory_items=2, max_disk_items=3)
+    for text in ["a", "b", "c", "d", "e"]:
+        cache.translate(text)
+    assert cache.stats()["memory_items"] == 2
+    assert cache._db.execute("SELECT COUNT(*) FROM translations").fetchone()[0] == 3
+
+
+def test_backend_failure_is_not_cached(db_path):
+    def failing(text, source, target):
+        raise RuntimeError("sin red")
+
+    cache = TranslationCache(db_path, backend=failing)
+    with pytest.raises(RuntimeError):
+        cache.translate("hola")
+    assert cache._db.execute("SELECT COUNT(*) FROM translations").fetchone()[0] == 0
+
+
+def test_concurrent_translations_are_not_mixed(db_path):
+    cache = TranslationCache(db_path, backend=StubBackend(delay=0.005))
+    texts = [f"texto {i}" for i in range(200)] * 2
+    with ThreadPoolExecutor(16) as pool:
+        results = list(pool.map(cache.translate, texts))
+    assert results == [f"en:{t}" for t in texts]
+    rows = cache._db.execute("SELECT key, translated FROM translations").fetchall()
+    assert len(rows) == 200
+    for key, translated in rows:
+        assert key == TranslationCache.make_key(translated[len("en:"):], "es", "en")
+
+
+class SharedStateTranslator:
+    # Igual que deep_translator: el texto pasa por un atributo antes del request
+    def __init__(self, source, target):
+        self._text = None
+
+    def translate(self, text):
+        self._text = text
+        time.sleep(random.uniform(0, 0.002))
+        return f"en:{self._text}"
+
+
+def test_google_backend_does_not_share_translators_between_threads(monkeypatch):
+    monkeypatch.setattr(translation_cache, "GoogleTranslator", SharedStateTranslator)
+    backend = GoogleBackend()
+    texts = [f"texto {i}" for i in range(300)]
+    with ThreadPoolExecutor(8) as pool:
+        results = list(pool.map(lambda t: backend(t, "es", "en"), texts))
+    assert results == [f"en:{t}" for t in texts]
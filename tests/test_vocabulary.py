@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+from tensorflow.keras.preprocessing.text import Tokenizer
+from tensorflow.keras.preprocessing.sequence import pad_sequences
+
+from features.vocabulary import VocabEncoder, export_vocabulary
+
+MAX_LEN = 250  # Longitud de padding del servidor (features/serving_params.py)
+
+CORPUS = [
+    "The president said on Tuesday that officials would review the claims.",
+    "BREAKING: Officials deny the report, calling it \"fake news\"!!",
+    "the the the president president officials",
+    "Reuters (U.S.) - shares fell 3% after the announcement; analysts were surprised.",
+    "tabs\tand\nnewlines   and  multiple   spaces",
+    "",
+]
+# Palabras nunca vistas en el ajuste y textos más largos que MAX_LEN
+UNSEEN = [
+    "zebra quantum president xylophone officials",
+    " ".join(["president", "unknownword"] * 200),
+    " ".join(f"w{i}" for i in range(600)),
+    "!!! ??? ...",
+]
+
+
+@pytest.fixture(scope="module")
+def tokenizer():
+    tok = Tokenizer(num_words=20, oov_token="<OOV>")
+    tok.fit_on_texts(CORPUS)
+    return tok
+
+
+@pytest.mark.parametrize("padding", ["post", "pre"])
+@pytest.mark.parametrize("truncating", ["post", "pre"])
+def test_encode_batch_matches_keras(tokenizer, padding, truncating):
+    encoder = VocabEncoder.from_tokenizer(tokenizer)
+    texts = CORPUS + UNSEEN
+    expected = pad_sequences(tokenizer.texts_to_sequences(texts), maxlen=MAX_LEN,
+                             padding=padding, truncating=truncating)
+    got = encoder.encode_batch(texts, MAX_LEN, padding=padding, truncating=truncating)
+    assert got.dtype == np.int32
+    np.testing.assert_array_equal(got, expected)
+
+
+def test_npz_roundtrip_matches_keras(tokenizer, tmp_path):
+    path = str(tmp_path / "vocab.npz")
+    export_vocabulary(tokenizer, path)
+    encoder = VocabEncoder.load(path)
+    texts = CORPUS + UNSEEN
+    expected = pad_sequences(tokenizer.texts_to_sequences(texts), maxlen=MAX_LEN,
+                             padding='post', truncating='post')
+    np.testing.assert_array_equal(encoder.encode_batch(texts, MAX_LEN), expected)
+
+
+def test_without_oov_token_drops_unknown_words():
+    tok = Tokenizer(num_words=50)
+    tok.fit_on_texts(CORPUS)
+    encoder = VocabEncoder.from_tokenizer(tok)
+    expected = pad_sequences(tok.texts_to_sequences(UNSEEN), maxlen=MAX_LEN,
+                             padding='post', truncating='post')
+    np.testing.assert_array_equal(encoder.encode_batch(UNSEEN, MAX_LEN), expected)